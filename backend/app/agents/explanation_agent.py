@@ -1,12 +1,10 @@
-import google.generativeai as genai
-import os
-from dotenv import load_dotenv
 from app.models.response_model import Source, EvidencePoint, VerdictType
+from app.utils.gemini_client import generate_text
+from app.utils.prompt_budget import PromptBudget, truncate_to_tokens, CLAIM_MAX_TOKENS
+from app.utils.tracing import traced
 import json
 
-load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
+@traced("agent.explanation")
 async def generate_explanation(
     original_claim: str,
     extracted_claim: str,
@@ -26,8 +24,6 @@ async def generate_explanation(
         Dictionary with explanation, evidence, and sources
     """
     try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
         # Prepare context from verification results
         fact_check_claims = verification_results.get("fact_check_api", {}).get("claims", [])
         google_results = verification_results.get("google_search", {}).get("results", [])
@@ -36,86 +32,76 @@ async def generate_explanation(
         verdict = verdict_data.get("verdict")
         confidence = verdict_data.get("confidence_score")
         
-        # Build context string
-        context = f"""
-CLAIM TO VERIFY: {extracted_claim}
+        # Header, then context blocks in priority order (dropped from the end when over budget)
+        header = f"""
+CLAIM TO VERIFY: {truncate_to_tokens(extracted_claim, CLAIM_MAX_TOKENS)}
 
 VERDICT: {verdict}
 CONFIDENCE: {confidence}
-
-AI ANALYSIS:
-{ai_analysis.get('analysis', 'N/A')}
-
-KEY FINDINGS:
 """
+        blocks = [f"AI ANALYSIS:\n{ai_analysis.get('analysis', 'N/A')}\n"]
         
+        findings = "KEY FINDINGS:\n"
         for finding in ai_analysis.get("key_findings", []):
-            context += f"- {finding}\n"
-        
-        context += "\nVERIFICATION SOURCES:\n"
+            findings += f"- {finding}\n"
+        blocks.append(findings)
         
         if fact_check_claims:
-            context += "\nFact Check API Results:\n"
+            fact_checks = "VERIFICATION SOURCES:\nFact Check API Results:\n"
             for i, claim in enumerate(fact_check_claims[:3], 1):
-                context += f"{i}. {claim.get('claimReview', 'N/A')} - Rating: {claim.get('rating', 'N/A')}\n"
-                context += f"   Publisher: {claim.get('publisher', 'N/A')}\n"
+                fact_checks += f"{i}. {claim.get('claimReview', 'N/A')} - Rating: {claim.get('rating', 'N/A')}\n"
+                fact_checks += f"   Publisher: {claim.get('publisher', 'N/A')}\n"
+            blocks.append(fact_checks)
         
         if google_results:
-            context += "\nGoogle Search Results:\n"
+            google = "Google Search Results:\n"
             for i, result in enumerate(google_results[:3], 1):
-                context += f"{i}. {result.get('title', 'N/A')}\n"
-                context += f"   {result.get('snippet', 'N/A')}\n"
+                google += f"{i}. {result.get('title', 'N/A')}\n"
+                google += f"   {result.get('snippet', 'N/A')}\n"
+            blocks.append(google)
         
         # Generate explanation based on verdict type
         if verdict == VerdictType.FALSE:
-            prompt = f"""{context}
-
-Task: Generate a comprehensive explanation for why this claim is FALSE.
+            task = """Task: Generate a comprehensive explanation for why this claim is FALSE.
 
 Provide a JSON response with:
 1. "real_news_summary": A short (2-3 sentences) explanation of what the ACTUAL truth is
 2. "detailed_explanation": A detailed explanation (3-4 sentences) of why the claim is false
-3. "evidence_points": List of 2-3 key evidence points (each as {{"point": "...", "source": "..."}})
+3. "evidence_points": List of 2-3 key evidence points (each as {"point": "...", "source": "..."})
 
 Be clear, factual, and helpful. Focus on educating the user."""
 
         elif verdict == VerdictType.TRUE:
-            prompt = f"""{context}
-
-Task: Generate a comprehensive explanation for why this claim is TRUE.
+            task = """Task: Generate a comprehensive explanation for why this claim is TRUE.
 
 Provide a JSON response with:
 1. "real_news_summary": A short (2-3 sentences) summary confirming the claim and providing context
 2. "detailed_explanation": A detailed explanation (3-4 sentences) with additional context
-3. "evidence_points": List of 2-3 key evidence points (each as {{"point": "...", "source": "..."}})
+3. "evidence_points": List of 2-3 key evidence points (each as {"point": "...", "source": "..."})
 
 Be clear, factual, and provide helpful context."""
 
         elif verdict == VerdictType.MISLEADING:
-            prompt = f"""{context}
-
-Task: Generate a comprehensive explanation for why this claim is MISLEADING.
+            task = """Task: Generate a comprehensive explanation for why this claim is MISLEADING.
 
 Provide a JSON response with:
 1. "real_news_summary": A short (2-3 sentences) explanation of what is true and what is exaggerated/false
 2. "detailed_explanation": A detailed explanation (3-4 sentences) breaking down the misleading aspects
-3. "evidence_points": List of 2-3 key evidence points (each as {{"point": "...", "source": "..."}})
+3. "evidence_points": List of 2-3 key evidence points (each as {"point": "...", "source": "..."})
 
 Be clear about what's true vs. misleading."""
 
         else:  # UNVERIFIED
-            prompt = f"""{context}
-
-Task: Generate a response explaining that we couldn't verify this claim.
+            task = """Task: Generate a response explaining that we couldn't verify this claim.
 
 Provide a JSON response with:
 1. "real_news_summary": A short explanation of why we couldn't verify this
 2. "detailed_explanation": What the user should do (check credible sources, wait for more information)
-3. "evidence_points": List of 1-2 suggestions (each as {{"point": "...", "source": "..."}})
+3. "evidence_points": List of 1-2 suggestions (each as {"point": "...", "source": "..."})
 
 Be helpful and guide the user."""
         
-        prompt += """\n\nIMPORTANT: Return ONLY valid JSON, no markdown formatting, no code blocks. Format:
+        task += """\n\nIMPORTANT: Return ONLY valid JSON, no markdown formatting, no code blocks. Format:
 {
   "real_news_summary": "...",
   "detailed_explanation": "...",
@@ -125,8 +111,10 @@ Be helpful and guide the user."""
   ]
 }"""
         
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        budget = PromptBudget("explanation")
+        prompt = budget.fit(lambda context: f"{header}\n{context}\n\n{task}", blocks, max_item_tokens=300)
+        
+        response_text = await generate_text(prompt, stage="explanation")
         
         # Clean up response (remove markdown code blocks if present)
         response_text = response_text.replace("```json", "").replace("```", "").strip()
@@ -134,45 +122,7 @@ Be helpful and guide the user."""
         # Parse JSON response
         explanation_data = json.loads(response_text)
         
-        # Extract sources from verification results
-        sources = []
-        
-        # Add fact-check sources
-        for claim in fact_check_claims[:3]:
-            sources.append(Source(
-                title=claim.get("claimReview", "Fact Check"),
-                url=claim.get("url", ""),
-                publisher=claim.get("publisher", "Unknown")
-            ))
-        
-        # Add Google search sources
-        for result in google_results[:3]:
-            sources.append(Source(
-                title=result.get("title", "Search Result"),
-                url=result.get("url", ""),
-                publisher=result.get("displayLink", "Unknown")
-            ))
-        
-        # Convert evidence points to proper format
-        evidence_points = [
-            EvidencePoint(
-                point=ep.get("point", ""),
-                source=ep.get("source")
-            )
-            for ep in explanation_data.get("evidence_points", [])
-        ]
-        
-        # Build agent reasoning
-        reasoning_parts = verdict_data.get("reasoning", [])
-        agent_reasoning = " | ".join(reasoning_parts) if reasoning_parts else "AI-powered verification with multiple sources"
-        
-        return {
-            "real_news_summary": explanation_data.get("real_news_summary", "Unable to generate summary"),
-            "detailed_explanation": explanation_data.get("detailed_explanation", "Unable to generate explanation"),
-            "evidence_points": evidence_points,
-            "sources": sources,
-            "agent_reasoning": agent_reasoning
-        }
+        return format_explanation(explanation_data, verification_results, verdict_data)
         
     except Exception as e:
         print(f"Error in explanation generation: {str(e)}")
@@ -187,3 +137,90 @@ Be helpful and guide the user."""
             "sources": [],
             "agent_reasoning": "Automated AI verification"
         }
+
+
+def format_explanation(explanation_data: dict, verification_results: dict, verdict_data: dict) -> dict:
+    """
+    Turns Gemini's explanation JSON into the explanation fields of the response.
+    
+    Args:
+        explanation_data: Parsed JSON with real_news_summary, detailed_explanation
+            and evidence_points
+        verification_results: Results from verification agent
+        verdict_data: Verdict and confidence from verdict agent
+    
+    Returns:
+        Dictionary with explanation, evidence, and sources
+    """
+    fact_check_claims = verification_results.get("fact_check_api", {}).get("claims", [])
+    google_results = verification_results.get("google_search", {}).get("results", [])
+    
+    # Extract sources from verification results
+    sources = []
+    
+    # Add fact-check sources
+    for claim in fact_check_claims[:3]:
+        sources.append(Source(
+            title=claim.get("claimReview", "Fact Check"),
+            url=claim.get("url", ""),
+            publisher=claim.get("publisher", "Unknown")
+        ))
+    
+    # Add Google search sources
+    for result in google_results[:3]:
+        sources.append(Source(
+            title=result.get("title", "Search Result"),
+            url=result.get("url", ""),
+            publisher=result.get("displayLink", "Unknown")
+        ))
+    
+    # Convert evidence points to proper format
+    evidence_points = [
+        EvidencePoint(
+            point=ep.get("point", ""),
+            source=ep.get("source")
+        )
+        for ep in explanation_data.get("evidence_points", [])
+    ]
+    
+    # Build agent reasoning
+    reasoning_parts = verdict_data.get("reasoning", [])
+    agent_reasoning = " | ".join(reasoning_parts) if reasoning_parts else "AI-powered verification with multiple sources"
+    
+    return {
+        "real_news_summary": explanation_data.get("real_news_summary", "Unable to generate summary"),
+        "detailed_explanation": explanation_data.get("detailed_explanation", "Unable to generate explanation"),
+        "evidence_points": evidence_points,
+        "sources": sources,
+        "agent_reasoning": agent_reasoning
+    }
+
+
+@traced("agent.explanation_from_fused")
+async def explanation_from_fused(
+    original_claim: str,
+    extracted_claim: str,
+    verification_results: dict,
+    verdict_data: dict
+) -> dict:
+    """
+    Builds the explanation from a fused analysis, falling back to a separate
+    Gemini explanation call if the fused response had none, or if the final
+    verdict is not the one the fused explanation argues for (e.g. turned
+    UNVERIFIED for a zero confidence or an unknown label).
+    
+    Args:
+        original_claim: Original user input
+        extracted_claim: Cleaned factual claim
+        verification_results: Results from verification agent (fused mode)
+        verdict_data: Verdict and confidence from verdict agent
+    
+    Returns:
+        Dictionary with explanation, evidence, and sources
+    """
+    ai_analysis = verification_results.get("ai_analysis", {})
+    explanation_data = ai_analysis.get("explanation")
+    if not explanation_data or verdict_data.get("verdict") != ai_analysis.get("verdict_suggestion"):
+        return await generate_explanation(original_claim, extracted_claim, verification_results, verdict_data)
+    
+    return format_explanation(explanation_data, verification_results, verdict_data)
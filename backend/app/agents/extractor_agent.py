@@ -1,12 +1,8 @@
-import google.generativeai as genai
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from app.utils.gemini_client import generate_text
+from app.utils.prompt_budget import PromptBudget
+from app.utils.tracing import traced
 
+@traced("agent.extract_claim")
 async def extract_claim(user_input: str) -> str:
     """
     Uses Gemini to extract a clean, factual claim from user input.
@@ -18,11 +14,11 @@ async def extract_claim(user_input: str) -> str:
         A clean, factual statement that can be verified
     """
     try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        prompt = f"""You are a claim extraction expert. Your job is to convert user input into a clear, verifiable factual claim.
+        # Long forwarded messages are cut to the stage's token budget
+        budget = PromptBudget("extraction")
+        prompt = budget.fit(lambda text: f"""You are a claim extraction expert. Your job is to convert user input into a clear, verifiable factual claim.
 
-User Input: "{user_input}"
+User Input: "{text}"
 
 Task:
 1. Extract the core factual claim from this input
@@ -36,10 +32,9 @@ Rules:
 - Remove any bias or loaded language
 - If it's a question, convert it to a statement
 
-Return ONLY the extracted claim, nothing else."""
+Return ONLY the extracted claim, nothing else.""", [user_input], max_item_tokens=budget.budget)
 
-        response = model.generate_content(prompt)
-        extracted_claim = response.text.strip()
+        extracted_claim = await generate_text(prompt, stage="extraction")
         
         # Clean up any quotes or extra formatting
         extracted_claim = extracted_claim.strip('"\'')
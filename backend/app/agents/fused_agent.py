@@ -0,0 +1,108 @@
+import json
+from app.agents.research_agent import analyze_with_gemini
+from app.utils.gemini_client import generate_text
+from app.utils.prompt_budget import PromptBudget, truncate_to_tokens, CLAIM_MAX_TOKENS, SNIPPET_MAX_TOKENS
+from app.utils.tracing import traced
+
+@traced("agent.fused", lambda result: {"verdict": result.get("verdict_suggestion"), "confidence": result.get("confidence")})
+async def analyze_and_explain(claim: str, search_results: list) -> dict:
+    """
+    Fused research + explanation: one Gemini call returns the verdict analysis
+    and the user-facing explanation together, instead of re-sending the same
+    search context in a second explanation call.
+
+    Args:
+        claim: The claim to verify
+        search_results: Combined search results from all sources
+
+    Returns:
+        Dictionary in the same shape as analyze_with_gemini, plus an
+        "explanation" dictionary with real_news_summary, detailed_explanation
+        and evidence_points. Falls back to analyze_with_gemini (without
+        "explanation") if the fused call fails.
+    """
+    claim = truncate_to_tokens(claim, CLAIM_MAX_TOKENS)
+    context_parts = []
+    if search_results:
+        for idx, result in enumerate(search_results[:5], 1):
+            context_parts.append(
+                f"Source {idx}:\n"
+                f"Title: {result.get('title', 'N/A')}\n"
+                f"Snippet: {truncate_to_tokens(result.get('snippet') or 'N/A', SNIPPET_MAX_TOKENS)}\n"
+                f"URL: {result.get('url', 'N/A')}\n"
+            )
+        evidence_header = "SEARCH RESULTS FROM THE WEB:\n"
+        guidelines = """- TRUE: Multiple reliable sources confirm the claim with strong evidence (confidence > 0.7)
+- FALSE: Multiple reliable sources debunk the claim with clear evidence (confidence > 0.7)
+- MISLEADING: Mixed evidence, partially true, taken out of context (confidence 0.4-0.7)
+- UNVERIFIED: Insufficient evidence or conflicting sources (confidence < 0.4)"""
+    else:
+        evidence_header = "No web search results are available. Use your training knowledge and be honest about limitations if the claim is too recent or obscure."
+        guidelines = """- TRUE: You're confident this is accurate based on established facts (confidence > 0.6)
+- FALSE: You're confident this is false based on established facts (confidence > 0.6)
+- MISLEADING: Partially true or requires context (confidence 0.4-0.6)
+- UNVERIFIED: Too recent, obscure, or you don't have reliable information (confidence < 0.4)"""
+
+    budget = PromptBudget("fused")
+    prompt = budget.fit(lambda context: f"""You are an expert fact-checker analyzing information to verify a claim and explain the result to the public.
+
+CLAIM TO VERIFY: "{claim}"
+
+{evidence_header}{context}
+
+Your task:
+1. Analyze the evidence, looking for debunking, confirmation, or mixed evidence
+2. Consider the credibility of sources (news sites, fact-checkers, scientific publications)
+3. Determine if the claim is TRUE, FALSE, MISLEADING, or UNVERIFIED
+4. Explain the verdict clearly: what the actual truth is, why, and the key evidence.
+   If UNVERIFIED, explain why and what the user should do instead.
+
+Provide your answer in this exact JSON format:
+{{
+    "verdict": "TRUE" or "FALSE" or "MISLEADING" or "UNVERIFIED",
+    "confidence": 0.0 to 1.0,
+    "reasoning": ["point 1", "point 2", "point 3"],
+    "key_findings": ["finding 1", "finding 2"],
+    "evidence_summary": "Brief summary of evidence",
+    "real_news_summary": "2-3 sentences on what is actually true",
+    "detailed_explanation": "3-4 sentences explaining the verdict",
+    "evidence_points": [
+        {{"point": "...", "source": "..."}},
+        {{"point": "...", "source": "..."}}
+    ]
+}}
+
+Guidelines:
+{guidelines}
+
+Be objective, evidence-based, clear and helpful. Return ONLY valid JSON, no markdown formatting, no code blocks.""", context_parts)
+
+    try:
+        response_text = await generate_text(prompt, stage="fused")
+
+        # Remove markdown code blocks if present
+        response_text = response_text.replace("```json", "").replace("```", "").strip()
+        analysis = json.loads(response_text)
+
+        result = {
+            "analysis": analysis.get("evidence_summary", ""),
+            "verdict_suggestion": analysis.get("verdict", "UNVERIFIED"),
+            "confidence": float(analysis.get("confidence", 0.0)),
+            "reasoning": analysis.get("reasoning", []),
+            "key_findings": analysis.get("key_findings", []),
+            "sources_analyzed": len(search_results),
+            "fused": True,
+            "explanation": {
+                "real_news_summary": analysis.get("real_news_summary", "Unable to generate summary"),
+                "detailed_explanation": analysis.get("detailed_explanation", "Unable to generate explanation"),
+                "evidence_points": analysis.get("evidence_points", [])
+            }
+        }
+        if not search_results:
+            result["fallback_mode"] = True
+            result["caveat"] = "Analysis based on AI training data (no live web search)"
+        return result
+
+    except Exception as e:
+        print(f"Error in fused analysis, falling back to separate calls: {str(e)}")
+        return await analyze_with_gemini(claim, search_results)
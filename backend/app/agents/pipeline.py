@@ -0,0 +1,320 @@
+"""
+End-to-end verification pipeline shared by the HTTP API and the Telegram bot.
+
+extract claim -> verify with all sources -> determine verdict -> explain
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from app.models.response_model import VerifyResponse, BatchItemResult
+from app.agents.extractor_agent import extract_claim
+from app.agents.verification_agent import verify_claim, gather_sources, SOURCE_BUDGET
+from app.agents.verdict_agent import determine_verdict
+from app.agents.explanation_agent import generate_explanation, explanation_from_fused
+from app.utils.verdict_cache import get_cached_verdict, cache_verdict, find_near_duplicate_verdict, claim_cache_key
+from app.utils.preprocess import clean_text, is_declarative_claim
+from app.utils.similarity import hybrid_similarity
+from app.utils.source_cache import is_negative
+from app.utils import llm_usage
+from app.utils.rate_limiter import llm_priority
+from app.utils.singleflight import SingleFlight
+from app.utils.metrics import stage_timer, record_verification
+from app.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: one Gemini call for analysis + explanation instead of two
+FUSED_MODE = os.getenv("GEMINI_FUSED_MODE", "false").lower() == "true"
+# Start source lookups on the cleaned raw input while the claim is extracted
+SPECULATIVE_FETCH = os.getenv("SPECULATIVE_FETCH", "true").lower() == "true"
+SPECULATIVE_REUSE_THRESHOLD = float(os.getenv("SPECULATIVE_REUSE_THRESHOLD", "0.75"))
+# Quota-limited sources (NewsAPI: 100 requests/day) only search for the extracted claim
+SPECULATIVE_EXCLUDED_SOURCES = ("news_api",)
+# Short declarative inputs are verified as-is without the extraction LLM call
+SKIP_EXTRACTION_FAST_PATH = os.getenv("SKIP_EXTRACTION_FAST_PATH", "true").lower() == "true"
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "5"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "20"))
+MIN_CLAIM_LENGTH = 10
+# Concurrent requests for the same normalized claim share one pipeline run
+COALESCE_VERIFICATIONS = os.getenv("COALESCE_VERIFICATIONS", "true").lower() == "true"
+
+verification_flights = SingleFlight("verification")
+
+
+class NoClaimFoundError(ValueError):
+    """Raised when no verifiable claim can be extracted from the input"""
+
+
+def _cancel(task):
+    if task is not None and not task.done():
+        task.cancel()
+
+
+async def reuse_speculative_results(speculative_task, speculative_claim: str, extracted_claim: str) -> dict:
+    """
+    Decides which speculatively fetched source results can be reused.
+    
+    If the extracted claim is close enough to the text the speculative lookups
+    used, every non-empty result is reused and only sources that returned
+    nothing (or were not queried) are re-queried. Otherwise all sources are
+    queried again.
+    
+    Args:
+        speculative_task: Task running gather_sources on the cleaned raw input
+        speculative_claim: Text the speculative lookups searched for
+        extracted_claim: Claim returned by the extractor
+    
+    Returns:
+        Dictionary of source results to pass as `prefetched`, or None if the
+        speculative results are not used
+    """
+    similarity = hybrid_similarity(speculative_claim, clean_text(extracted_claim))
+    if similarity < SPECULATIVE_REUSE_THRESHOLD:
+        _cancel(speculative_task)
+        logger.info(f"🔁 Extracted claim differs from input (similarity {similarity:.2f}), re-querying all sources")
+        return None
+    
+    try:
+        results = await speculative_task
+    except Exception as e:
+        logger.error(f"❌ Speculative fetch failed: {str(e)}")
+        return None
+    
+    reusable = {source: result for source, result in results.items() if not is_negative(result)}
+    logger.info(f"⚡ Reusing speculative results from {len(reusable)}/{len(results)} sources (similarity {similarity:.2f})")
+    return reusable
+
+
+async def run_verification(claim: str, on_stage=None) -> VerifyResponse:
+    """
+    Runs the full verification pipeline for a claim, consulting the verdict
+    cache first and the near-duplicate index after extraction.
+    
+    Source lookups start speculatively on the cleaned input while the claim is
+    being extracted, and short declarative inputs skip extraction entirely.
+    Concurrent calls for the same normalized claim share one run: later
+    callers get the stages reported so far replayed to their `on_stage`, and
+    the run is cancelled only if every caller goes away.
+
+    Args:
+        claim: Raw claim text from the user
+        on_stage: Optional async callback `on_stage(stage, data)` awaited after
+            each stage completes, with stage one of "extracted", "source"
+            (once per source tool), "verified" or "verdict"
+
+    Returns:
+        The completed VerifyResponse
+    """
+    with tracing.span("pipeline.verify", claim=claim[:200]) as trace_span:
+        response, shared = await _coalesced_verification(claim, on_stage)
+        trace_span.set(coalesced=shared, verdict=response.verdict.value, confidence=response.confidence_score)
+        return response
+
+
+async def _coalesced_verification(claim: str, on_stage=None) -> tuple:
+    if not COALESCE_VERIFICATIONS:
+        with llm_usage.track_request(claim):
+            return await _run_verification(claim, on_stage), False
+
+    async def run_shared(publish):
+        # Gemini token usage of the shared run is collected under the claim
+        with llm_usage.track_request(claim):
+            return await _run_verification(claim, publish)
+
+    # Identical claims already being verified join that run instead of starting another
+    start = time.perf_counter()
+    response, shared = await verification_flights.do(claim_cache_key(claim), run_shared, listener=on_stage)
+    if shared:
+        logger.info("⚡ Joined an in-flight verification of the same claim")
+        response = response.model_copy(update={"original_claim": claim})
+        record_verification(response.verdict.value, "coalesced", time.perf_counter() - start)
+    return response, shared
+
+
+async def _run_verification(claim: str, on_stage=None) -> VerifyResponse:
+    start = time.perf_counter()
+    cached = get_cached_verdict(claim)
+    if cached is not None:
+        logger.info("⚡ Verdict cache hit")
+        record_verification(cached.verdict.value, "cached", time.perf_counter() - start)
+        return cached
+
+    # Step 1: Extract clean factual claim
+    speculative_task = None
+    extracted_claim = None
+    if SKIP_EXTRACTION_FAST_PATH and is_declarative_claim(claim):
+        logger.info("⚡ Step 1: Input is already a declarative claim, skipping extraction")
+        extracted_claim = clean_text(claim)
+    else:
+        logger.info("🔍 Step 1: Extracting claim...")
+        if SPECULATIVE_FETCH:
+            speculative_claim = clean_text(claim)
+            # Speculative lookups and the re-query of empty sources share one SOURCE_BUDGET
+            speculative_deadline = time.monotonic() + SOURCE_BUDGET
+            speculative_task = asyncio.create_task(
+                gather_sources(speculative_claim, exclude=SPECULATIVE_EXCLUDED_SOURCES)
+            )
+
+    # Until the speculative task is handed off (awaited or cancelled by
+    # reuse_speculative_results), any failure, including an on_stage callback
+    # raising on a disconnected client, must cancel it
+    try:
+        if extracted_claim is None:
+            with stage_timer("extraction"):
+                extracted_claim = await extract_claim(claim)
+
+        if not extracted_claim or not extracted_claim.strip():
+            raise NoClaimFoundError("No verifiable claim found in input")
+        logger.info(f"✅ Extracted: {extracted_claim}")
+        if on_stage:
+            await on_stage("extracted", {"extracted_claim": extracted_claim})
+
+        # Mutated copies of an already verified claim reuse its verdict
+        match = find_near_duplicate_verdict(claim, extracted_claim)
+        if match is not None:
+            near_duplicate, remaining_ttl = match
+            _cancel(speculative_task)
+            logger.info("⚡ Near-duplicate of a verified claim, reusing verdict")
+            # Expires with the original and is not indexed, so copies of copies cannot extend it
+            cache_verdict(claim, near_duplicate, ttl=remaining_ttl, index=False)
+            record_verification(near_duplicate.verdict.value, "near_duplicate", time.perf_counter() - start)
+            return near_duplicate
+
+        prefetched = None
+        source_deadline = None
+        if speculative_task is not None:
+            prefetched = await reuse_speculative_results(speculative_task, speculative_claim, extracted_claim)
+            # Without reused results the sources get a full budget of their own
+            if prefetched is not None:
+                source_deadline = speculative_deadline
+    except BaseException:
+        _cancel(speculative_task)
+        raise
+
+    # Step 2: Verify the claim using multiple tools
+    logger.info("🔍 Step 2: Verifying with Indian fact-checkers + AI...")
+    async def on_source(source: str, result: dict):
+        await on_stage("source", {"source": source, "result": result})
+
+    with stage_timer("verification"):
+        verification_results = await verify_claim(
+            extracted_claim,
+            on_source=on_source if on_stage else None,
+            fused=FUSED_MODE,
+            prefetched=prefetched,
+            deadline=source_deadline
+        )
+    logger.info(f"✅ Verification complete (sources checked: {verification_results.get('verification_summary', {}).get('total_sources', 0)})")
+    if on_stage:
+        await on_stage("verified", {"verification_results": verification_results})
+
+    # Step 3: Determine verdict based on verification results
+    logger.info("🔍 Step 3: Determining verdict...")
+    with stage_timer("verdict"):
+        verdict_data = determine_verdict(verification_results)
+    logger.info(f"✅ Verdict: {verdict_data['verdict']} (Confidence: {verdict_data['confidence_score']:.2%})")
+    if on_stage:
+        await on_stage("verdict", {"verdict_data": verdict_data})
+
+    # Step 4: Generate human-friendly explanation
+    logger.info("🔍 Step 4: Generating explanation...")
+    explain = explanation_from_fused if FUSED_MODE else generate_explanation
+    with stage_timer("explanation"):
+        explanation_data = await explain(
+            original_claim=claim,
+            extracted_claim=extracted_claim,
+            verification_results=verification_results,
+            verdict_data=verdict_data
+        )
+    logger.info("✅ Explanation generated")
+
+    # Combine all results
+    response = VerifyResponse(
+        original_claim=claim,
+        extracted_claim=extracted_claim,
+        verdict=verdict_data["verdict"],
+        confidence_score=verdict_data["confidence_score"],
+        real_news_summary=explanation_data["real_news_summary"],
+        detailed_explanation=explanation_data["detailed_explanation"],
+        evidence_points=explanation_data["evidence_points"],
+        sources=explanation_data["sources"],
+        agent_reasoning=explanation_data.get("agent_reasoning"),
+        skipped_sources=verification_results.get("skipped_sources", [])
+    )
+
+    # Don't cache results produced by error fallbacks (e.g. Gemini quota errors)
+    if "error" not in verification_results and verification_results.get("ai_analysis", {}).get("confidence", 0.0) > 0.0:
+        cache_verdict(claim, response)
+    record_verification(response.verdict.value, "pipeline", time.perf_counter() - start)
+    return response
+
+
+async def run_batch_verification(claims: list, concurrency: int = None):
+    """
+    Verifies many claims with bounded concurrency, yielding results as they finish.
+    
+    Claims that normalize to the same text are verified once; every duplicate
+    gets a copy of the result pointing at the first occurrence. A failing claim
+    produces an error item and does not affect the others.
+    
+    Args:
+        claims: Raw claim texts
+        concurrency: Maximum claims verified at once, defaults to BATCH_CONCURRENCY
+    
+    Yields:
+        BatchItemResult for every input claim, in completion order
+    """
+    concurrency = min(concurrency or BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    # Group input positions by normalized claim; the first position leads
+    groups = {}
+    for index, claim in enumerate(claims):
+        groups.setdefault(claim_cache_key(claim), []).append(index)
+    
+    async def verify_group(indexes: list) -> list:
+        leader = indexes[0]
+        claim = claims[leader]
+        try:
+            if len(claim.strip()) < MIN_CLAIM_LENGTH:
+                raise NoClaimFoundError(f"Claim must be at least {MIN_CLAIM_LENGTH} characters long")
+            async with semaphore:
+                # Batch items yield Gemini quota to interactive requests
+                with llm_priority("batch"):
+                    response = await run_verification(claim)
+            items = [
+                BatchItemResult(
+                    index=index,
+                    claim=claims[index],
+                    status="ok",
+                    result=response.model_copy(update={"original_claim": claims[index]}),
+                    duplicate_of=None if index == leader else leader
+                )
+                for index in indexes
+            ]
+        except Exception as e:
+            logger.error(f"❌ Batch item {leader} failed: {str(e)}")
+            items = [
+                BatchItemResult(
+                    index=index,
+                    claim=claims[index],
+                    status="error",
+                    error=str(e),
+                    duplicate_of=None if index == leader else leader
+                )
+                for index in indexes
+            ]
+        return items
+    
+    logger.info(f"📦 Batch of {len(claims)} claims ({len(groups)} unique, concurrency {concurrency})")
+    tasks = [asyncio.create_task(verify_group(indexes)) for indexes in groups.values()]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for item in await finished:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
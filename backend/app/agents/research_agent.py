@@ -1,12 +1,9 @@
-import google.generativeai as genai
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+import json
+from app.utils.gemini_client import generate_text
+from app.utils.prompt_budget import PromptBudget, truncate_to_tokens, CLAIM_MAX_TOKENS, SNIPPET_MAX_TOKENS
+from app.utils.tracing import traced
 
+@traced("agent.research", lambda result: {"verdict": result.get("verdict_suggestion"), "confidence": result.get("confidence")})
 async def analyze_with_gemini(claim: str, search_results: list) -> dict:
     """
     Uses Gemini AI to analyze search results and make intelligent verdict.
@@ -19,6 +16,8 @@ async def analyze_with_gemini(claim: str, search_results: list) -> dict:
         Dictionary with AI analysis including verdict and evidence
     """
     try:
+        claim = truncate_to_tokens(claim, CLAIM_MAX_TOKENS)
+        
         # If no search results, use Gemini's knowledge directly
         if not search_results or len(search_results) == 0:
             print(f"No search results available. Using Gemini's built-in knowledge for: {claim}")
@@ -54,9 +53,7 @@ Guidelines:
 Return ONLY the JSON, no additional text."""
 
             try:
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                response = model.generate_content(fallback_prompt)
-                response_text = response.text.strip()
+                response_text = await generate_text(fallback_prompt, stage="fallback_analysis")
                 
                 # Remove markdown code blocks if present
                 if response_text.startswith("```json"):
@@ -66,7 +63,6 @@ Return ONLY the JSON, no additional text."""
                 if response_text.endswith("```"):
                     response_text = response_text[:-3]
                 
-                import json
                 analysis = json.loads(response_text.strip())
                 
                 return {
@@ -89,20 +85,19 @@ Return ONLY the JSON, no additional text."""
                     "sources_analyzed": 0
                 }
         
-        # Prepare context from search results
+        # Prepare context from search results (best first; trimmed to the token budget)
         context_parts = []
         for idx, result in enumerate(search_results[:5], 1):
             context_parts.append(
                 f"Source {idx}:\n"
                 f"Title: {result.get('title', 'N/A')}\n"
-                f"Snippet: {result.get('snippet', 'N/A')}\n"
+                f"Snippet: {truncate_to_tokens(result.get('snippet') or 'N/A', SNIPPET_MAX_TOKENS)}\n"
                 f"URL: {result.get('url', 'N/A')}\n"
             )
         
-        context = "\n".join(context_parts)
-        
         # Create prompt for Gemini
-        prompt = f"""You are an expert fact-checker analyzing information to verify a claim.
+        budget = PromptBudget("analysis")
+        prompt = budget.fit(lambda context: f"""You are an expert fact-checker analyzing information to verify a claim.
 
 CLAIM TO VERIFY: "{claim}"
 
@@ -130,15 +125,12 @@ Guidelines:
 - MISLEADING: Mixed evidence, partially true, taken out of context (confidence 0.4-0.7)
 - UNVERIFIED: Insufficient evidence or conflicting sources (confidence < 0.4)
 
-Be objective and evidence-based. Return ONLY the JSON, no additional text."""
+Be objective and evidence-based. Return ONLY the JSON, no additional text.""", context_parts)
 
         # Call Gemini
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
+        response_text = await generate_text(prompt, stage="analysis")
         
         # Parse JSON response
-        import json
-        response_text = response.text.strip()
         
         # Remove markdown code blocks if present
         if response_text.startswith("```json"):
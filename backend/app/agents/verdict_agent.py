@@ -1,5 +1,7 @@
 from app.models.response_model import VerdictType
+from app.utils.tracing import traced
 
+@traced("agent.verdict", lambda result: {"verdict": getattr(result.get("verdict"), "value", None), "confidence": result.get("confidence_score")})
 def determine_verdict(verification_results: dict) -> dict:
     """
     Determines the verdict based on verification results, prioritizing AI analysis.
@@ -3,15 +3,146 @@ from app.tools.google_search import search_google
 from app.tools.web_scraper import scrape_news_search, scrape_news_api
 from app.tools.indian_factcheckers import search_all_indian_factcheckers
 from app.agents.research_agent import analyze_with_gemini
+from app.agents.fused_agent import analyze_and_explain
 from app.utils.preprocess import clean_text
-import asyncio
+from app.utils.deadline import gather_with_budget
+from app.utils.evidence import rank_evidence
+from app.utils.metrics import stage_timer, timed_source
+from app.utils.tracing import traced
+import os
+import time
 
-async def verify_claim(claim: str) -> dict:
+# Latency budget for gathering sources (seconds)
+SOURCE_BUDGET = float(os.getenv("SOURCE_BUDGET", "8"))
+SOURCE_SOFT_TIMEOUT = float(os.getenv("SOURCE_SOFT_TIMEOUT", "3"))
+SOURCE_HARD_TIMEOUT = float(os.getenv("SOURCE_HARD_TIMEOUT", "10"))
+ENOUGH_EVIDENCE_RESULTS = int(os.getenv("ENOUGH_EVIDENCE_RESULTS", "8"))
+
+# The Indian aggregator runs its own budget, so give it more room before dropping it
+SOURCE_TIMEOUTS = {
+    "indian_factcheckers": (SOURCE_SOFT_TIMEOUT + 1.5, SOURCE_HARD_TIMEOUT),
+}
+
+# Source tools run for every claim, keyed by their name in the verification results
+SOURCE_TOOLS = {
+    "fact_check_api": search_fact_check_api,
+    "google_search": search_google,
+    "indian_factcheckers": search_all_indian_factcheckers,
+    "web_scraper": scrape_news_search,
+    "news_api": scrape_news_api,
+}
+
+SOURCE_LABELS = {
+    "fact_check_api": "Fact Check API",
+    "google_search": "Google Search",
+    "indian_factcheckers": "Indian fact-checkers",
+    "web_scraper": "Web scraper",
+    "news_api": "NewsAPI",
+}
+
+
+def has_enough_evidence(results: dict) -> bool:
+    """
+    Early-completion rule: enough results overall, including at least one
+    from a fact-checker.
+    """
+    results = {source: result for source, result in results.items() if isinstance(result, dict)}
+    total = sum(len(result.get("claims", result.get("results", []))) for result in results.values())
+    fact_checked = bool(
+        results.get("fact_check_api", {}).get("claims")
+        or results.get("indian_factcheckers", {}).get("results")
+    )
+    return total >= ENOUGH_EVIDENCE_RESULTS and fact_checked
+
+
+def empty_source_result(source: str, error: str) -> dict:
+    """
+    Builds the empty result a source contributes when it fails.
+    """
+    if source == "fact_check_api":
+        return {"claims": [], "error": error}
+    return {"results": [], "error": error}
+
+
+@traced("agent.gather_sources", lambda results: {"sources": len(results), "skipped": sum(1 for r in results.values() if r.get("skipped"))})
+async def gather_sources(cleaned_claim: str, on_source=None, prefetched: dict = None,
+                         exclude: tuple = (), deadline: float = None) -> dict:
+    """
+    Runs all source tools in parallel under the SOURCE_BUDGET latency budget.
+    Sources still running at their hard timeout, or past their soft timeout
+    once there is enough evidence, are cancelled and reported as skipped.
+    
+    Args:
+        cleaned_claim: The cleaned claim to search for
+        on_source: Optional async callback `on_source(source, result)` awaited
+            as soon as each source finishes
+        prefetched: Optional results already fetched per source (e.g. by
+            speculative fetching); only the remaining sources are queried
+        exclude: Sources not to query (left out of the results)
+        deadline: Optional time.monotonic() deadline replacing SOURCE_BUDGET,
+            e.g. what is left of a speculative lookup's budget
+    
+    Returns:
+        Dictionary mapping source name to its result; skipped sources get an
+        empty result with "skipped": True
+    """
+    prefetched = {source: result for source, result in (prefetched or {}).items()
+                  if source in SOURCE_TOOLS and source not in exclude}
+    
+    async def run_source(source: str, tool):
+        try:
+            result = await timed_source(source, tool(cleaned_claim))
+        except Exception as e:
+            print(f"{SOURCE_LABELS[source]} error: {e}")
+            result = empty_source_result(source, str(e))
+        
+        if on_source:
+            await on_source(source, result)
+        return result
+    
+    # Reused results are not subject to the budget, but count towards "enough"
+    if on_source:
+        for source, result in prefetched.items():
+            await on_source(source, result)
+    
+    budget = SOURCE_BUDGET if deadline is None else max(0.0, deadline - time.monotonic())
+    completed, skipped = await gather_with_budget(
+        {
+            source: run_source(source, tool) for source, tool in SOURCE_TOOLS.items()
+            if source not in prefetched and source not in exclude
+        },
+        budget=budget,
+        soft_timeout=SOURCE_SOFT_TIMEOUT,
+        hard_timeout=SOURCE_HARD_TIMEOUT,
+        timeouts=SOURCE_TIMEOUTS,
+        enough=lambda results: has_enough_evidence({**prefetched, **results})
+    )
+    
+    results = dict(prefetched)
+    results.update({
+        source: empty_source_result(source, str(result)) if isinstance(result, Exception) else result
+        for source, result in completed.items()
+    })
+    for source in skipped:
+        print(f"{SOURCE_LABELS[source]} skipped: latency budget exceeded")
+        results[source] = {**empty_source_result(source, "Skipped: latency budget exceeded"), "skipped": True}
+    return results
+
+
+@traced("agent.verify_claim", lambda results: {"total_sources": results.get("verification_summary", {}).get("total_sources", 0)})
+async def verify_claim(claim: str, on_source=None, fused: bool = False, prefetched: dict = None,
+                       deadline: float = None) -> dict:
     """
     Verifies a claim using multiple sources and AI analysis.
     
     Args:
         claim: The extracted factual claim to verify
+        on_source: Optional async callback `on_source(source, result)` awaited
+            as soon as each source finishes
+        fused: Ask Gemini for the analysis and the explanation in one call;
+            the explanation is returned under ai_analysis["explanation"]
+        prefetched: Optional source results to reuse instead of querying
+        deadline: Optional time.monotonic() deadline for the source lookups
     
     Returns:
         Dictionary containing verification results from all sources
@@ -21,42 +152,18 @@ async def verify_claim(claim: str) -> dict:
         cleaned_claim = clean_text(claim)
         
         # Run verification tools in parallel (Google APIs + Indian Fact-Checkers + Web Scraper)
-        fact_check_task = search_fact_check_api(cleaned_claim)
-        google_search_task = search_google(cleaned_claim)
-        indian_factcheckers_task = search_all_indian_factcheckers(cleaned_claim)
-        web_scraper_task = scrape_news_search(cleaned_claim)
-        news_api_task = scrape_news_api(cleaned_claim)
-        
-        # Wait for all results
-        fact_check_results, google_results, indian_results, scraper_results, news_results = await asyncio.gather(
-            fact_check_task,
-            google_search_task,
-            indian_factcheckers_task,
-            web_scraper_task,
-            news_api_task,
-            return_exceptions=True
-        )
+        with stage_timer("sources"):
+            source_results = await gather_sources(cleaned_claim, on_source=on_source, prefetched=prefetched,
+                                                  deadline=deadline)
+        fact_check_results = source_results["fact_check_api"]
+        google_results = source_results["google_search"]
+        indian_results = source_results["indian_factcheckers"]
+        scraper_results = source_results["web_scraper"]
+        news_results = source_results["news_api"]
         
-        # Handle exceptions
-        if isinstance(fact_check_results, Exception):
-            print(f"Fact Check API error: {fact_check_results}")
-            fact_check_results = {"claims": [], "error": str(fact_check_results)}
-            
-        if isinstance(google_results, Exception):
-            print(f"Google Search error: {google_results}")
-            google_results = {"results": [], "error": str(google_results)}
-        
-        if isinstance(indian_results, Exception):
-            print(f"Indian fact-checkers error: {indian_results}")
-            indian_results = {"results": [], "error": str(indian_results)}
-        
-        if isinstance(scraper_results, Exception):
-            print(f"Web scraper error: {scraper_results}")
-            scraper_results = {"results": [], "error": str(scraper_results)}
-            
-        if isinstance(news_results, Exception):
-            print(f"NewsAPI error: {news_results}")
-            news_results = {"results": [], "error": str(news_results)}
+        # Sources dropped by the latency budget, including individual Indian fact-checkers
+        skipped_sources = [source for source, result in source_results.items() if result.get("skipped")]
+        skipped_sources += indian_results.get("skipped_sources", [])
         
         # Combine all search results (Indian Fact-Checkers + Google + Scraper + NewsAPI)
         all_search_results = []
@@ -67,8 +174,17 @@ async def verify_claim(claim: str) -> dict:
         
         print(f"🇮🇳 Total search results: {len(all_search_results)} (Indian: {len(indian_results.get('results', []))}, Google: {len(google_results.get('results', []))}, Scraper: {len(scraper_results.get('results', []))}, NewsAPI: {len(news_results.get('results', []))})")
         
-        # Use Gemini AI to analyze all search results
-        ai_analysis = await analyze_with_gemini(cleaned_claim, all_search_results)
+        # Deduplicate and rank so the AI sees the most relevant, credible evidence
+        with stage_timer("evidence_ranking"):
+            ranked_results, ranking_stats = rank_evidence(cleaned_claim, all_search_results)
+        print(f"📊 Evidence ranking: {ranking_stats}")
+        
+        # Use Gemini AI to analyze the best search results
+        with stage_timer("analysis"):
+            if fused:
+                ai_analysis = await analyze_and_explain(cleaned_claim, ranked_results)
+            else:
+                ai_analysis = await analyze_with_gemini(cleaned_claim, ranked_results)
         
         # Compile verification results
         verification_results = {
@@ -80,6 +196,7 @@ async def verify_claim(claim: str) -> dict:
             "web_scraper": scraper_results,
             "news_api": news_results,
             "ai_analysis": ai_analysis,
+            "skipped_sources": skipped_sources,
             "verification_summary": {
                 "fact_check_found": len(fact_check_results.get("claims", [])) > 0,
                 "indian_results_count": len(indian_results.get("results", [])),
@@ -87,7 +204,8 @@ async def verify_claim(claim: str) -> dict:
                 "scraper_results_count": len(scraper_results.get("results", [])),
                 "news_results_count": len(news_results.get("results", [])),
                 "ai_confidence": ai_analysis.get("confidence", 0.0),
-                "total_sources": len(all_search_results) + len(fact_check_results.get("claims", []))
+                "total_sources": len(all_search_results) + len(fact_check_results.get("claims", [])),
+                "evidence_ranking": ranking_stats
             }
         }
         
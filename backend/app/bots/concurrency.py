@@ -0,0 +1,208 @@
+"""
+Concurrent update handling for the Telegram bot.
+
+By default python-telegram-bot handles one update at a time, so a single
+15-second verification holds up every other chat. The bot instead runs
+updates concurrently through ChatUpdateProcessor, with two limits:
+
+- per chat: updates of one chat are handled one after another, in the order
+  they arrived, so replies stay in order. A chat with more than
+  TELEGRAM_MAX_PENDING_PER_CHAT updates waiting gets a "still working" reply
+  for the extra ones.
+- verifications: at most TELEGRAM_MAX_VERIFICATIONS run at once
+  (VerificationSlots). Up to TELEGRAM_MAX_QUEUED more wait for a slot; when
+  that queue is full, new claims are turned away with a busy reply instead
+  of waiting minutes.
+
+Commands (/start, /help, ...) only count towards the per-chat order, so they
+are answered even when every verification slot is taken. Queue depth, wait
+and handling times are recorded in the factcheck_telegram_* metrics.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from app.utils.metrics import (
+    TELEGRAM_UPDATES, TELEGRAM_UPDATE_DURATION, TELEGRAM_CHAT_BACKLOG, TELEGRAM_VERIFICATIONS_RUNNING,
+    TELEGRAM_VERIFICATIONS_QUEUED, TELEGRAM_QUEUE_WAIT, TELEGRAM_REJECTED
+)
+
+# Updates handled at once across all chats (mostly waiting on the network)
+TELEGRAM_CONCURRENT_UPDATES = int(os.getenv("TELEGRAM_CONCURRENT_UPDATES", "64"))
+TELEGRAM_MAX_VERIFICATIONS = int(os.getenv("TELEGRAM_MAX_VERIFICATIONS", "8"))
+TELEGRAM_MAX_QUEUED = int(os.getenv("TELEGRAM_MAX_QUEUED", "32"))
+TELEGRAM_MAX_PENDING_PER_CHAT = int(os.getenv("TELEGRAM_MAX_PENDING_PER_CHAT", "3"))
+
+CHAT_BACKLOG_MESSAGE = (
+    "⏳ I'm still working on your earlier messages. "
+    "Please wait for those results before sending more."
+)
+
+
+class QueueFull(Exception):
+    """
+    Raised when every verification slot is taken and the queue is full.
+    """
+    pass
+
+
+class VerificationSlots:
+    """
+    Bounded number of running verifications with a bounded wait queue.
+
+    Args:
+        max_running: Verifications allowed to run at once
+        max_queued: Verifications allowed to wait for a slot
+    """
+
+    def __init__(self, max_running: int = TELEGRAM_MAX_VERIFICATIONS, max_queued: int = TELEGRAM_MAX_QUEUED):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self._semaphore = asyncio.Semaphore(max_running)
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Holds a verification slot for the duration of the block, waiting for
+        one if needed.
+
+        Raises:
+            QueueFull: No slot is free and max_queued callers already wait
+        """
+        if self._semaphore.locked() and self.queued >= self.max_queued:
+            self.rejected += 1
+            TELEGRAM_REJECTED.inc(reason="queue_full")
+            raise QueueFull(f"{self.running} verifications running, {self.queued} queued")
+
+        start = time.perf_counter()
+        self.queued += 1
+        TELEGRAM_VERIFICATIONS_QUEUED.set(self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+            TELEGRAM_VERIFICATIONS_QUEUED.set(self.queued)
+        TELEGRAM_QUEUE_WAIT.observe(time.perf_counter() - start)
+
+        self.running += 1
+        TELEGRAM_VERIFICATIONS_RUNNING.set(self.running)
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self.completed += 1
+            TELEGRAM_VERIFICATIONS_RUNNING.set(self.running)
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_running": self.max_running,
+            "max_queued": self.max_queued,
+            "running": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+class _ChatQueue:
+    __slots__ = ("lock", "pending")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+def update_kind(update) -> str:
+    """
+    "command", "message" or "other", used as the metric label.
+    """
+    message = getattr(update, "effective_message", None)
+    if message is None or not message.text:
+        return "other"
+    return "command" if message.text.startswith("/") else "message"
+
+
+class ChatUpdateProcessor(BaseUpdateProcessor):
+    """
+    Handles updates concurrently, but one at a time and in order per chat.
+
+    Args:
+        max_concurrent_updates: Updates handled at once across all chats
+        max_pending_per_chat: Updates a chat may have waiting before extra
+            ones are answered with CHAT_BACKLOG_MESSAGE and dropped
+    """
+
+    def __init__(self, max_concurrent_updates: int = TELEGRAM_CONCURRENT_UPDATES,
+                 max_pending_per_chat: int = TELEGRAM_MAX_PENDING_PER_CHAT):
+        super().__init__(max_concurrent_updates)
+        self.max_pending_per_chat = max_pending_per_chat
+        self._chats = {}
+        self.pending = 0
+
+    async def do_process_update(self, update, coroutine):
+        kind = update_kind(update)
+        TELEGRAM_UPDATES.inc(kind=kind)
+        chat = getattr(update, "effective_chat", None)
+        if chat is None:
+            await coroutine
+            return
+
+        queue = self._chats.get(chat.id)
+        if queue is None:
+            queue = self._chats[chat.id] = _ChatQueue()
+        if kind == "message" and queue.pending >= self.max_pending_per_chat:
+            coroutine.close()
+            TELEGRAM_REJECTED.inc(reason="chat_backlog")
+            await self._reply(update, CHAT_BACKLOG_MESSAGE)
+            return
+
+        start = time.perf_counter()
+        queue.pending += 1
+        self.pending += 1
+        TELEGRAM_CHAT_BACKLOG.set(self.pending)
+        try:
+            # asyncio.Lock wakes waiters in FIFO order, so the chat's updates run as they arrived
+            async with queue.lock:
+                await coroutine
+        finally:
+            # Cancelled while waiting for the chat's turn: the handler never started
+            coroutine.close()
+            queue.pending -= 1
+            self.pending -= 1
+            TELEGRAM_CHAT_BACKLOG.set(self.pending)
+            if queue.pending == 0 and self._chats.get(chat.id) is queue:
+                del self._chats[chat.id]
+            TELEGRAM_UPDATE_DURATION.observe(time.perf_counter() - start, kind=kind)
+
+    async def _reply(self, update: Update, text: str):
+        try:
+            await update.effective_message.reply_text(text)
+        except Exception as e:
+            print(f"Telegram reply failed: {str(e)}")
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent_updates": self.max_concurrent_updates,
+            "max_pending_per_chat": self.max_pending_per_chat,
+            "pending": self.pending,
+            "active_chats": len(self._chats),
+        }
+
+
+verification_slots = VerificationSlots()
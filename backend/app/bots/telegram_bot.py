@@ -5,15 +5,20 @@ Allows users to verify claims through Telegram chat
 
 import os
 import asyncio
+from aiohttp import web
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
-from app.agents.extractor_agent import extract_claim
-from app.agents.verification_agent import verify_claim
-from app.agents.verdict_agent import determine_verdict
-from app.agents.explanation_agent import generate_explanation
+from app.agents.pipeline import run_verification, NoClaimFoundError
+from app.bots.concurrency import ChatUpdateProcessor, QueueFull, verification_slots
+from app.utils import http_client
+from app.utils.metrics import render_prometheus
+from app.utils.rate_limiter import llm_priority
+from app.utils import tracing
 
 # Get bot token from environment
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+# Serve Prometheus metrics of the bot process on this port (0 = off)
+TELEGRAM_METRICS_PORT = int(os.getenv("TELEGRAM_METRICS_PORT", "0"))
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
@@ -126,47 +131,53 @@ async def verify_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         parse_mode='Markdown'
     )
     
+    # Source counts are only known when the pipeline actually runs (not on a cache hit)
+    source_counts = {}
+    
+    async def report_progress(stage: str, data: dict):
+        if stage == "extracted":
+            await processing_msg.edit_text(
+                f"🔍 **Step 2/4:** Verifying with Indian fact-checkers...\n\n"
+                f"_Claim: {data['extracted_claim']}_",
+                parse_mode='Markdown'
+            )
+        elif stage == "verified":
+            summary = data["verification_results"].get("verification_summary", {})
+            source_counts["indian"] = summary.get("indian_results_count", 0)
+            source_counts["total"] = summary.get("total_sources", 0)
+            await processing_msg.edit_text(
+                "🔍 **Step 3/4:** AI analyzing all sources...",
+                parse_mode='Markdown'
+            )
+        elif stage == "verdict":
+            await processing_msg.edit_text(
+                "🔍 **Step 4/4:** Generating detailed explanation...",
+                parse_mode='Markdown'
+            )
+    
     try:
-        # Step 1: Extract claims
-        await processing_msg.edit_text(
-            "🔍 **Step 1/4:** Extracting claims with AI...",
-            parse_mode='Markdown'
-        )
-        claim = await extract_claim(user_text)
-        
-        if not claim or len(claim.strip()) == 0:
+        # Waits here while every verification slot is taken
+        async with verification_slots.slot():
+            # Step 1: Extract claims
             await processing_msg.edit_text(
-                "❌ No verifiable claims found in your text.\n\n"
-                "Try sending a more specific statement or claim!",
+                "🔍 **Step 1/4:** Extracting claims with AI...",
                 parse_mode='Markdown'
             )
-            return
-        
-        # Step 2: Verify with all sources
-        await processing_msg.edit_text(
-            f"🔍 **Step 2/4:** Verifying with Indian fact-checkers...\n\n"
-            f"_Claim: {claim}_",
-            parse_mode='Markdown'
-        )
-        verification_results = await verify_claim(claim)
-        
-        # Step 3: Determine verdict
-        await processing_msg.edit_text(
-            "🔍 **Step 3/4:** AI analyzing all sources...",
-            parse_mode='Markdown'
-        )
-        verdict_data = determine_verdict(verification_results)
-        
-        # Step 4: Generate explanation
-        await processing_msg.edit_text(
-            "🔍 **Step 4/4:** Generating detailed explanation...",
-            parse_mode='Markdown'
-        )
-        explanation = await generate_explanation(user_text, claim, verification_results, verdict_data)
+            
+            try:
+                with llm_priority("telegram"), tracing.start_trace("telegram.verify_message"):
+                    response = await run_verification(user_text, on_stage=report_progress)
+            except NoClaimFoundError:
+                await processing_msg.edit_text(
+                    "❌ No verifiable claims found in your text.\n\n"
+                    "Try sending a more specific statement or claim!",
+                    parse_mode='Markdown'
+                )
+                return
         
         # Build result message
-        verdict = verdict_data.get("verdict", "UNVERIFIED")
-        confidence = verdict_data.get("confidence", 0.0)
+        verdict = response.verdict.value
+        confidence = response.confidence_score
         
         # Verdict emoji
         verdict_emoji = {
@@ -177,29 +188,29 @@ async def verify_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         }.get(verdict, "❓")
         
         # Count sources
-        indian_count = verification_results.get("verification_summary", {}).get("indian_results_count", 0)
-        total_sources = verification_results.get("verification_summary", {}).get("total_sources", 0)
-        
-        # Get explanation text
-        real_news = explanation.get("real_news_summary", "")
-        detailed = explanation.get("detailed_explanation", "")
+        if source_counts:
+            sources_line = (
+                f"🇮🇳 {source_counts['indian']} Indian fact-checkers\n"
+                f"📰 {source_counts['total']} total sources"
+            )
+        else:
+            sources_line = f"📰 {len(response.sources)} sources cited (recently verified)"
         
         result_message = f"""
 {verdict_emoji} **Verdict: {verdict}**
 📊 Confidence: {confidence*100:.1f}%
 
 **Claim:**
-_{claim}_
+_{response.extracted_claim}_
 
 **Summary:**
-{real_news}
+{response.real_news_summary}
 
 **Detailed Analysis:**
-{detailed}
+{response.detailed_explanation}
 
 **Sources Checked:**
-🇮🇳 {indian_count} Indian fact-checkers
-📰 {total_sources} total sources
+{sources_line}
 
 _Verified by FactCheckit AI_
 """
@@ -207,6 +218,12 @@ _Verified by FactCheckit AI_
         # Send final result
         await processing_msg.edit_text(result_message, parse_mode='Markdown')
         
+    except QueueFull:
+        await processing_msg.edit_text(
+            "🚦 I'm verifying a lot of claims right now.\n\n"
+            "Please send yours again in a minute!"
+        )
+        
     except Exception as e:
         error_message = f"❌ Error processing your request:\n\n`{str(e)}`\n\nPlease try again later."
         await processing_msg.edit_text(error_message, parse_mode='Markdown')
@@ -220,6 +237,38 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     print(f"Update {update} caused error {context.error}")
 
 
+async def metrics_endpoint(request: web.Request) -> web.Response:
+    """
+    Prometheus metrics of the bot process
+    """
+    return web.Response(text=render_prometheus(), content_type="text/plain", charset="utf-8")
+
+
+async def post_init(application: Application):
+    """
+    Start the metrics endpoint if TELEGRAM_METRICS_PORT is set
+    """
+    if not TELEGRAM_METRICS_PORT:
+        return
+    metrics_app = web.Application()
+    metrics_app.router.add_get("/metrics", metrics_endpoint)
+    runner = web.AppRunner(metrics_app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", TELEGRAM_METRICS_PORT).start()
+    application.bot_data["metrics_runner"] = runner
+    print(f"📈 Metrics on http://0.0.0.0:{TELEGRAM_METRICS_PORT}/metrics")
+
+
+async def post_shutdown(application: Application):
+    """
+    Release the shared HTTP connection pool and stop the metrics endpoint
+    """
+    runner = application.bot_data.get("metrics_runner")
+    if runner is not None:
+        await runner.cleanup()
+    await http_client.shutdown()
+
+
 def run_bot():
     """
     Run the Telegram bot
@@ -231,8 +280,15 @@ def run_bot():
     
     print("🤖 Starting FactCheckit Telegram Bot...")
     
-    # Create application
-    application = Application.builder().token(BOT_TOKEN).build()
+    # Create application: updates are handled concurrently, in order per chat
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .concurrent_updates(ChatUpdateProcessor())
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
     
     # Add handlers
     application.add_handler(CommandHandler("start", start_command))
@@ -1,17 +1,49 @@
+from contextlib import asynccontextmanager
+import time
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import verify
+from starlette.datastructures import MutableHeaders
+from app.routers import verify, cache, sources, metrics, traces
+from app.utils import gemini_client, http_client, tracing, metrics as app_metrics
+from app.utils.http_cache import http_cache
+from app.tools import html_parsing
+from app.tools.factcheck_index import factcheck_index
+from app.tools.ingestion import start_background_ingestion
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Monitoring endpoints are not traced, so they do not crowd out real requests
+UNTRACED_PATHS = ("/metrics", "/api/metrics", "/api/traces", "/health")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks"""
+    warm_up_task = await http_client.startup()
+    ingestion_task = start_background_ingestion()
+    yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    if ingestion_task is not None:
+        ingestion_task.cancel()
+    await http_client.shutdown()
+    gemini_client.shutdown()
+    html_parsing.shutdown()
+    tracing.shutdown()
+    http_cache.close()
+    factcheck_index.close()
+
+
 app = FastAPI(
     title="FactCheckit API",
     description="🇮🇳 AI-powered Crisis News & Claim Verification Tool",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS configuration for Next.js frontend
@@ -30,8 +62,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class ServerTiming:
+    """
+    Times each request: stage and source timings go into a Server-Timing
+    header, and the request into the HTTP metrics
+
+    Plain ASGI middleware, so the trace and the timings stay open until the
+    last body chunk is sent: a streamed response (/api/verify/stream,
+    /api/verify/batch?stream=true) keeps the pipeline spans it runs while
+    streaming. Its Server-Timing header can only cover the time until the
+    headers were sent; the trace and the duration metric cover the stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        method = scope["method"]
+        traced = not scope["path"].startswith(UNTRACED_PATHS)
+        status = 500
+        with tracing.start_trace(f"{method} {scope['path']}", enabled=traced) as root_span:
+            with app_metrics.request_timing() as timings:
+                async def send_with_timing(message):
+                    nonlocal status
+                    if message["type"] == "http.response.start":
+                        status = message["status"]
+                        headers = MutableHeaders(scope=message)
+                        if root_span.trace_id:
+                            headers["X-Trace-Id"] = root_span.trace_id
+                        headers["Server-Timing"] = app_metrics.server_timing_header(
+                            timings, time.perf_counter() - start
+                        )
+                    await send(message)
+
+                await self.app(scope, receive, send_with_timing)
+            root_span.set(http_status=status)
+            if status >= 500:
+                root_span.fail(f"HTTP {status}")
+        elapsed = time.perf_counter() - start
+
+        # Label by route template, not raw path, to bound the number of series
+        route = scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        app_metrics.HTTP_REQUESTS.inc(method=method, path=path, status=status)
+        app_metrics.HTTP_DURATION.observe(elapsed, method=method, path=path)
+
+
+app.add_middleware(ServerTiming)
+
 # Include routers
 app.include_router(verify.router, prefix="/api", tags=["verification"])
+app.include_router(cache.router, prefix="/api", tags=["cache"])
+app.include_router(sources.router, prefix="/api", tags=["sources"])
+app.include_router(metrics.router, prefix="/api", tags=["metrics"])
+app.include_router(traces.router, prefix="/api", tags=["traces"])
 
 @app.get("/")
 async def root():
@@ -55,11 +144,25 @@ async def root():
         },
         "endpoints": {
             "verify": "/api/verify",
+            "verify_stream": "/api/verify/stream",
+            "verify_batch": "/api/verify/batch",
+            "cache": "/api/cache/sources",
+            "sources_health": "/api/sources/health",
+            "llm_usage": "/api/metrics/llm",
+            "llm_limiter": "/api/metrics/llm/limiter",
+            "singleflight": "/api/metrics/singleflight",
+            "prometheus": "/metrics",
+            "traces": "/api/traces",
             "docs": "/docs",
             "health": "/health"
         }
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Latency histograms, counters and error counts in Prometheus text format"""
+    return PlainTextResponse(app_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -1,4 +1,8 @@
-from .request_model import VerifyRequest
-from .response_model import VerifyResponse, VerdictType, Source, EvidencePoint
+from .request_model import VerifyRequest, BatchVerifyRequest
+from .response_model import VerifyResponse, VerdictType, Source, EvidencePoint, BatchItemResult, BatchVerifyResponse
 
-__all__ = ["VerifyRequest", "VerifyResponse", "VerdictType", "Source", "EvidencePoint"]
+__all__ = [
+    "VerifyRequest", "BatchVerifyRequest",
+    "VerifyResponse", "VerdictType", "Source", "EvidencePoint",
+    "BatchItemResult", "BatchVerifyResponse"
+]
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class VerifyRequest(BaseModel):
     claim: str = Field(..., min_length=10, max_length=1000, description="The claim or news headline to verify")
@@ -9,3 +10,19 @@ class VerifyRequest(BaseModel):
                 "claim": "Scientists have discovered a cure for all types of cancer in 2025"
             }
         }
+
+
+class BatchVerifyRequest(BaseModel):
+    claims: List[str] = Field(..., min_length=1, max_length=200, description="Claims or headlines to verify")
+    concurrency: Optional[int] = Field(None, ge=1, le=20, description="Maximum claims verified at once")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "claims": [
+                    "Scientists have discovered a cure for all types of cancer in 2025",
+                    "The Indian government announced free internet for all citizens"
+                ],
+                "concurrency": 5
+            }
+        }
@@ -27,6 +27,7 @@ class VerifyResponse(BaseModel):
     evidence_points: List[EvidencePoint]
     sources: List[Source]
     agent_reasoning: Optional[str] = None
+    skipped_sources: List[str] = []
     
     class Config:
         json_schema_extra = {
@@ -48,3 +49,19 @@ class VerifyResponse(BaseModel):
                 "agent_reasoning": "Verified through Google Fact Check API, Google Search, and cross-referenced with medical databases."
             }
         }
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    claim: str
+    status: str  # "ok" or "error"
+    result: Optional[VerifyResponse] = None
+    error: Optional[str] = None
+    duplicate_of: Optional[int] = None
+
+class BatchVerifyResponse(BaseModel):
+    total: int
+    unique_claims: int
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
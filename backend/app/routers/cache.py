@@ -0,0 +1,79 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from app.utils.verdict_cache import verdict_cache
+from app.utils.source_cache import all_source_caches, get_source_cache
+from app.utils.http_cache import http_cache
+
+router = APIRouter()
+
+
+@router.get("/cache/verdicts")
+async def verdict_cache_stats():
+    """
+    Hit/miss statistics for the claim-level verdict cache
+    """
+    return verdict_cache.stats()
+
+
+@router.delete("/cache/verdicts")
+async def purge_verdict_cache():
+    """
+    Remove all cached verdicts
+    """
+    purged = len(verdict_cache)
+    verdict_cache.clear()
+    return {"purged": purged}
+
+
+@router.get("/cache/sources")
+async def source_cache_stats():
+    """
+    Hit/miss statistics for every per-source result cache
+    """
+    return {source: cache.stats() for source, cache in all_source_caches().items()}
+
+
+@router.get("/cache/sources/{source}")
+async def source_cache_entries(source: str):
+    """
+    Statistics and live entries for one source cache
+    """
+    cache = _lookup_source_cache(source)
+    return {"stats": cache.stats(), "entries": cache.entries()}
+
+
+@router.delete("/cache/sources/{source}")
+async def purge_source_cache(source: str, key: str = None):
+    """
+    Purge one entry (by key) or every entry of a source cache
+    """
+    cache = _lookup_source_cache(source)
+    if key is not None:
+        return {"purged": 1 if cache.delete(key) else 0}
+
+    purged = len(cache)
+    cache.clear()
+    return {"purged": purged}
+
+
+@router.get("/cache/http")
+async def http_cache_stats():
+    """
+    Hit ratio, bytes saved and disk usage of the on-disk HTTP cache for scraped pages
+    """
+    return await asyncio.to_thread(http_cache.stats)
+
+
+@router.delete("/cache/http")
+async def purge_http_cache():
+    """
+    Remove every stored page from the on-disk HTTP cache
+    """
+    return {"purged": await asyncio.to_thread(http_cache.clear)}
+
+
+def _lookup_source_cache(source: str):
+    try:
+        return get_source_cache(source)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown source: {source}")
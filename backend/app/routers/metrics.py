@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from app.utils.llm_usage import usage_stats
+from app.utils.rate_limiter import gemini_limiter
+from app.utils.source_cache import all_source_flights
+from app.agents.pipeline import verification_flights
+
+router = APIRouter()
+
+
+@router.get("/metrics/llm")
+async def llm_usage_metrics():
+    """
+    Gemini token usage per pipeline stage and for the most recent requests
+    """
+    return usage_stats()
+
+
+@router.get("/metrics/llm/limiter")
+async def llm_limiter_metrics():
+    """
+    Gemini rate limiter state: bucket levels, queue depth and wait times per priority
+    """
+    return gemini_limiter.stats()
+
+
+@router.get("/metrics/singleflight")
+async def singleflight_metrics():
+    """
+    In-flight request coalescing: pipeline runs and upstream queries shared by identical concurrent calls
+    """
+    return {
+        "verification": verification_flights.stats(),
+        "sources": {source: flights.stats() for source, flights in all_source_flights().items()}
+    }
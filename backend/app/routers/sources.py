@@ -0,0 +1,45 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from app.utils.circuit_breaker import all_breakers, get_breaker
+from app.tools.scraping_engine import scraper_stats
+from app.tools.factcheck_index import factcheck_index
+
+router = APIRouter()
+
+
+@router.get("/sources/health")
+async def sources_health():
+    """
+    Circuit-breaker state and rolling error/latency/empty-result rates per source
+    """
+    return {source: breaker.snapshot() for source, breaker in all_breakers().items()}
+
+
+@router.get("/sources/scrapers")
+async def scrapers_stats():
+    """
+    Fetch/parse statistics of the fact-checker scrapers
+    """
+    return scraper_stats()
+
+
+@router.get("/sources/factcheck-index")
+async def factcheck_index_stats():
+    """
+    Size of the local fact-check index and its query hit ratio/latency
+    """
+    return await asyncio.to_thread(factcheck_index.stats)
+
+
+@router.post("/sources/{source}/reset")
+async def reset_source_circuit(source: str):
+    """
+    Close a source's circuit and clear its history
+    """
+    try:
+        breaker = get_breaker(source)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown source: {source}")
+
+    breaker.reset()
+    return breaker.snapshot()
@@ -0,0 +1,27 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException
+from app.utils import tracing
+
+router = APIRouter()
+
+
+@router.get("/traces")
+async def list_traces(limit: int = 50, status: Optional[str] = None, min_duration_ms: Optional[float] = None):
+    """
+    Most recent kept traces (sampled, slow or failed requests), newest first
+    """
+    return {
+        "stats": tracing.tracing_stats(),
+        "traces": tracing.recent_traces(limit, status, min_duration_ms)
+    }
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """
+    All spans of a kept trace, with its critical path
+    """
+    trace = tracing.get_trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (not kept or already evicted)")
+    return trace
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, HTTPException
-from app.models import VerifyRequest, VerifyResponse
-from app.agents.extractor_agent import extract_claim
-from app.agents.verification_agent import verify_claim
-from app.agents.verdict_agent import determine_verdict
-from app.agents.explanation_agent import generate_explanation
+from fastapi.responses import StreamingResponse
+from app.models import VerifyRequest, VerifyResponse, BatchVerifyRequest, BatchVerifyResponse
+from app.agents.pipeline import run_verification, run_batch_verification, NoClaimFoundError
+import asyncio
+import json
 import logging
 
 router = APIRouter()
@@ -20,6 +20,8 @@ async def verify_news_claim(request: VerifyRequest):
     2. Verify claim using multiple sources (Indian fact-checkers + AI)
     3. Determine verdict with confidence score
     4. Generate explanation with evidence and sources
+    
+    Repeated claims are answered from the verdict cache.
     """
     try:
         logger.info(f"📥 Received claim: {request.claim[:100]}...")
@@ -31,43 +33,7 @@ async def verify_news_claim(request: VerifyRequest):
                 detail="Claim must be at least 10 characters long"
             )
         
-        # Step 1: Extract clean factual claim
-        logger.info("🔍 Step 1: Extracting claim...")
-        extracted_claim = await extract_claim(request.claim)
-        logger.info(f"✅ Extracted: {extracted_claim}")
-        
-        # Step 2: Verify the claim using multiple tools
-        logger.info("🔍 Step 2: Verifying with Indian fact-checkers + AI...")
-        verification_results = await verify_claim(extracted_claim)
-        logger.info(f"✅ Verification complete (sources checked: {verification_results.get('verification_summary', {}).get('total_sources', 0)})")
-        
-        # Step 3: Determine verdict based on verification results
-        logger.info("🔍 Step 3: Determining verdict...")
-        verdict_data = determine_verdict(verification_results)
-        logger.info(f"✅ Verdict: {verdict_data['verdict']} (Confidence: {verdict_data['confidence_score']:.2%})")
-        
-        # Step 4: Generate human-friendly explanation
-        logger.info("🔍 Step 4: Generating explanation...")
-        explanation_data = await generate_explanation(
-            original_claim=request.claim,
-            extracted_claim=extracted_claim,
-            verification_results=verification_results,
-            verdict_data=verdict_data
-        )
-        logger.info(f"✅ Explanation generated")
-        
-        # Combine all results
-        response = VerifyResponse(
-            original_claim=request.claim,
-            extracted_claim=extracted_claim,
-            verdict=verdict_data["verdict"],
-            confidence_score=verdict_data["confidence_score"],
-            real_news_summary=explanation_data["real_news_summary"],
-            detailed_explanation=explanation_data["detailed_explanation"],
-            evidence_points=explanation_data["evidence_points"],
-            sources=explanation_data["sources"],
-            agent_reasoning=explanation_data.get("agent_reasoning")
-        )
+        response = await run_verification(request.claim)
         
         logger.info(f"🎉 Verification complete for claim")
         return response
@@ -75,6 +41,8 @@ async def verify_news_claim(request: VerifyRequest):
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
+    except NoClaimFoundError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Error in verify endpoint: {str(e)}")
         error_message = str(e)
@@ -95,3 +63,121 @@ async def verify_news_claim(request: VerifyRequest):
                 status_code=500, 
                 detail=f"Verification failed: {error_message}"
             )
+
+
+def format_sse(event: str, data) -> str:
+    """
+    Formats one Server-Sent Event.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_verification_events(claim: str):
+    """
+    Runs the pipeline and yields SSE events as each stage completes.
+    
+    Events, in order: "claim", one "source" per source tool, "verdict",
+    "explanation", then "result" with the full VerifyResponse. A cached or
+    near-duplicate verdict skips the stages it did not run. Failures emit a
+    single "error".
+    """
+    queue = asyncio.Queue()
+    verdict_sent = False
+    
+    async def on_stage(stage: str, data: dict):
+        nonlocal verdict_sent
+        if stage == "extracted":
+            await queue.put(("claim", data))
+        elif stage == "source":
+            result = data["result"]
+            items = result.get("claims", result.get("results", []))
+            await queue.put(("source", {
+                "source": data["source"],
+                "count": len(items),
+                "results": items,
+                "error": result.get("error")
+            }))
+        elif stage == "verdict":
+            verdict_data = data["verdict_data"]
+            verdict_sent = True
+            await queue.put(("verdict", {
+                "verdict": verdict_data["verdict"],
+                "confidence_score": verdict_data["confidence_score"],
+                "reasoning": verdict_data.get("reasoning", [])
+            }))
+    
+    async def run():
+        try:
+            response = await run_verification(claim, on_stage=on_stage)
+            if not verdict_sent:
+                await queue.put(("verdict", {
+                    "verdict": response.verdict,
+                    "confidence_score": response.confidence_score
+                }))
+            await queue.put(("explanation", response.model_dump(include={
+                "real_news_summary", "detailed_explanation", "evidence_points", "sources", "agent_reasoning"
+            })))
+            await queue.put(("result", response.model_dump()))
+        except NoClaimFoundError as e:
+            await queue.put(("error", {"status_code": 422, "detail": str(e)}))
+        except Exception as e:
+            logger.error(f"❌ Error in verify stream: {str(e)}")
+            await queue.put(("error", {"status_code": 500, "detail": f"Verification failed: {str(e)}"}))
+        finally:
+            await queue.put(None)
+    
+    task = asyncio.create_task(run())
+    try:
+        while (item := await queue.get()) is not None:
+            yield format_sse(*item)
+    finally:
+        # Client disconnected before the pipeline finished
+        if not task.done():
+            task.cancel()
+
+
+@router.post("/verify/stream")
+async def verify_news_claim_stream(request: VerifyRequest):
+    """
+    Streams verification progress as Server-Sent Events.
+    
+    The extracted claim arrives as soon as extraction finishes, followed by
+    each source's results as it resolves, the verdict and the explanation.
+    """
+    logger.info(f"📥 Received claim (stream): {request.claim[:100]}...")
+    return StreamingResponse(
+        stream_verification_events(request.claim),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/verify/batch", response_model=BatchVerifyResponse)
+async def verify_news_claims_batch(request: BatchVerifyRequest, stream: bool = False):
+    """
+    Verifies a list of claims in one request.
+    
+    Duplicate claims (after normalization) are verified once and claims run
+    with a bounded concurrency. A failing claim is reported in its own item
+    and does not fail the batch. With `?stream=true` the items are streamed
+    as NDJSON, one line per claim as it completes.
+    """
+    logger.info(f"📥 Received batch of {len(request.claims)} claims")
+    items = run_batch_verification(request.claims, request.concurrency)
+    
+    if stream:
+        async def ndjson_lines():
+            async for item in items:
+                yield item.model_dump_json() + "\n"
+        
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    
+    results = sorted([item async for item in items], key=lambda item: item.index)
+    succeeded = sum(1 for item in results if item.status == "ok")
+    return BatchVerifyResponse(
+        total=len(results),
+        unique_claims=sum(1 for item in results if item.duplicate_of is None),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
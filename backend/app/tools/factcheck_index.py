@@ -0,0 +1,446 @@
+"""
+Local full-text index of Indian fact-check articles.
+
+Articles from PIB, Alt News, BOOM, Factly and Vishvas are stored in SQLite
+with an FTS5 index over title and snippet. A claim is answered from the index,
+ranked by BM25, in milliseconds; live scraping is only needed when nothing
+relevant is indexed. Articles found by live scraping are written back, so the
+corpus grows with use.
+
+Bulk import from JSONL (one article per line):
+
+    python -m app.tools.factcheck_index import articles.jsonl
+
+Each line needs "url" and "title", plus optional "snippet", "source" (site key
+such as "altnews", or its label), "published_at", "verdict" and
+"credibility". A missing verdict is derived from the title with the site's
+keyword rules.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from app.utils import tracing
+from app.utils.similarity import normalize_for_similarity
+
+logger = logging.getLogger(__name__)
+
+FACTCHECK_INDEX_ENABLED = os.getenv("FACTCHECK_INDEX_ENABLED", "true").lower() == "true"
+FACTCHECK_INDEX_PATH = os.getenv("FACTCHECK_INDEX_PATH", os.path.join("data", "factcheck_index.sqlite3"))
+# Fraction of the claim's keywords an article must contain to count as a match
+FACTCHECK_INDEX_MIN_COVERAGE = float(os.getenv("FACTCHECK_INDEX_MIN_COVERAGE", "0.6"))
+FACTCHECK_INDEX_LIMIT = int(os.getenv("FACTCHECK_INDEX_LIMIT", "5"))
+MAX_MATCH_CLAUSES = 64
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "of", "in", "on", "at", "to",
+    "for", "by", "with", "and", "or", "that", "this", "it", "its", "as", "from", "has", "have",
+    "had", "will", "would", "can", "could", "all", "any", "now", "new", "says", "said", "claim",
+    "viral", "video", "photo", "news", "fact", "check", "fake", "false", "true",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    snippet TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL,
+    publisher TEXT NOT NULL,
+    published_at TEXT,
+    verdict TEXT NOT NULL DEFAULT 'UNVERIFIED',
+    credibility TEXT NOT NULL DEFAULT 'high',
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feed_state (
+    feed TEXT PRIMARY KEY,
+    body_hash TEXT,
+    last_polled REAL,
+    articles INTEGER NOT NULL DEFAULT 0
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, snippet, content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_vocab USING fts5vocab(articles_fts, 'row');
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, snippet) VALUES (new.id, new.title, new.snippet);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet);
+    INSERT INTO articles_fts(rowid, title, snippet) VALUES (new.id, new.title, new.snippet);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO articles (url, title, snippet, source, publisher, published_at, verdict, credibility, indexed_at)
+VALUES (:url, :title, :snippet, :source, :publisher, :published_at, :verdict, :credibility, :indexed_at)
+ON CONFLICT(url) DO UPDATE SET
+    title = excluded.title,
+    snippet = excluded.snippet,
+    verdict = excluded.verdict,
+    published_at = COALESCE(excluded.published_at, articles.published_at),
+    indexed_at = excluded.indexed_at
+"""
+
+
+def query_terms(claim: str) -> list:
+    """
+    Keywords of a claim used for the full-text query.
+    """
+    words = normalize_for_similarity(claim).split()
+    terms = []
+    for word in words:
+        if (len(word) > 1 or word.isdigit()) and word not in STOPWORDS and word not in terms:
+            terms.append(word)
+    return terms
+
+
+def build_match(terms: list, frequencies: dict, needed: int) -> str:
+    """
+    FTS5 query for articles containing at least `needed` of the terms.
+
+    Terms are quoted. Small queries are an OR of every AND-combination of
+    `needed` terms, which FTS5 answers by intersecting posting lists. Larger
+    ones fall back to an OR of the rarest terms: an article with `needed`
+    terms must contain at least one of the len(terms) - needed + 1 rarest,
+    and coverage is then checked on the candidates.
+
+    Args:
+        terms: Query keywords
+        frequencies: Number of indexed articles containing each term
+        needed: Minimum number of terms an article must contain
+
+    Returns:
+        MATCH expression, or "" if no article can qualify
+    """
+    present = [term for term in terms if frequencies.get(term)]
+    if len(present) < needed:
+        return ""
+
+    if math.comb(len(present), needed) <= MAX_MATCH_CLAUSES:
+        return " OR ".join(
+            "(" + " AND ".join(f'"{term}"' for term in combination) + ")"
+            for combination in itertools.combinations(present, needed)
+        )
+
+    rarest = sorted(terms, key=lambda term: frequencies.get(term, 0))[:len(terms) - needed + 1]
+    return " OR ".join(f'"{term}"' for term in rarest if frequencies.get(term))
+
+
+class FactCheckIndex:
+    """
+    SQLite/FTS5 store of fact-check articles.
+
+    Args:
+        path: Database file (":memory:" for a throwaway index)
+    """
+
+    def __init__(self, path: str = FACTCHECK_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self.queries = 0
+        self.hits = 0
+        self.query_seconds = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and self.path != ":memory:":
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def upsert_many(self, articles: list) -> int:
+        """
+        Inserts or updates articles (keyed by URL) in one transaction.
+
+        Args:
+            articles: Dictionaries with url, title, snippet, source, publisher,
+                published_at, verdict and credibility
+
+        Returns:
+            Number of articles written
+        """
+        now = time.time()
+        rows = [
+            {
+                "url": article["url"],
+                "title": article["title"],
+                "snippet": article.get("snippet") or "",
+                "source": article.get("source") or "",
+                "publisher": article.get("publisher") or article.get("source") or "",
+                "published_at": article.get("published_at"),
+                "verdict": article.get("verdict") or "UNVERIFIED",
+                "credibility": article.get("credibility") or "high",
+                "indexed_at": now,
+            }
+            for article in articles if article.get("url") and article.get("title")
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def known_urls(self, urls: list) -> set:
+        """
+        The subset of urls already in the index.
+        """
+        known = set()
+        urls = list(urls)
+        with self._lock:
+            conn = self._connection()
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                known.update(row[0] for row in conn.execute(
+                    f"SELECT url FROM articles WHERE url IN ({placeholders})", chunk
+                ))
+        return known
+
+    def feed_state(self, feed: str) -> dict:
+        """
+        Ingestion state of a feed: body_hash, last_polled and articles.
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT body_hash, last_polled, articles FROM feed_state WHERE feed = ?", (feed,)
+            ).fetchone()
+        if row is None:
+            return {"body_hash": None, "last_polled": None, "articles": 0}
+        return {"body_hash": row[0], "last_polled": row[1], "articles": row[2]}
+
+    def save_feed_state(self, feed: str, body_hash: str, new_articles: int):
+        """
+        Records a poll of a feed.
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO feed_state (feed, body_hash, last_polled, articles) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(feed) DO UPDATE SET
+                        body_hash = excluded.body_hash,
+                        last_polled = excluded.last_polled,
+                        articles = feed_state.articles + excluded.articles
+                    """,
+                    (feed, body_hash, time.time(), new_articles)
+                )
+
+    def search(self, claim: str, limit: int = FACTCHECK_INDEX_LIMIT,
+               min_coverage: float = FACTCHECK_INDEX_MIN_COVERAGE) -> list:
+        """
+        Finds indexed fact-checks matching a claim.
+
+        Only articles that can contain min_coverage of the claim's keywords
+        are matched (see build_match), rather than every article sharing a
+        common word. Candidates are ranked by BM25 (title weighted over
+        snippet) and kept if they reach min_coverage.
+
+        Args:
+            claim: Claim text
+            limit: Maximum number of results
+            min_coverage: Minimum fraction of keywords an article must contain
+
+        Returns:
+            Results in the scraper result shape, best first, with "score" and
+            "indexed": True
+        """
+        start = time.perf_counter()
+        terms = query_terms(claim)
+        results = []
+        if terms:
+            needed = max(1, math.ceil(min_coverage * len(terms)))
+            with self._lock:
+                conn = self._connection()
+                placeholders = ",".join("?" * len(terms))
+                frequencies = dict(conn.execute(
+                    f"SELECT term, doc FROM articles_vocab WHERE term IN ({placeholders})", terms
+                ).fetchall())
+                match = build_match(terms, frequencies, needed)
+                rows = conn.execute(
+                    """
+                    SELECT a.title, a.snippet, a.url, a.publisher, a.source, a.published_at,
+                           a.verdict, a.credibility, bm25(articles_fts, 3.0, 1.0) AS rank
+                    FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+                    WHERE articles_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                    """,
+                    (match, limit * 20)
+                ).fetchall() if match else []
+
+            for title, snippet, url, publisher, source, published_at, verdict, credibility, rank in rows:
+                words = set(normalize_for_similarity(f"{title} {snippet}").split())
+                coverage = sum(1 for term in terms if term in words) / len(terms)
+                if coverage < min_coverage:
+                    continue
+                results.append({
+                    "title": title,
+                    "snippet": snippet,
+                    "url": url,
+                    "source": publisher,
+                    "source_key": source,
+                    "published_at": published_at,
+                    "verdict": verdict,
+                    "credibility": credibility,
+                    "score": round(-rank, 3),
+                    "indexed": True
+                })
+                if len(results) >= limit:
+                    break
+
+        self.queries += 1
+        self.hits += 1 if results else 0
+        self.query_seconds += time.perf_counter() - start
+        return results
+
+    def stats(self) -> dict:
+        """
+        Corpus size per source and query statistics.
+        """
+        with self._lock:
+            conn = self._connection()
+            per_source = dict(conn.execute("SELECT source, COUNT(*) FROM articles GROUP BY source").fetchall())
+        size = os.path.getsize(self.path) if self.path != ":memory:" and os.path.exists(self.path) else None
+        return {
+            "enabled": FACTCHECK_INDEX_ENABLED,
+            "path": self.path,
+            "articles": sum(per_source.values()),
+            "per_source": per_source,
+            "file_bytes": size,
+            "queries": self.queries,
+            "hit_ratio": round(self.hits / self.queries, 3) if self.queries else 0.0,
+            "avg_query_ms": round(self.query_seconds / self.queries * 1000, 2) if self.queries else None,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+factcheck_index = FactCheckIndex()
+
+
+async def search_index(claim: str) -> list:
+    """
+    Queries the fact-check index without blocking the event loop.
+    Returns [] if the index is disabled or unavailable.
+    """
+    if not FACTCHECK_INDEX_ENABLED:
+        return []
+    try:
+        with tracing.span("tool.factcheck_index") as trace_span:
+            results = await asyncio.to_thread(factcheck_index.search, claim)
+            trace_span.set(results=len(results))
+            return results
+    except Exception as e:
+        logger.warning(f"Fact-check index query failed: {e}")
+        return []
+
+
+async def index_articles(articles: list) -> int:
+    """
+    Writes articles to the fact-check index without blocking the event loop.
+    """
+    if not FACTCHECK_INDEX_ENABLED or not articles:
+        return 0
+    try:
+        return await asyncio.to_thread(factcheck_index.upsert_many, articles)
+    except Exception as e:
+        logger.warning(f"Fact-check index write failed: {e}")
+        return 0
+
+
+def import_jsonl(path: str, index: FactCheckIndex = None, batch_size: int = 1000) -> int:
+    """
+    Bulk-imports articles from a JSONL file.
+
+    Args:
+        path: JSONL file, one article per line
+        index: Target index (defaults to the shared one)
+        batch_size: Articles written per transaction
+
+    Returns:
+        Number of articles imported
+    """
+    from app.tools.indian_factcheckers import FACTCHECKER_SPECS
+    from app.tools.scraping_engine import detect_verdict
+
+    index = index or factcheck_index
+    specs = {spec.key: spec for spec in FACTCHECKER_SPECS}
+    specs.update({spec.source_label: spec for spec in FACTCHECKER_SPECS})
+
+    imported = 0
+    batch = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                article = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"{path}:{line_number}: skipped invalid JSON ({e})")
+                continue
+
+            spec = specs.get(article.get("source") or article.get("publisher"))
+            if spec is not None:
+                article["source"] = spec.key
+                article.setdefault("publisher", spec.source_label)
+                article.setdefault("credibility", spec.credibility)
+                if not article.get("verdict"):
+                    article["verdict"] = detect_verdict(article.get("title", ""), spec.verdict_rules)
+            batch.append(article)
+
+            if len(batch) >= batch_size:
+                imported += index.upsert_many(batch)
+                batch = []
+
+    imported += index.upsert_many(batch)
+    return imported
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Manage the local fact-check index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Bulk-import articles from JSONL files")
+    import_parser.add_argument("files", nargs="+")
+    search_parser = commands.add_parser("search", help="Query the index")
+    search_parser.add_argument("claim")
+    commands.add_parser("stats", help="Show corpus size")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        for path in args.files:
+            start = time.perf_counter()
+            count = import_jsonl(path)
+            print(f"Imported {count} articles from {path} in {time.perf_counter() - start:.1f}s")
+    elif args.command == "search":
+        for result in factcheck_index.search(args.claim):
+            print(f"{result['score']:>7} {result['verdict']:<11} {result['source']}: {result['title']}")
+    print(json.dumps(factcheck_index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
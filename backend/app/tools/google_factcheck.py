@@ -1,10 +1,39 @@
-import aiohttp
 import asyncio
 import os
 from dotenv import load_dotenv
+from app.utils.http_client import get_session, upstream_url
+from app.utils.source_cache import cached_source
+from app.utils.circuit_breaker import circuit_breaker
 
 load_dotenv()
 
+def parse_fact_check_claims(data: dict) -> list:
+    """
+    Structures up to five claims of a Fact Check Tools claims:search response.
+    
+    Args:
+        data: Decoded JSON response
+    
+    Returns:
+        List of fact check dictionaries
+    """
+    structured_claims = []
+    for claim_data in data.get("claims", [])[:5]:  # Top 5 results
+        claim_review = claim_data.get("claimReview", [{}])[0]
+        
+        structured_claims.append({
+            "text": claim_data.get("text", ""),
+            "claimant": claim_data.get("claimant", "Unknown"),
+            "claimReview": claim_review.get("title", ""),
+            "rating": claim_review.get("textualRating", ""),
+            "publisher": claim_review.get("publisher", {}).get("name", "Unknown"),
+            "url": claim_review.get("url", ""),
+            "reviewDate": claim_review.get("reviewDate", "")
+        })
+    return structured_claims
+
+@cached_source("fact_check_api", ttl=21600)
+@circuit_breaker("fact_check_api", result_key="claims")
 async def search_fact_check_api(claim: str) -> dict:
     """
     Searches Google Fact Check Tools API for existing fact checks.
@@ -19,45 +48,30 @@ async def search_fact_check_api(claim: str) -> dict:
     
     if not api_key:
         print("Warning: No Fact Check API key found")
-        return {"claims": [], "error": "No API key configured"}
+        return {"claims": [], "disabled": True}
     
     try:
-        url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+        url = upstream_url("https://factchecktools.googleapis.com/v1alpha1/claims:search")
         params = {
             "query": claim,
             "key": api_key,
             "languageCode": "en"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    claims = data.get("claims", [])
-                    
-                    # Parse and structure the results
-                    structured_claims = []
-                    for claim_data in claims[:5]:  # Top 5 results
-                        claim_review = claim_data.get("claimReview", [{}])[0]
-                        
-                        structured_claims.append({
-                            "text": claim_data.get("text", ""),
-                            "claimant": claim_data.get("claimant", "Unknown"),
-                            "claimReview": claim_review.get("title", ""),
-                            "rating": claim_review.get("textualRating", ""),
-                            "publisher": claim_review.get("publisher", {}).get("name", "Unknown"),
-                            "url": claim_review.get("url", ""),
-                            "reviewDate": claim_review.get("reviewDate", "")
-                        })
-                    
-                    return {
-                        "claims": structured_claims,
-                        "total": len(structured_claims)
-                    }
-                else:
-                    error_text = await response.text()
-                    print(f"Fact Check API error: {response.status} - {error_text}")
-                    return {"claims": [], "error": f"API error: {response.status}"}
+        session = get_session()
+        async with session.get(url, params=params, timeout=10) as response:
+            if response.status == 200:
+                data = await response.json()
+                structured_claims = parse_fact_check_claims(data)
+                
+                return {
+                    "claims": structured_claims,
+                    "total": len(structured_claims)
+                }
+            else:
+                error_text = await response.text()
+                print(f"Fact Check API error: {response.status} - {error_text}")
+                return {"claims": [], "error": f"API error: {response.status}"}
                     
     except asyncio.TimeoutError:
         print("Fact Check API timeout")
@@ -1,10 +1,34 @@
-import aiohttp
 import asyncio
 import os
 from dotenv import load_dotenv
+from app.utils.http_client import get_session, upstream_url
+from app.utils.source_cache import cached_source
+from app.utils.circuit_breaker import circuit_breaker
 
 load_dotenv()
 
+def parse_search_items(data: dict) -> list:
+    """
+    Structures the items of a Custom Search API response.
+    
+    Args:
+        data: Decoded JSON response
+    
+    Returns:
+        List of result dictionaries
+    """
+    structured_results = []
+    for item in data.get("items", []):
+        structured_results.append({
+            "title": item.get("title", ""),
+            "snippet": item.get("snippet", ""),
+            "url": item.get("link", ""),
+            "displayLink": item.get("displayLink", "")
+        })
+    return structured_results
+
+@cached_source("google_search", ttl=3600)
+@circuit_breaker("google_search")
 async def search_google(claim: str) -> dict:
     """
     Searches Google Custom Search for fact-checking and verification information.
@@ -20,13 +44,13 @@ async def search_google(claim: str) -> dict:
     
     if not api_key:
         print("Warning: No Google Search API key found")
-        return {"results": [], "error": "No API key configured"}
+        return {"results": [], "disabled": True}
     
     try:
         # Add "fact check" to search query for better results
         search_query = f"{claim} fact check"
         
-        url = "https://www.googleapis.com/customsearch/v1"
+        url = upstream_url("https://www.googleapis.com/customsearch/v1")
         params = {
             "key": api_key,
             "cx": search_engine_id if search_engine_id else "017576662512468239146:omuauf_lfve",  # Example search engine
@@ -34,33 +58,23 @@ async def search_google(claim: str) -> dict:
             "num": 5  # Top 5 results
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    items = data.get("items", [])
-                    
-                    # Structure the results
-                    structured_results = []
-                    for item in items:
-                        structured_results.append({
-                            "title": item.get("title", ""),
-                            "snippet": item.get("snippet", ""),
-                            "url": item.get("link", ""),
-                            "displayLink": item.get("displayLink", "")
-                        })
-                    
-                    return {
-                        "results": structured_results,
-                        "total": len(structured_results),
-                        "query": search_query
-                    }
-                else:
-                    error_text = await response.text()
-                    print(f"Google Search API error: {response.status} - {error_text}")
-                    
-                    # Fallback: return empty results instead of failing
-                    return {"results": [], "error": f"API error: {response.status}"}
+        session = get_session()
+        async with session.get(url, params=params, timeout=10) as response:
+            if response.status == 200:
+                data = await response.json()
+                structured_results = parse_search_items(data)
+                
+                return {
+                    "results": structured_results,
+                    "total": len(structured_results),
+                    "query": search_query
+                }
+            else:
+                error_text = await response.text()
+                print(f"Google Search API error: {response.status} - {error_text}")
+                
+                # Fallback: return empty results instead of failing
+                return {"results": [], "error": f"API error: {response.status}"}
                     
     except asyncio.TimeoutError:
         print("Google Search API timeout")
@@ -0,0 +1,97 @@
+"""
+Shared HTML parsing for the scrapers.
+
+Pages are parsed with the lxml backend and restricted to the subtrees a scraper
+actually reads (SoupStrainer), so the rest of the page is never turned into
+Python objects. Parsing large pages is moved off the event loop into a worker
+pool: threads by default, or processes with HTML_PARSER_POOL=process for
+strict CPU isolation.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+PARSER = "lxml"
+POOL_KIND = os.getenv("HTML_PARSER_POOL", "thread")
+POOL_WORKERS = int(os.getenv("HTML_PARSER_WORKERS", "4"))
+# Pages smaller than this are parsed inline; the hand-off costs more than it saves
+OFFLOAD_MIN_BYTES = int(os.getenv("HTML_PARSER_OFFLOAD_MIN_BYTES", "32768"))
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        if POOL_KIND == "process":
+            _executor = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _executor = ThreadPoolExecutor(max_workers=POOL_WORKERS, thread_name_prefix="html-parser")
+    return _executor
+
+
+def make_soup(html: str, name: str = None, class_: str = None) -> BeautifulSoup:
+    """
+    Parses html with lxml, keeping only elements matching name/class_.
+
+    Args:
+        html: Page source
+        name: Tag name of the subtrees to keep (None keeps the whole page)
+        class_: Optional CSS class the kept tags must have
+
+    Returns:
+        BeautifulSoup containing only the matching subtrees
+    """
+    if name is None:
+        return BeautifulSoup(html, PARSER)
+
+    strainer = SoupStrainer(name, class_=partial(_has_class, class_)) if class_ else SoupStrainer(name)
+    return BeautifulSoup(html, PARSER, parse_only=strainer)
+
+
+def _has_class(class_: str, value) -> bool:
+    # While parsing, the strainer sees the raw attribute ("result results_links"),
+    # so a plain string would only match elements with exactly that one class
+    if value is None:
+        return False
+    return class_ in (value.split() if isinstance(value, str) else value)
+
+
+async def parse_off_loop(parse_func, html: str, *args):
+    """
+    Runs `parse_func(html, *args)`, in the worker pool for large pages.
+
+    parse_func must be a module-level function returning plain data (so it
+    can also run in a process pool).
+
+    Args:
+        parse_func: Function turning page source into results
+        html: Page source
+        *args: Extra arguments for parse_func
+
+    Returns:
+        Whatever parse_func returns
+    """
+    if len(html) < OFFLOAD_MIN_BYTES:
+        return parse_func(html, *args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(parse_func, html, *args))
+
+
+def shutdown():
+    """
+    Stops the parser worker pool.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
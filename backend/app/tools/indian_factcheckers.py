@@ -8,333 +8,198 @@ Scrapes verified fact-check sources from India:
 - Vishvas News (PIB Initiative)
 """
 
-import aiohttp
-import asyncio
-from bs4 import BeautifulSoup
-from datetime import datetime
-import re
+from app.utils.deadline import gather_with_budget
+from app.utils.metrics import stage_timer, timed_source
+from app.utils.tracing import traced, result_count
+from app.tools.scraping_engine import FactCheckerSpec, build_scraper
+from app.tools.factcheck_index import search_index, index_articles
+import os
 
-async def scrape_pib_factcheck(claim: str) -> dict:
-    """
-    Scrapes PIB Fact Check (Press Information Bureau - Government of India)
-    Official government fact-checking portal
-    """
-    try:
-        search_query = claim.replace(" ", "+")
-        url = f"https://factcheck.pib.gov.in/"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    results = []
-                    articles = soup.find_all('article', class_='post', limit=3)
-                    
-                    for article in articles:
-                        title_tag = article.find('h2', class_='entry-title')
-                        link_tag = title_tag.find('a') if title_tag else None
-                        content_tag = article.find('div', class_='entry-content')
-                        
-                        if title_tag and link_tag:
-                            title = title_tag.get_text(strip=True)
-                            url_link = link_tag.get('href', '')
-                            snippet = content_tag.get_text(strip=True)[:200] if content_tag else ""
-                            
-                            # Determine verdict from title
-                            title_lower = title.lower()
-                            verdict = "UNVERIFIED"
-                            if any(word in title_lower for word in ['fake', 'false', 'misleading', 'morphed']):
-                                verdict = "FALSE"
-                            elif any(word in title_lower for word in ['true', 'genuine', 'verified']):
-                                verdict = "TRUE"
-                            
-                            results.append({
-                                "title": title,
-                                "snippet": snippet,
-                                "url": url_link,
-                                "source": "PIB Fact Check (Govt. of India)",
-                                "verdict": verdict,
-                                "credibility": "high"
-                            })
-                    
-                    print(f"PIB Fact Check found {len(results)} results")
-                    return {"results": results, "source": "pib_factcheck"}
-                else:
-                    return {"results": [], "error": f"Status {response.status}"}
-                    
-    except Exception as e:
-        print(f"PIB Fact Check error: {str(e)}")
-        return {"results": [], "error": str(e)}
+# Latency budget for the five scrapers (seconds); also capped by the caller's deadline
+INDIAN_FACTCHECKER_BUDGET = float(os.getenv("INDIAN_FACTCHECKER_BUDGET", "7"))
+INDIAN_FACTCHECKER_SOFT_TIMEOUT = float(os.getenv("INDIAN_FACTCHECKER_SOFT_TIMEOUT", "2.5"))
+INDIAN_FACTCHECKER_HARD_TIMEOUT = float(os.getenv("INDIAN_FACTCHECKER_HARD_TIMEOUT", "10"))
+INDIAN_FACTCHECKER_ENOUGH_RESULTS = int(os.getenv("INDIAN_FACTCHECKER_ENOUGH_RESULTS", "3"))
 
 
-async def scrape_altnews(claim: str) -> dict:
-    """
-    Scrapes Alt News - Award-winning independent fact-checking website
-    """
-    try:
-        search_query = claim.replace(" ", "+")
-        url = f"https://www.altnews.in/?s={search_query}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    results = []
-                    articles = soup.find_all('article', limit=3)
-                    
-                    for article in articles:
-                        title_tag = article.find('h3', class_='entry-title')
-                        link_tag = title_tag.find('a') if title_tag else None
-                        excerpt_tag = article.find('div', class_='entry-content')
-                        
-                        if title_tag and link_tag:
-                            title = title_tag.get_text(strip=True)
-                            url_link = link_tag.get('href', '')
-                            snippet = excerpt_tag.get_text(strip=True)[:200] if excerpt_tag else ""
-                            
-                            # Determine verdict
-                            title_lower = title.lower()
-                            verdict = "UNVERIFIED"
-                            if any(word in title_lower for word in ['fake', 'false', 'misleading', 'doctored', 'morphed']):
-                                verdict = "FALSE"
-                            elif any(word in title_lower for word in ['fact check:', 'debunked']):
-                                verdict = "MISLEADING"
-                            
-                            results.append({
-                                "title": title,
-                                "snippet": snippet,
-                                "url": url_link,
-                                "source": "Alt News",
-                                "verdict": verdict,
-                                "credibility": "high"
-                            })
-                    
-                    print(f"Alt News found {len(results)} results")
-                    return {"results": results, "source": "altnews"}
-                else:
-                    return {"results": [], "error": f"Status {response.status}"}
-                    
-    except Exception as e:
-        print(f"Alt News error: {str(e)}")
-        return {"results": [], "error": str(e)}
+PIB_FACTCHECK = FactCheckerSpec(
+    key="pib_factcheck",
+    name="PIB Fact Check",
+    source_label="PIB Fact Check (Govt. of India)",
+    # PIB is scraped from its homepage, which does not depend on the claim
+    url_template="https://factcheck.pib.gov.in/",
+    claim_independent=True,
+    cache_ttl=600,
+    item_selector="article.post",
+    title_selector="h2.entry-title",
+    snippet_selector="div.entry-content",
+    verdict_rules=[
+        ("FALSE", ['fake', 'false', 'misleading', 'morphed']),
+        ("TRUE", ['true', 'genuine', 'verified']),
+    ],
+    # The homepage always lists fact-checks, so repeated empty results mean the markup
+    # changed. Results are cached for 10 minutes, hence the longer window.
+    breaker_options={"window": 1800, "min_calls": 3, "min_empty_calls": 3},
+    feed_url="https://factcheck.pib.gov.in/",
+    feed_type="listing",
+)
 
+ALTNEWS = FactCheckerSpec(
+    key="altnews",
+    name="Alt News",
+    source_label="Alt News",
+    url_template="https://www.altnews.in/?s={query}",
+    item_selector="article",
+    title_selector="h3.entry-title",
+    snippet_selector="div.entry-content",
+    verdict_rules=[
+        ("FALSE", ['fake', 'false', 'misleading', 'doctored', 'morphed']),
+        ("MISLEADING", ['fact check:', 'debunked']),
+    ],
+    feed_url="https://www.altnews.in/feed/",
+)
 
-async def scrape_boom_live(claim: str) -> dict:
-    """
-    Scrapes BOOM Live - Leading Indian fact-checking organization
-    """
-    try:
-        search_query = claim.replace(" ", "%20")
-        url = f"https://www.boomlive.in/?s={search_query}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    results = []
-                    articles = soup.find_all('div', class_='story-card', limit=3)
-                    
-                    for article in articles:
-                        title_tag = article.find('h2', class_='story-card__title')
-                        link_tag = article.find('a', class_='story-card__url')
-                        desc_tag = article.find('p', class_='story-card__description')
-                        
-                        if title_tag and link_tag:
-                            title = title_tag.get_text(strip=True)
-                            url_link = link_tag.get('href', '')
-                            if not url_link.startswith('http'):
-                                url_link = f"https://www.boomlive.in{url_link}"
-                            snippet = desc_tag.get_text(strip=True) if desc_tag else ""
-                            
-                            # Determine verdict
-                            title_lower = title.lower()
-                            verdict = "UNVERIFIED"
-                            if any(word in title_lower for word in ['fake', 'false', 'misleading', 'viral lie']):
-                                verdict = "FALSE"
-                            elif 'fact check' in title_lower:
-                                verdict = "MISLEADING"
-                            
-                            results.append({
-                                "title": title,
-                                "snippet": snippet,
-                                "url": url_link,
-                                "source": "BOOM Live",
-                                "verdict": verdict,
-                                "credibility": "high"
-                            })
-                    
-                    print(f"BOOM Live found {len(results)} results")
-                    return {"results": results, "source": "boom"}
-                else:
-                    return {"results": [], "error": f"Status {response.status}"}
-                    
-    except Exception as e:
-        print(f"BOOM Live error: {str(e)}")
-        return {"results": [], "error": str(e)}
+BOOM_LIVE = FactCheckerSpec(
+    key="boom",
+    name="BOOM Live",
+    source_label="BOOM Live",
+    url_template="https://www.boomlive.in/?s={query}",
+    query_encoding="percent",
+    item_selector="div.story-card",
+    title_selector="h2.story-card__title",
+    link_selector="a.story-card__url",
+    snippet_selector="p.story-card__description",
+    snippet_length=None,
+    base_url="https://www.boomlive.in",
+    verdict_rules=[
+        ("FALSE", ['fake', 'false', 'misleading', 'viral lie']),
+        ("MISLEADING", ['fact check']),
+    ],
+    feed_url="https://www.boomlive.in/fact-check",
+    feed_type="listing",
+)
 
+FACTLY = FactCheckerSpec(
+    key="factly",
+    name="Factly",
+    source_label="Factly",
+    url_template="https://factly.in/?s={query}",
+    item_selector="article",
+    title_selector="h2.entry-title",
+    snippet_selector="div.entry-summary",
+    verdict_rules=[
+        ("FALSE", ['fake', 'false', 'misleading']),
+        ("MISLEADING", ['fact check']),
+    ],
+    credibility="medium",
+    feed_url="https://factly.in/feed/",
+)
 
-async def scrape_factly(claim: str) -> dict:
-    """
-    Scrapes Factly - South Indian fact-checking organization
-    """
-    try:
-        search_query = claim.replace(" ", "+")
-        url = f"https://factly.in/?s={search_query}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    results = []
-                    articles = soup.find_all('article', limit=3)
-                    
-                    for article in articles:
-                        title_tag = article.find('h2', class_='entry-title')
-                        link_tag = title_tag.find('a') if title_tag else None
-                        excerpt_tag = article.find('div', class_='entry-summary')
-                        
-                        if title_tag and link_tag:
-                            title = title_tag.get_text(strip=True)
-                            url_link = link_tag.get('href', '')
-                            snippet = excerpt_tag.get_text(strip=True)[:200] if excerpt_tag else ""
-                            
-                            # Determine verdict
-                            title_lower = title.lower()
-                            verdict = "UNVERIFIED"
-                            if any(word in title_lower for word in ['fake', 'false', 'misleading']):
-                                verdict = "FALSE"
-                            elif 'fact check' in title_lower:
-                                verdict = "MISLEADING"
-                            
-                            results.append({
-                                "title": title,
-                                "snippet": snippet,
-                                "url": url_link,
-                                "source": "Factly",
-                                "verdict": verdict,
-                                "credibility": "medium"
-                            })
-                    
-                    print(f"Factly found {len(results)} results")
-                    return {"results": results, "source": "factly"}
-                else:
-                    return {"results": [], "error": f"Status {response.status}"}
-                    
-    except Exception as e:
-        print(f"Factly error: {str(e)}")
-        return {"results": [], "error": str(e)}
+VISHVAS_NEWS = FactCheckerSpec(
+    key="vishvas",
+    name="Vishvas News",
+    source_label="Vishvas News (PIB)",
+    url_template="https://www.vishvasnews.com/?s={query}",
+    item_selector="article",
+    title_selector="h2",
+    snippet_selector="div.entry-content",
+    verdict_rules=[
+        ("FALSE", ['fake', 'false', 'misleading', 'गलत', 'भ्रामक']),
+        ("TRUE", ['true', 'सही', 'सत्य']),
+    ],
+    feed_url="https://www.vishvasnews.com/feed/",
+)
+
+# Adding a fact-checker only takes a spec here
+FACTCHECKER_SPECS = [PIB_FACTCHECK, ALTNEWS, BOOM_LIVE, FACTLY, VISHVAS_NEWS]
 
+# PIB Fact Check (Press Information Bureau - Government of India), the official
+# government fact-checking portal
+scrape_pib_factcheck = build_scraper(PIB_FACTCHECK)
+# Alt News - award-winning independent fact-checking website
+scrape_altnews = build_scraper(ALTNEWS)
+# BOOM Live - leading Indian fact-checking organization
+scrape_boom_live = build_scraper(BOOM_LIVE)
+# Factly - South Indian fact-checking organization
+scrape_factly = build_scraper(FACTLY)
+# Vishvas News - PIB's multilingual fact-checking initiative
+scrape_vishvas_news = build_scraper(VISHVAS_NEWS)
 
-async def scrape_vishvas_news(claim: str) -> dict:
+SCRAPERS = {
+    "pib_factcheck": scrape_pib_factcheck,
+    "altnews": scrape_altnews,
+    "boom": scrape_boom_live,
+    "factly": scrape_factly,
+    "vishvas": scrape_vishvas_news,
+}
+
+
+def has_enough_factchecks(results: dict) -> bool:
     """
-    Scrapes Vishvas News - PIB's multilingual fact-checking initiative
+    Early-completion rule: enough high-credibility fact-checks already found
     """
-    try:
-        search_query = claim.replace(" ", "+")
-        url = f"https://www.vishvasnews.com/?s={search_query}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    results = []
-                    articles = soup.find_all('article', limit=3)
-                    
-                    for article in articles:
-                        title_tag = article.find('h2')
-                        link_tag = title_tag.find('a') if title_tag else None
-                        content_tag = article.find('div', class_='entry-content')
-                        
-                        if title_tag and link_tag:
-                            title = title_tag.get_text(strip=True)
-                            url_link = link_tag.get('href', '')
-                            snippet = content_tag.get_text(strip=True)[:200] if content_tag else ""
-                            
-                            # Determine verdict
-                            title_lower = title.lower()
-                            verdict = "UNVERIFIED"
-                            if any(word in title_lower for word in ['fake', 'false', 'misleading', 'गलत', 'भ्रामक']):
-                                verdict = "FALSE"
-                            elif any(word in title_lower for word in ['true', 'सही', 'सत्य']):
-                                verdict = "TRUE"
-                            
-                            results.append({
-                                "title": title,
-                                "snippet": snippet,
-                                "url": url_link,
-                                "source": "Vishvas News (PIB)",
-                                "verdict": verdict,
-                                "credibility": "high"
-                            })
-                    
-                    print(f"Vishvas News found {len(results)} results")
-                    return {"results": results, "source": "vishvas"}
-                else:
-                    return {"results": [], "error": f"Status {response.status}"}
-                    
-    except Exception as e:
-        print(f"Vishvas News error: {str(e)}")
-        return {"results": [], "error": str(e)}
+    high_credibility = sum(
+        1
+        for result in results.values() if isinstance(result, dict)
+        for item in result.get("results", []) if item.get("credibility") == "high"
+    )
+    return high_credibility >= INDIAN_FACTCHECKER_ENOUGH_RESULTS
 
 
+@traced("tool.indian_factcheckers", result_count)
 async def search_all_indian_factcheckers(claim: str) -> dict:
     """
-    Search all Indian fact-checkers in parallel
-    Returns combined results from all sources
+    Search all Indian fact-checkers
+    Answers from the local fact-check index when it has relevant articles, and
+    otherwise scrapes all sites in parallel. Returns combined results from all
+    sources; scrapers dropped by the latency budget are listed under
+    "skipped_sources"
     """
     try:
-        # Run all scrapers in parallel
-        results = await asyncio.gather(
-            scrape_pib_factcheck(claim),
-            scrape_altnews(claim),
-            scrape_boom_live(claim),
-            scrape_factly(claim),
-            scrape_vishvas_news(claim),
-            return_exceptions=True
+        with stage_timer("factcheck_index"):
+            indexed = await search_index(claim)
+        if indexed:
+            print(f"🇮🇳 Fact-check index found {len(indexed)} results")
+            return {
+                "results": indexed,
+                "total": len(indexed),
+                "sources": sorted({item["source"] for item in indexed}),
+                "skipped_sources": [],
+                "from_index": True
+            }
+
+        # Run all scrapers in parallel, dropping stragglers once the budget runs out
+        results, skipped = await gather_with_budget(
+            {key: timed_source(key, scraper(claim)) for key, scraper in SCRAPERS.items()},
+            budget=INDIAN_FACTCHECKER_BUDGET,
+            soft_timeout=INDIAN_FACTCHECKER_SOFT_TIMEOUT,
+            hard_timeout=INDIAN_FACTCHECKER_HARD_TIMEOUT,
+            enough=has_enough_factchecks
         )
         
         # Combine all results
         all_results = []
-        for result in results:
+        to_index = []
+        for key, result in results.items():
             if isinstance(result, dict) and not isinstance(result, Exception):
                 all_results.extend(result.get("results", []))
+                to_index.extend(
+                    {**item, "source": key, "publisher": item.get("source")}
+                    for item in result.get("results", [])
+                )
+
+        # Grow the local index with what was scraped
+        await index_articles(to_index)
         
+        if skipped:
+            print(f"🇮🇳 Skipped slow fact-checkers: {', '.join(skipped)}")
         print(f"🇮🇳 Total Indian fact-checker results: {len(all_results)}")
         
         return {
             "results": all_results,
             "total": len(all_results),
-            "sources": ["PIB", "Alt News", "BOOM", "Factly", "Vishvas News"]
+            "sources": [spec.name for spec in FACTCHECKER_SPECS],
+            "skipped_sources": skipped
         }
         
     except Exception as e:
@@ -0,0 +1,265 @@
+"""
+Background ingestion of fact-checker feeds into the local fact-check index.
+
+Polls the RSS/Atom feed or listing page of every site in
+app.tools.indian_factcheckers on a schedule, so claims are answered from the
+index instead of live scraping. Each poll is incremental: feeds are fetched
+through the revalidating HTTP cache, an unchanged feed body is not parsed
+again, and only articles whose URL is not indexed yet are written, in batched
+transactions.
+
+Run it as its own process:
+
+    python -m app.tools.ingestion              # poll forever
+    python -m app.tools.ingestion --once       # one pass, then exit
+    python -m app.tools.ingestion --feed altnews=http://localhost:8000/feed.xml
+
+or inside the API process with INGESTION_IN_PROCESS=true. Feed URLs can also
+be overridden with INGESTION_FEED_OVERRIDES="altnews=http://...,factly=http://...".
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import hashlib
+import logging
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+from bs4 import BeautifulSoup
+
+from app.tools.factcheck_index import factcheck_index
+from app.tools.html_parsing import parse_off_loop
+from app.tools.indian_factcheckers import FACTCHECKER_SPECS
+from app.tools.scraping_engine import DEFAULT_HEADERS, FactCheckerSpec, detect_verdict, parse_factchecks
+from app.utils.http_cache import fetch_text
+
+logger = logging.getLogger(__name__)
+
+INGESTION_IN_PROCESS = os.getenv("INGESTION_IN_PROCESS", "false").lower() == "true"
+INGESTION_INTERVAL = float(os.getenv("INGESTION_INTERVAL", "900"))
+INGESTION_BATCH_SIZE = int(os.getenv("INGESTION_BATCH_SIZE", "200"))
+INGESTION_CONCURRENCY = int(os.getenv("INGESTION_CONCURRENCY", "3"))
+# Items read from a listing page (search scraping only reads the first few)
+LISTING_MAX_ITEMS = int(os.getenv("INGESTION_LISTING_MAX_ITEMS", "50"))
+
+
+def parse_overrides(value: str) -> dict:
+    """
+    Parses "key=url,key=url" into {key: url}.
+    """
+    overrides = {}
+    for pair in (value or "").split(","):
+        if "=" in pair:
+            key, url = pair.split("=", 1)
+            overrides[key.strip()] = url.strip()
+    return overrides
+
+
+def _iso_date(value: str):
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).isoformat()
+    except (TypeError, ValueError):
+        # Atom dates are already ISO 8601
+        return value.strip()
+
+
+def parse_feed(xml: str, spec: FactCheckerSpec) -> list:
+    """
+    Extracts articles from an RSS or Atom feed.
+
+    Args:
+        xml: Feed source
+        spec: Site the feed belongs to
+
+    Returns:
+        List of article dictionaries for FactCheckIndex.upsert_many
+    """
+    soup = BeautifulSoup(xml, "xml")
+
+    articles = []
+    for item in soup.find_all(["item", "entry"]):
+        title_tag = item.find("title")
+        link_tag = item.find("link")
+        if not title_tag or not link_tag:
+            continue
+
+        title = title_tag.get_text(strip=True)
+        url = link_tag.get("href") or link_tag.get_text(strip=True)
+        if not title or not url:
+            continue
+
+        description = item.find("description") or item.find("summary")
+        snippet = ""
+        if description:
+            # Descriptions are HTML-escaped markup
+            snippet = BeautifulSoup(description.get_text(), "lxml").get_text(" ", strip=True)
+            if spec.snippet_length:
+                snippet = snippet[:spec.snippet_length]
+
+        date_tag = item.find("pubDate") or item.find("published") or item.find("updated")
+        articles.append({
+            "url": url,
+            "title": title,
+            "snippet": snippet,
+            "source": spec.key,
+            "publisher": spec.source_label,
+            "published_at": _iso_date(date_tag.get_text(strip=True)) if date_tag else None,
+            "verdict": detect_verdict(title, spec.verdict_rules),
+            "credibility": spec.credibility
+        })
+
+    return articles
+
+
+def parse_listing(html: str, spec: FactCheckerSpec) -> list:
+    """
+    Extracts articles from a listing page using the spec's item selectors.
+    """
+    listing_spec = dataclasses.replace(spec, max_items=LISTING_MAX_ITEMS)
+    return [
+        {**result, "source": spec.key, "publisher": spec.source_label}
+        for result in parse_factchecks(html, listing_spec)
+    ]
+
+
+async def poll_feed(spec: FactCheckerSpec, url: str) -> tuple:
+    """
+    Fetches one feed and finds its articles that are not indexed yet.
+
+    Args:
+        spec: Site the feed belongs to
+        url: Feed URL
+
+    Returns:
+        Tuple (body_hash, new articles); the hash is recorded once the
+        articles are written
+    """
+    status, body = await fetch_text(url, headers=DEFAULT_HEADERS, timeout=spec.timeout)
+    if status != 200:
+        raise RuntimeError(f"Status {status}")
+
+    body_hash = hashlib.sha1(body.encode("utf-8")).hexdigest()
+    state = await asyncio.to_thread(factcheck_index.feed_state, url)
+    if state["body_hash"] == body_hash:
+        return body_hash, []
+
+    parse = parse_listing if spec.feed_type == "listing" else parse_feed
+    articles = await parse_off_loop(parse, body, spec)
+    known = await asyncio.to_thread(factcheck_index.known_urls, [article["url"] for article in articles])
+
+    new_articles = []
+    seen = set(known)
+    for article in articles:
+        if article["url"] not in seen:
+            seen.add(article["url"])
+            new_articles.append(article)
+
+    return body_hash, new_articles
+
+
+async def run_ingestion(specs: list = None, overrides: dict = None) -> dict:
+    """
+    Polls every feed once and writes new articles in batches.
+
+    Args:
+        specs: Sites to poll (defaults to all Indian fact-checkers)
+        overrides: Optional {site key: feed URL} replacing the specs' feed URLs
+
+    Returns:
+        {site key: number of new articles, or an error message}
+    """
+    specs = FACTCHECKER_SPECS if specs is None else specs
+    overrides = overrides if overrides is not None else parse_overrides(os.getenv("INGESTION_FEED_OVERRIDES", ""))
+    semaphore = asyncio.Semaphore(INGESTION_CONCURRENCY)
+
+    feeds = {spec.key: overrides.get(spec.key, spec.feed_url) for spec in specs}
+
+    async def poll(spec):
+        async with semaphore:
+            return await poll_feed(spec, feeds[spec.key])
+
+    polled = [spec for spec in specs if feeds[spec.key]]
+    results = await asyncio.gather(*(poll(spec) for spec in polled), return_exceptions=True)
+
+    report = {}
+    pending = []
+    polled_feeds = []
+    for spec, result in zip(polled, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Ingestion of {spec.name} failed: {result}")
+            report[spec.key] = f"error: {result}"
+            continue
+        body_hash, articles = result
+        report[spec.key] = len(articles)
+        pending.extend(articles)
+        polled_feeds.append((feeds[spec.key], body_hash, len(articles)))
+
+    for i in range(0, len(pending), INGESTION_BATCH_SIZE):
+        await asyncio.to_thread(factcheck_index.upsert_many, pending[i:i + INGESTION_BATCH_SIZE])
+    # Only mark feeds as seen once their articles are stored
+    for url, body_hash, count in polled_feeds:
+        await asyncio.to_thread(factcheck_index.save_feed_state, url, body_hash, count)
+
+    logger.info(f"Ingested {len(pending)} new fact-checks: {report}")
+    return report
+
+
+async def run_forever(interval: float = INGESTION_INTERVAL, overrides: dict = None):
+    """
+    Runs ingestion passes every `interval` seconds (with jitter) until cancelled.
+    """
+    while True:
+        start = time.monotonic()
+        try:
+            await run_ingestion(overrides=overrides)
+        except Exception as e:
+            logger.error(f"Ingestion pass failed: {e}")
+        elapsed = time.monotonic() - start
+        await asyncio.sleep(max(0.0, interval - elapsed) * random.uniform(0.9, 1.1))
+
+
+def start_background_ingestion():
+    """
+    Starts the ingestion loop inside the running event loop if
+    INGESTION_IN_PROCESS is enabled. Returns the task, or None.
+    """
+    if not INGESTION_IN_PROCESS:
+        return None
+    return asyncio.create_task(run_forever())
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Ingest fact-checker feeds into the local index")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--interval", type=float, default=INGESTION_INTERVAL, help="Seconds between passes")
+    parser.add_argument("--feed", action="append", default=[], metavar="KEY=URL",
+                        help="Override the feed URL of a site (repeatable)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    overrides = parse_overrides(os.getenv("INGESTION_FEED_OVERRIDES", ""))
+    overrides.update(parse_overrides(",".join(args.feed)))
+
+    async def run():
+        from app.utils import http_client
+        try:
+            if args.once:
+                print(await run_ingestion(overrides=overrides))
+            else:
+                await run_forever(args.interval, overrides=overrides)
+        finally:
+            await http_client.shutdown()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Config-driven scraping engine for fact-checker websites.
+
+Every fact-checker scraper does the same thing: fetch a listing or search
+page, take the first few items, read title/link/snippet from each and derive a
+verdict from keywords in the title. A site is described by a FactCheckerSpec;
+`build_scraper` turns a spec into a tool coroutine with the shared fetch
+(through the on-disk HTTP cache), parsing, per-site concurrency limit, result
+caching, circuit breaker and statistics.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import quote, quote_plus, urljoin
+
+from app.utils.http_cache import fetch_text
+from app.utils.source_cache import cached_source
+from app.utils.circuit_breaker import circuit_breaker
+from app.tools.html_parsing import make_soup, parse_off_loop
+
+# Concurrent page fetches allowed per site
+SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "4"))
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+QUERY_ENCODERS = {
+    "plus": quote_plus,  # spaces as "+"
+    "percent": quote,    # spaces as "%20"
+}
+
+_stats = {}
+
+
+@dataclass
+class FactCheckerSpec:
+    """
+    Description of one fact-checker website.
+
+    Selectors are CSS selectors. The item selector must be "tag" or
+    "tag.class" so it can also restrict parsing to the matching subtrees.
+
+    Args:
+        key: Source name used for caching, circuit breaker and results
+        name: Display name used in logs
+        source_label: Value of "source" in each result
+        url_template: Page URL; "{query}" is replaced by the encoded claim
+        item_selector: Selector for each fact-check item
+        title_selector: Selector for the title inside an item
+        snippet_selector: Selector for the snippet inside an item
+        link_selector: Selector for the link inside an item; None means the
+            first <a> inside the title
+        snippet_length: Snippets are cut to this many characters (None keeps all)
+        base_url: Prefix for links that are not absolute
+        query_encoding: "plus" or "percent"
+        verdict_rules: Ordered (verdict, keywords) pairs; the first rule with a
+            keyword in the lowercased title decides the verdict
+        credibility: Credibility attached to each result
+        max_items: Number of items read from the page
+        timeout: Seconds allowed for the page fetch
+        cache_ttl: Seconds results are cached for
+        claim_independent: The page does not depend on the claim (one cache
+            entry is shared by all claims)
+        breaker_options: CircuitBreaker settings for this site
+        feed_url: RSS/Atom feed or listing page polled by the ingestion worker
+        feed_type: "rss" (RSS or Atom) or "listing" (parsed with the item
+            selectors above)
+    """
+    key: str
+    name: str
+    source_label: str
+    url_template: str
+    item_selector: str
+    title_selector: str
+    snippet_selector: str
+    link_selector: Optional[str] = None
+    snippet_length: Optional[int] = 200
+    base_url: Optional[str] = None
+    query_encoding: str = "plus"
+    verdict_rules: list = field(default_factory=list)
+    credibility: str = "high"
+    max_items: int = 3
+    timeout: float = 10
+    cache_ttl: float = 1800
+    claim_independent: bool = False
+    breaker_options: dict = field(default_factory=dict)
+    feed_url: Optional[str] = None
+    feed_type: str = "rss"
+
+    def build_url(self, claim: str) -> str:
+        """
+        Page URL for a claim.
+        """
+        if "{query}" not in self.url_template:
+            return self.url_template
+        return self.url_template.format(query=QUERY_ENCODERS[self.query_encoding](claim))
+
+
+def detect_verdict(title: str, verdict_rules: list) -> str:
+    """
+    Verdict implied by keywords in a fact-check title.
+
+    Args:
+        title: Fact-check title
+        verdict_rules: Ordered (verdict, keywords) pairs
+
+    Returns:
+        First matching verdict, or "UNVERIFIED"
+    """
+    title_lower = title.lower()
+    for verdict, keywords in verdict_rules:
+        if any(word in title_lower for word in keywords):
+            return verdict
+    return "UNVERIFIED"
+
+
+def parse_factchecks(html: str, spec: FactCheckerSpec) -> list:
+    """
+    Extracts fact-checks from a page according to a spec.
+
+    Args:
+        html: Page source
+        spec: Site description
+
+    Returns:
+        List of result dictionaries
+    """
+    tag, _, css_class = spec.item_selector.partition(".")
+    soup = make_soup(html, tag, class_=css_class or None)
+
+    results = []
+    for item in soup.select(spec.item_selector, limit=spec.max_items):
+        title_tag = item.select_one(spec.title_selector)
+        if spec.link_selector:
+            link_tag = item.select_one(spec.link_selector)
+        else:
+            link_tag = title_tag.find('a') if title_tag else None
+        snippet_tag = item.select_one(spec.snippet_selector)
+
+        if title_tag and link_tag:
+            title = title_tag.get_text(strip=True)
+            url_link = link_tag.get('href', '')
+            if spec.base_url and not url_link.startswith('http'):
+                url_link = urljoin(spec.base_url, url_link)
+            snippet = snippet_tag.get_text(strip=True) if snippet_tag else ""
+            if spec.snippet_length:
+                snippet = snippet[:spec.snippet_length]
+
+            results.append({
+                "title": title,
+                "snippet": snippet,
+                "url": url_link,
+                "source": spec.source_label,
+                "verdict": detect_verdict(title, spec.verdict_rules),
+                "credibility": spec.credibility
+            })
+
+    return results
+
+
+def _record(spec: FactCheckerSpec, **values):
+    stats = _stats[spec.key]
+    stats["calls"] += 1
+    for name, value in values.items():
+        stats[name] += value
+
+
+def scraper_stats() -> dict:
+    """
+    Fetch/parse statistics per site.
+    """
+    report = {}
+    for key, stats in _stats.items():
+        calls = stats["calls"]
+        report[key] = {
+            "calls": calls,
+            "errors": stats["errors"],
+            "results": stats["results"],
+            "bytes_fetched": stats["bytes"],
+            "avg_fetch_ms": round(stats["fetch_seconds"] / calls * 1000, 1) if calls else None,
+            "avg_parse_ms": round(stats["parse_seconds"] / calls * 1000, 1) if calls else None,
+            "max_concurrency": SCRAPER_MAX_CONCURRENCY,
+        }
+    return report
+
+
+def build_scraper(spec: FactCheckerSpec):
+    """
+    Builds the tool coroutine `scraper(claim) -> dict` for a site.
+
+    Args:
+        spec: Site description
+
+    Returns:
+        Coroutine function returning {"results": [...], "source": key}, or
+        {"results": [], "error": ...} on failure
+    """
+    semaphore = asyncio.Semaphore(SCRAPER_MAX_CONCURRENCY)
+    _stats[spec.key] = {"calls": 0, "errors": 0, "results": 0, "bytes": 0,
+                        "fetch_seconds": 0.0, "parse_seconds": 0.0}
+
+    key_func = (lambda claim: "page") if spec.claim_independent else None
+
+    @cached_source(spec.key, ttl=spec.cache_ttl, key_func=key_func)
+    @circuit_breaker(spec.key, **spec.breaker_options)
+    async def scraper(claim: str) -> dict:
+        start = time.monotonic()
+        try:
+            async with semaphore:
+                status, html = await fetch_text(spec.build_url(claim), headers=DEFAULT_HEADERS, timeout=spec.timeout)
+            if status != 200:
+                _record(spec, errors=1, fetch_seconds=time.monotonic() - start)
+                return {"results": [], "error": f"Status {status}"}
+
+            fetched = time.monotonic()
+            results = await parse_off_loop(parse_factchecks, html, spec)
+            _record(spec, results=len(results), bytes=len(html),
+                    fetch_seconds=fetched - start, parse_seconds=time.monotonic() - fetched)
+
+            print(f"{spec.name} found {len(results)} results")
+            return {"results": results, "source": spec.key}
+
+        except Exception as e:
+            _record(spec, errors=1, fetch_seconds=time.monotonic() - start)
+            print(f"{spec.name} error: {str(e)}")
+            return {"results": [], "error": str(e)}
+
+    scraper.__name__ = f"scrape_{spec.key}"
+    scraper.__doc__ = f"Scrapes {spec.name} fact-checks for a claim"
+    scraper.spec = spec
+    return scraper
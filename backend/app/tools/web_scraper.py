@@ -1,8 +1,78 @@
-import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
 from datetime import datetime
+from app.utils.http_client import get_session, upstream_url
+from app.utils.http_cache import fetch_text
+from app.utils.source_cache import cached_source
+from app.utils.circuit_breaker import circuit_breaker
+from app.tools.html_parsing import make_soup, parse_off_loop
 
+
+def parse_duckduckgo(html: str) -> list:
+    """
+    Extracts up to five results from a DuckDuckGo HTML results page.
+
+    Args:
+        html: Page source
+
+    Returns:
+        List of result dictionaries
+    """
+    soup = make_soup(html, "div", class_="result")
+
+    results = []
+    result_divs = soup.find_all('div', class_='result', limit=5)
+
+    for div in result_divs:
+        title_tag = div.find('a', class_='result__a')
+        snippet_tag = div.find('a', class_='result__snippet')
+
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+            url_link = title_tag.get('href', '')
+            snippet = snippet_tag.get_text(strip=True) if snippet_tag else ""
+
+            # Extract domain
+            domain = ""
+            url_tag = div.find('a', class_='result__url')
+            if url_tag:
+                domain = url_tag.get_text(strip=True)
+
+            results.append({
+                "title": title,
+                "snippet": snippet,
+                "url": url_link,
+                "displayLink": domain,
+                "source": "DuckDuckGo"
+            })
+
+    return results
+
+
+def parse_news_articles(data: dict) -> list:
+    """
+    Structures up to five articles from a NewsAPI /v2/everything response.
+
+    Args:
+        data: Decoded JSON response
+
+    Returns:
+        List of result dictionaries
+    """
+    results = []
+    for article in data.get("articles", [])[:5]:
+        results.append({
+            "title": article.get("title", ""),
+            "snippet": article.get("description", ""),
+            "url": article.get("url", ""),
+            "displayLink": article.get("source", {}).get("name", ""),
+            "publishedAt": article.get("publishedAt", ""),
+            "source": "NewsAPI"
+        })
+    return results
+
+
+@cached_source("duckduckgo", ttl=1800)
+@circuit_breaker("duckduckgo")
 async def scrape_news_search(claim: str) -> dict:
     """
     Scrapes DuckDuckGo for news results (no API key needed).
@@ -22,49 +92,21 @@ async def scrape_news_search(claim: str) -> dict:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    results = []
-                    result_divs = soup.find_all('div', class_='result', limit=5)
-                    
-                    for div in result_divs:
-                        title_tag = div.find('a', class_='result__a')
-                        snippet_tag = div.find('a', class_='result__snippet')
-                        
-                        if title_tag:
-                            title = title_tag.get_text(strip=True)
-                            url_link = title_tag.get('href', '')
-                            snippet = snippet_tag.get_text(strip=True) if snippet_tag else ""
-                            
-                            # Extract domain
-                            domain = ""
-                            url_tag = div.find('a', class_='result__url')
-                            if url_tag:
-                                domain = url_tag.get_text(strip=True)
-                            
-                            results.append({
-                                "title": title,
-                                "snippet": snippet,
-                                "url": url_link,
-                                "displayLink": domain,
-                                "source": "DuckDuckGo"
-                            })
-                    
-                    print(f"DuckDuckGo scraper found {len(results)} results")
-                    return {
-                        "results": results,
-                        "total": len(results),
-                        "query": search_query,
-                        "source": "web_scraper"
-                    }
-                else:
-                    print(f"DuckDuckGo scraper status: {response.status}")
-                    return {"results": [], "error": f"Status {response.status}"}
-                    
+        status, html = await fetch_text(url, headers=headers, timeout=10)
+        if status == 200:
+            results = await parse_off_loop(parse_duckduckgo, html)
+            
+            print(f"DuckDuckGo scraper found {len(results)} results")
+            return {
+                "results": results,
+                "total": len(results),
+                "query": search_query,
+                "source": "web_scraper"
+            }
+        else:
+            print(f"DuckDuckGo scraper status: {status}")
+            return {"results": [], "error": f"Status {status}"}
+                
     except asyncio.TimeoutError:
         print("Web scraper timeout")
         return {"results": [], "error": "Timeout"}
@@ -73,6 +115,9 @@ async def scrape_news_search(claim: str) -> dict:
         return {"results": [], "error": str(e)}
 
 
+# Longer TTL saves the 100 requests/day free-tier quota
+@cached_source("news_api", ttl=7200, negative_ttl=300)
+@circuit_breaker("news_api")
 async def scrape_news_api(claim: str) -> dict:
     """
     Uses NewsAPI.org free tier (100 requests/day, no credit card).
@@ -92,12 +137,12 @@ async def scrape_news_api(claim: str) -> dict:
     
     if not news_api_key:
         print("No NEWS_API_KEY found, skipping NewsAPI")
-        return {"results": [], "error": "No API key"}
+        return {"results": [], "disabled": True}
     
     try:
         # Search news from last 7 days
         search_query = claim.replace(" ", " AND ")
-        url = f"https://newsapi.org/v2/everything"
+        url = upstream_url(f"https://newsapi.org/v2/everything")
         
         params = {
             "q": search_query,
@@ -107,33 +152,22 @@ async def scrape_news_api(claim: str) -> dict:
             "apiKey": news_api_key
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    articles = data.get("articles", [])
-                    
-                    results = []
-                    for article in articles[:5]:
-                        results.append({
-                            "title": article.get("title", ""),
-                            "snippet": article.get("description", ""),
-                            "url": article.get("url", ""),
-                            "displayLink": article.get("source", {}).get("name", ""),
-                            "publishedAt": article.get("publishedAt", ""),
-                            "source": "NewsAPI"
-                        })
-                    
-                    print(f"NewsAPI found {len(results)} results")
-                    return {
-                        "results": results,
-                        "total": len(results),
-                        "query": search_query
-                    }
-                else:
-                    error_data = await response.text()
-                    print(f"NewsAPI error: {response.status} - {error_data}")
-                    return {"results": [], "error": f"Status {response.status}"}
+        session = get_session()
+        async with session.get(url, params=params, timeout=10) as response:
+            if response.status == 200:
+                data = await response.json()
+                results = parse_news_articles(data)
+                
+                print(f"NewsAPI found {len(results)} results")
+                return {
+                    "results": results,
+                    "total": len(results),
+                    "query": search_query
+                }
+            else:
+                error_data = await response.text()
+                print(f"NewsAPI error: {response.status} - {error_data}")
+                return {"results": [], "error": f"Status {response.status}"}
                     
     except Exception as e:
         print(f"NewsAPI error: {str(e)}")
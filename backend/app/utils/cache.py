@@ -0,0 +1,143 @@
+"""
+In-memory LRU cache with per-entry TTLs and a byte-size bound.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    LRU cache where every entry carries its own expiry time.
+
+    Entries are evicted least-recently-used first whenever either the entry
+    count or the total estimated size goes over its limit.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1000, max_bytes: int = 50_000_000, default_ttl: float = 3600):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def ttl_remaining(self, key):
+        """
+        Seconds until key expires, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry[1] - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for key, or default on a miss or expiry.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float = None, size: int = None):
+        """
+        Stores a value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires, defaults to default_ttl
+            size: Estimated size in bytes, defaults to sys.getsizeof(value)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        size = sys.getsizeof(value) if size is None else size
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key) -> bool:
+        """
+        Removes key from the cache. Returns True if it was present.
+        """
+        if key in self._entries:
+            self._remove(key)
+            return True
+        return False
+
+    def clear(self):
+        """
+        Removes all entries. Statistics are kept.
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def entries(self) -> list:
+        """
+        Lists live entries as dictionaries, most recently used last.
+        """
+        now = time.monotonic()
+        return [
+            {"key": key, "size": size, "expires_in": round(expires_at - now, 1)}
+            for key, (_, expires_at, size) in self._entries.items()
+            if expires_at > now
+        ]
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters and current occupancy.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
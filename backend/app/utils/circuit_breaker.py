@@ -0,0 +1,248 @@
+"""
+Per-source circuit breakers for the tools in app/tools.
+
+Each source keeps a rolling window of recent calls (errors, latency, empty
+results). When the error rate - or, for sources that should never be empty,
+the empty-result rate - crosses its threshold, the circuit opens and the source
+is skipped for a cool-down instead of costing every request its full timeout.
+After the cool-down a limited number of probe calls go through (half-open); a
+successful probe closes the circuit, a failed one re-opens it with a longer
+cool-down.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+BREAKERS_ENABLED = os.getenv("CIRCUIT_BREAKERS_ENABLED", "true").lower() == "true"
+
+_breakers = {}
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker for one source.
+
+    Args:
+        name: Source name
+        window: Seconds of history used for the rates
+        min_calls: Minimum calls in the window before the circuit can open
+        error_threshold: Failure rate that opens the circuit
+        empty_threshold: Empty-result rate that opens the circuit (1.0 means
+            only when every call in the window was empty)
+        min_empty_calls: Minimum calls in the window before the empty-result
+            rule applies (searches legitimately come back empty at times)
+        slow_call_seconds: Calls slower than this count as failures
+        cooldown: Seconds the circuit stays open before probing
+        max_cooldown: Upper bound for the cool-down after repeated failed probes
+        half_open_probes: Concurrent probe calls allowed while half-open
+    """
+
+    def __init__(self, name: str, window: float = 120, min_calls: int = 5, error_threshold: float = 0.5,
+                 empty_threshold: float = 1.0, min_empty_calls: int = 20, slow_call_seconds: float = 5.0, cooldown: float = 30,
+                 max_cooldown: float = 300, half_open_probes: int = 1):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.empty_threshold = empty_threshold
+        self.min_empty_calls = min_empty_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.opened_at = None
+        self.probes_in_flight = 0
+        self.short_circuited = 0
+        self.last_error = None
+        self._calls = deque()  # (timestamp, failed, latency, empty)
+
+    def _trim(self, now: float):
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+
+    def allow(self) -> bool:
+        """
+        Decides whether a call may go through, moving open -> half-open once
+        the cool-down has elapsed.
+        """
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                self.short_circuited += 1
+                return False
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self.probes_in_flight >= self.half_open_probes:
+                self.short_circuited += 1
+                return False
+            self.probes_in_flight += 1
+
+        return True
+
+    def record(self, failed: bool, latency: float, empty: bool = False, error: str = None):
+        """
+        Records the outcome of a call that was allowed through.
+        """
+        now = time.monotonic()
+        failed = failed or latency >= self.slow_call_seconds
+        if error:
+            self.last_error = error
+
+        if self.state == HALF_OPEN:
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+            if failed:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._transition(OPEN)
+            else:
+                self.cooldown = self.base_cooldown
+                self._calls.clear()
+                self._transition(CLOSED)
+            return
+
+        self._calls.append((now, failed, latency, empty))
+        self._trim(now)
+
+        calls = len(self._calls)
+        if self.state == CLOSED and calls >= self.min_calls:
+            error_rate = sum(1 for call in self._calls if call[1]) / calls
+            empty_rate = sum(1 for call in self._calls if call[3]) / calls
+            if error_rate >= self.error_threshold:
+                self._transition(OPEN)
+            elif calls >= self.min_empty_calls and empty_rate >= self.empty_threshold:
+                self.last_error = f"{empty_rate:.0%} empty results"
+                self._transition(OPEN)
+
+    def release(self):
+        """
+        Frees a half-open probe slot for a call that ended without an outcome
+        (e.g. cancelled by the latency budget).
+        """
+        if self.state == HALF_OPEN:
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def reset(self):
+        """
+        Closes the circuit and forgets all history.
+        """
+        self._calls.clear()
+        self.cooldown = self.base_cooldown
+        self.probes_in_flight = 0
+        self._transition(CLOSED)
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        logger.warning(f"Circuit for {self.name}: {self.state} -> {state}" + (
+            f" (last error: {self.last_error})" if state == OPEN and self.last_error else ""
+        ))
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+            self.probes_in_flight = 0
+
+    def snapshot(self) -> dict:
+        """
+        Current state and rolling statistics.
+        """
+        now = time.monotonic()
+        self._trim(now)
+        calls = len(self._calls)
+        latencies = sorted(call[2] for call in self._calls)
+        return {
+            "source": self.name,
+            "state": self.state,
+            "calls_in_window": calls,
+            "error_rate": round(sum(1 for call in self._calls if call[1]) / calls, 3) if calls else 0.0,
+            "empty_rate": round(sum(1 for call in self._calls if call[3]) / calls, 3) if calls else 0.0,
+            "latency_p50": round(latencies[calls // 2], 3) if calls else None,
+            "latency_max": round(latencies[-1], 3) if calls else None,
+            "short_circuited": self.short_circuited,
+            "cooldown": self.cooldown,
+            "retry_in": round(max(0.0, self.opened_at + self.cooldown - now), 1) if self.state == OPEN else None,
+            "last_error": self.last_error
+        }
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    """
+    Returns the breaker for a source, or raises KeyError if it is unknown.
+    """
+    return _breakers[source]
+
+
+def all_breakers() -> dict:
+    """
+    Returns all registered breakers keyed by source name.
+    """
+    return dict(_breakers)
+
+
+def circuit_breaker(source: str, result_key: str = "results", **options):
+    """
+    Decorator guarding an async tool `tool(claim) -> dict` with a circuit breaker.
+
+    While the circuit is open the tool is not called and an empty result with
+    "circuit_open": True is returned instead. Results marked "disabled" (e.g.
+    no API key configured) are not counted as calls.
+
+    Args:
+        source: Source name
+        result_key: Key holding the tool's result list ("results" or "claims")
+        **options: CircuitBreaker settings
+
+    Returns:
+        The decorated coroutine function
+    """
+    breaker = CircuitBreaker(source, **options)
+    _breakers[source] = breaker
+
+    def decorator(tool):
+        @wraps(tool)
+        async def wrapper(claim: str, *args, **kwargs):
+            if not BREAKERS_ENABLED:
+                return await tool(claim, *args, **kwargs)
+
+            if not breaker.allow():
+                return {result_key: [], "error": f"Circuit open for {source}", "circuit_open": True}
+
+            start = time.monotonic()
+            try:
+                result = await tool(claim, *args, **kwargs)
+            except asyncio.CancelledError:
+                # Cancelled by the latency budget: only a failure if it was already slow
+                latency = time.monotonic() - start
+                if latency >= breaker.slow_call_seconds:
+                    breaker.record(True, latency, error="Cancelled after slow call")
+                else:
+                    breaker.release()
+                raise
+            except Exception as e:
+                breaker.record(True, time.monotonic() - start, error=str(e))
+                raise
+
+            if isinstance(result, dict) and result.get("disabled"):
+                breaker.release()
+                return result
+
+            error = result.get("error") if isinstance(result, dict) else "Invalid result"
+            empty = not error and not result.get(result_key)
+            breaker.record(bool(error), time.monotonic() - start, empty=empty, error=error)
+            return result
+
+        wrapper.breaker = breaker
+        return wrapper
+
+    return decorator
@@ -0,0 +1,129 @@
+"""
+Deadline-driven gathering of source lookups.
+
+`asyncio.gather` waits for the slowest source even when the others already
+returned plenty of evidence. `gather_with_budget` runs named coroutines under a
+total time budget with per-source soft and hard timeouts:
+
+- a source still running at its hard timeout, or when the budget runs out, is
+  cancelled;
+- once the `enough` rule says the evidence collected so far is sufficient,
+  sources already past their soft timeout are cancelled too.
+
+The deadline of each running source is published in a context variable so
+nested gatherers (e.g. the Indian fact-checker aggregator) finish within it.
+"""
+
+import asyncio
+import contextvars
+import time
+
+_deadline = contextvars.ContextVar("source_deadline", default=None)
+
+
+def remaining_budget(default: float = None):
+    """
+    Seconds left before the enclosing source deadline, or default if none.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    remaining = max(0.0, deadline - time.monotonic())
+    return remaining if default is None else min(default, remaining)
+
+
+async def gather_with_budget(
+    coroutines: dict,
+    budget: float,
+    soft_timeout: float,
+    hard_timeout: float,
+    timeouts: dict = None,
+    enough=None,
+    on_result=None
+) -> tuple:
+    """
+    Runs named coroutines concurrently under a latency budget.
+
+    Args:
+        coroutines: Mapping of source name to coroutine
+        budget: Total seconds allowed, further capped by any enclosing deadline
+        soft_timeout: Default seconds after which a source may be dropped if
+            there is already enough evidence
+        hard_timeout: Default seconds after which a source is always dropped
+        timeouts: Optional per-source overrides as {name: (soft, hard)}
+        enough: Optional predicate `enough(results) -> bool` over the results
+            collected so far
+        on_result: Optional async callback `on_result(name, result)` awaited as
+            each source completes
+
+    Returns:
+        Tuple (results, skipped): results maps each completed source to its
+        result (or the exception it raised); skipped lists cancelled sources
+    """
+    timeouts = timeouts or {}
+    start = time.monotonic()
+    overall_deadline = start + remaining_budget(budget)
+
+    tasks = {}
+    soft_deadlines = {}
+    hard_deadlines = {}
+    for name, coroutine in coroutines.items():
+        soft, hard = timeouts.get(name, (soft_timeout, hard_timeout))
+        soft_deadlines[name] = start + soft
+        hard_deadlines[name] = min(start + hard, overall_deadline)
+
+        context = contextvars.copy_context()
+        context.run(_deadline.set, hard_deadlines[name])
+        tasks[name] = asyncio.create_task(coroutine, context=context)
+
+    results = {}
+    skipped = []
+    pending = {task: name for name, task in tasks.items()}
+
+    def drop(names):
+        for name in names:
+            tasks[name].cancel()
+            skipped.append(name)
+        for task in [task for task, name in pending.items() if name in names]:
+            del pending[task]
+
+    try:
+        while pending:
+            now = time.monotonic()
+
+            # Hard timeouts and the overall budget always apply
+            expired = [name for name in pending.values() if hard_deadlines[name] <= now]
+            # Soft timeouts apply once there is enough evidence
+            if enough is not None and enough(results):
+                expired += [
+                    name for name in pending.values()
+                    if soft_deadlines[name] <= now and name not in expired
+                ]
+            if expired:
+                drop(expired)
+                continue
+
+            # Wake up at the next completion or the next deadline that could drop a source
+            next_deadline = min(
+                min(hard_deadlines[name], soft_deadlines[name]) if soft_deadlines[name] > now else hard_deadlines[name]
+                for name in pending.values()
+            )
+            done, _ = await asyncio.wait(
+                pending.keys(),
+                timeout=max(0.0, next_deadline - now),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                name = pending.pop(task)
+                try:
+                    results[name] = task.result()
+                except Exception as e:
+                    results[name] = e
+                if on_result is not None:
+                    await on_result(name, results[name])
+    finally:
+        # Never leave stragglers running if we were cancelled ourselves
+        for task in pending:
+            task.cancel()
+
+    return results, skipped
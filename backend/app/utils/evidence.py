@@ -0,0 +1,261 @@
+"""
+Evidence ranking before the LLM.
+
+verify_claim collects up to ~25 results from the Indian fact-checkers, Google,
+DuckDuckGo and NewsAPI, and the analysis prompt only has room for five. Instead
+of taking the first five, results are:
+
+1. canonicalized: DuckDuckGo redirect links are resolved and tracking
+   parameters dropped, so the same article found by two sources shares a URL;
+2. deduplicated by canonical URL and by near-duplicate title;
+3. scored by TF-IDF cosine similarity to the claim, with IDF computed over all
+   results at once, and weighted by the result's credibility;
+4. cut to the best EVIDENCE_TOP_K.
+
+The work per result is bounded: only the first EVIDENCE_MAX_DOCUMENT_TOKENS
+words of a result are scored, and titles are only compared with
+SequenceMatcher when they share enough words to possibly be duplicates.
+"""
+
+import math
+import os
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+from app.utils.near_duplicate import NEGATION_WORDS, canonicalize_claim
+from app.utils.similarity import normalize_for_similarity
+
+EVIDENCE_RANKING_ENABLED = os.getenv("EVIDENCE_RANKING_ENABLED", "true").lower() == "true"
+EVIDENCE_TOP_K = int(os.getenv("EVIDENCE_TOP_K", "5"))
+# Results below this relevance are dropped (unless nothing else is left)
+EVIDENCE_MIN_RELEVANCE = float(os.getenv("EVIDENCE_MIN_RELEVANCE", "0.05"))
+TITLE_DUPLICATE_THRESHOLD = float(os.getenv("EVIDENCE_TITLE_DUPLICATE_THRESHOLD", "0.85"))
+# Words of title + snippet scored per result, and characters of a title compared
+EVIDENCE_MAX_DOCUMENT_TOKENS = int(os.getenv("EVIDENCE_MAX_DOCUMENT_TOKENS", "80"))
+MAX_TITLE_CHARS = 200
+
+CREDIBILITY_WEIGHTS = {"high": 1.0, "medium": 0.85, "low": 0.6}
+DEFAULT_CREDIBILITY_WEIGHT = 0.8
+
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "igshid", "ref", "ref_src", "rut", "amp"}
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "being", "of", "in", "on", "at",
+    "to", "for", "by", "with", "and", "or", "but", "that", "this", "these", "those", "it", "its",
+    "as", "from", "has", "have", "had", "will", "would", "can", "could", "should", "all", "any",
+    "about", "into", "than", "then", "there", "their", "they", "he", "she", "his", "her", "we",
+    "you", "i", "not", "no", "so", "if", "do", "does", "did", "says", "said",
+}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Resolves redirect links and strips tracking parameters and fragments.
+
+    Args:
+        url: Result URL, possibly a DuckDuckGo "/l/?uddg=" redirect
+
+    Returns:
+        Canonical URL (the input unchanged if it cannot be parsed)
+    """
+    if not url:
+        return ""
+    try:
+        if url.startswith("//"):
+            url = "https:" + url
+        parts = urlsplit(url)
+
+        # DuckDuckGo wraps result links: //duckduckgo.com/l/?uddg=<encoded target>
+        if parts.netloc.endswith("duckduckgo.com") and parts.path.startswith("/l/"):
+            target = dict(parse_qsl(parts.query)).get("uddg")
+            if target:
+                return canonicalize_url(unquote(target))
+        if not parts.netloc:
+            return url
+
+        query = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+        ]
+        return urlunsplit((
+            parts.scheme.lower() or "https",
+            parts.netloc.lower(),
+            parts.path or "/",
+            urlencode(query),
+            ""
+        ))
+    except ValueError:
+        return url
+
+
+def url_key(url: str) -> str:
+    """
+    Deduplication key of a canonical URL: host without "www.", path without
+    trailing slash, and sorted query, ignoring the scheme.
+    """
+    parts = urlsplit(url)
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{host}{parts.path.rstrip('/')}?{query}"
+
+
+def _tokens(text: str) -> list:
+    return [
+        word for word in normalize_for_similarity(text or "").split()
+        if word not in STOPWORDS and (len(word) > 1 or word.isdigit())
+    ]
+
+
+def relevance_scores(claim: str, documents: list) -> list:
+    """
+    TF-IDF cosine similarity of each document to the claim.
+
+    IDF is computed once over the claim and all documents, and each document
+    vector is compared against the same claim vector in a single pass.
+
+    Args:
+        claim: Claim text
+        documents: Document texts
+
+    Returns:
+        List of similarities between 0 and 1, in document order
+    """
+    # Term counts once per text; documents are cut to their first words
+    term_counts = [Counter(_tokens(claim))] + [
+        Counter(_tokens(document)[:EVIDENCE_MAX_DOCUMENT_TOKENS]) for document in documents
+    ]
+    total = len(term_counts)
+    document_frequency = Counter(token for counts in term_counts for token in counts)
+    idf = {token: math.log((1 + total) / (1 + count)) + 1 for token, count in document_frequency.items()}
+
+    def weights(counts: Counter) -> tuple:
+        # Sublinear term frequency, and the vector's L2 norm
+        vector = {token: (1 + math.log(count)) * idf[token] for token, count in counts.items()}
+        return vector, math.sqrt(sum(weight * weight for weight in vector.values()))
+
+    claim_vector, claim_norm = weights(term_counts[0])
+    scores = []
+    for counts in term_counts[1:]:
+        vector, norm = weights(counts)
+        if not norm or not claim_norm:
+            scores.append(0.0)
+            continue
+        # Only the claim's terms contribute to the dot product
+        dot = sum(weight * vector.get(token, 0.0) for token, weight in claim_vector.items())
+        scores.append(dot / (norm * claim_norm))
+    return scores
+
+
+def _title_key(title: str) -> tuple:
+    words = set(title.split())
+    return title, words, {word for word in words if word.isdigit()}, words & NEGATION_WORDS
+
+
+def _duplicate_title(key: tuple, other_key: tuple) -> bool:
+    """
+    claim_similarity(title, other) >= TITLE_DUPLICATE_THRESHOLD for two
+    canonical titles, deciding from word sets where possible: the score is
+    max(0.7 * SequenceMatcher ratio + 0.3 * word Jaccard, Jaccard), so the
+    quadratic ratio() is only computed when the cheaper bounds cannot decide.
+    """
+    title, words, digits, negations = key
+    other, other_words, other_digits, other_negations = other_key
+    if digits != other_digits or negations != other_negations:
+        return False
+    jaccard = len(words & other_words) / len(words | other_words)
+    if jaccard >= TITLE_DUPLICATE_THRESHOLD:
+        return True
+    # Same weighting as hybrid_similarity, tried on the cheap upper bounds of ratio() first
+    reaches = lambda ratio: (ratio * 0.7) + (jaccard * 0.3) >= TITLE_DUPLICATE_THRESHOLD
+    matcher = SequenceMatcher(None, title, other)
+    return (reaches(1.0) and reaches(matcher.real_quick_ratio())
+            and reaches(matcher.quick_ratio()) and reaches(matcher.ratio()))
+
+
+def _evidence_chars(results: list) -> int:
+    # Size of the evidence block as the analysis prompt formats it
+    return sum(
+        len(result.get("title") or "") + len(result.get("snippet") or "") + len(result.get("url") or "") + 40
+        for result in results
+    )
+
+
+def rank_evidence(claim: str, results: list, top_k: int = EVIDENCE_TOP_K) -> tuple:
+    """
+    Deduplicates and ranks search results by relevance and credibility.
+
+    Args:
+        claim: Claim being verified
+        results: Combined search results; each may carry "credibility"
+        top_k: Number of results to keep
+
+    Returns:
+        Tuple (ranked results, stats). Ranked results are copies with the
+        canonical "url" and a "relevance" score. Stats report candidate,
+        duplicate and selected counts, the evidence size before/after and the
+        ranking time; title duplicates and irrelevant results are only
+        counted among the results examined before top_k were found.
+    """
+    start = time.perf_counter()
+    if not EVIDENCE_RANKING_ENABLED:
+        selected = results[:top_k]
+        return selected, {"enabled": False, "candidates": len(results), "selected": len(selected)}
+
+    # 1. Canonical URLs, dropping exact duplicates (first occurrence wins)
+    unique = []
+    seen_urls = set()
+    for result in results:
+        url = canonicalize_url(result.get("url", ""))
+        key = url_key(url) if url else None
+        if key and key in seen_urls:
+            continue
+        if key:
+            seen_urls.add(key)
+        unique.append({**result, "url": url})
+    url_duplicates = len(results) - len(unique)
+
+    # 2. Relevance for all results at once, weighted by credibility
+    relevance = relevance_scores(claim, [f"{r.get('title', '')} {r.get('snippet', '')}" for r in unique])
+    scored = []
+    for result, score in zip(unique, relevance):
+        weight = CREDIBILITY_WEIGHTS.get(result.get("credibility"), DEFAULT_CREDIBILITY_WEIGHT)
+        scored.append((score * weight, score, result))
+    scored.sort(key=lambda item: item[0], reverse=True)
+
+    # 3. Collapse near-duplicate titles, keeping the best-scored copy. Later
+    # results cannot displace earlier ones, so stop once top_k relevant are kept.
+    kept = []
+    kept_titles = []
+    title_duplicates = 0
+    relevant_kept = 0
+    for weighted, score, result in scored:
+        if relevant_kept >= top_k:
+            break
+        title = canonicalize_claim((result.get("title") or "")[:MAX_TITLE_CHARS])
+        key = _title_key(title)
+        if title and any(_duplicate_title(key, other_key) for other_key in kept_titles):
+            title_duplicates += 1
+            continue
+        if title:
+            kept_titles.append(key)
+        kept.append((weighted, score, result))
+        relevant_kept += score >= EVIDENCE_MIN_RELEVANCE
+
+    relevant = [item for item in kept if item[1] >= EVIDENCE_MIN_RELEVANCE] or kept
+    selected = [{**result, "relevance": round(score, 3)} for weighted, score, result in relevant[:top_k]]
+
+    stats = {
+        "enabled": True,
+        "candidates": len(results),
+        "url_duplicates": url_duplicates,
+        "title_duplicates": title_duplicates,
+        "irrelevant": len(kept) - len(relevant),
+        "selected": len(selected),
+        "evidence_chars_all": _evidence_chars(results),
+        "evidence_chars_first_k": _evidence_chars(results[:top_k]),
+        "evidence_chars_selected": _evidence_chars(selected),
+        "ranking_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+    return selected, stats
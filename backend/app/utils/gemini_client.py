@@ -0,0 +1,149 @@
+"""
+Shared Gemini client for all agents.
+
+The google-generativeai SDK only exposes a blocking `generate_content`, so every
+call is offloaded to a bounded thread pool. This keeps the event loop free for
+other /api/verify requests and Telegram updates while Gemini is thinking, and
+caps how many LLM calls can be in flight at once.
+
+Before a call is sent it waits for quota in the process-wide rate limiter
+(app.utils.rate_limiter), and quota/server errors are retried with backoff.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import google.generativeai as genai
+from dotenv import load_dotenv
+
+from app.utils import llm_usage, tracing
+from app.utils.prompt_budget import estimate_tokens
+from app.utils.rate_limiter import (
+    gemini_limiter, RETRYABLE_ERRORS, GEMINI_MAX_RETRIES, EXPECTED_RESPONSE_TOKENS
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+MAX_CONCURRENT_CALLS = int(os.getenv("GEMINI_MAX_CONCURRENCY", "16"))
+
+# Optional alternative endpoint (e.g. the load-test stand-in), reached over REST
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT", "")
+
+# Configure once for the whole process
+if GEMINI_API_ENDPOINT:
+    genai.configure(
+        api_key=os.getenv("GEMINI_API_KEY"),
+        transport="rest",
+        client_options={"api_endpoint": GEMINI_API_ENDPOINT}
+    )
+else:
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_CALLS,
+    thread_name_prefix="gemini"
+)
+_models = {}
+
+
+def get_model(model_name: str = DEFAULT_MODEL) -> genai.GenerativeModel:
+    """
+    Returns a reusable GenerativeModel instance for the given model name.
+
+    Args:
+        model_name: Gemini model identifier
+
+    Returns:
+        Cached GenerativeModel instance
+    """
+    model = _models.get(model_name)
+    if model is None:
+        model = genai.GenerativeModel(model_name)
+        _models[model_name] = model
+    return model
+
+
+async def generate_content(prompt: str, model_name: str = DEFAULT_MODEL, stage: str = "other", **kwargs):
+    """
+    Generates content with Gemini without blocking the event loop.
+
+    Args:
+        prompt: Prompt text to send
+        model_name: Gemini model identifier
+        stage: Pipeline stage making the call, for token usage accounting
+        **kwargs: Extra arguments forwarded to `GenerativeModel.generate_content`
+
+    Returns:
+        The Gemini GenerateContentResponse
+
+    Raises:
+        RateLimitTimeout: No quota became available within the queue deadline
+    """
+    model = get_model(model_name)
+    loop = asyncio.get_running_loop()
+    estimated = estimate_tokens(prompt)
+    charged = estimated + EXPECTED_RESPONSE_TOKENS
+
+    with tracing.span("gemini.generate", stage=stage, model=model_name, estimated_prompt_tokens=estimated) as trace_span:
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            queued = time.monotonic()
+            await gemini_limiter.acquire(charged)
+            trace_span.set(attempts=attempt + 1, queue_wait_ms=round((time.monotonic() - queued) * 1000, 1))
+            start = time.monotonic()
+            try:
+                response = await loop.run_in_executor(
+                    _executor,
+                    partial(model.generate_content, prompt, **kwargs)
+                )
+            except RETRYABLE_ERRORS as e:
+                llm_usage.record(stage, None, estimated, time.monotonic() - start, error=True)
+                gemini_limiter.record_retryable(e)
+                if attempt == GEMINI_MAX_RETRIES:
+                    raise
+                delay = gemini_limiter.backoff_delay(attempt)
+                logger.warning(f"Gemini {stage} call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                llm_usage.record(stage, None, estimated, time.monotonic() - start, error=True)
+                raise
+
+            llm_usage.record(stage, response, estimated, time.monotonic() - start)
+            metadata = getattr(response, "usage_metadata", None)
+            trace_span.set(
+                prompt_tokens=getattr(metadata, "prompt_token_count", None),
+                response_tokens=getattr(metadata, "candidates_token_count", None)
+            )
+            gemini_limiter.settle(charged, getattr(metadata, "total_token_count", 0) or 0)
+            return response
+
+
+async def generate_text(prompt: str, model_name: str = DEFAULT_MODEL, stage: str = "other", **kwargs) -> str:
+    """
+    Generates content with Gemini and returns the stripped response text.
+
+    Args:
+        prompt: Prompt text to send
+        model_name: Gemini model identifier
+        stage: Pipeline stage making the call, for token usage accounting
+        **kwargs: Extra arguments forwarded to `GenerativeModel.generate_content`
+
+    Returns:
+        Response text with surrounding whitespace removed
+    """
+    response = await generate_content(prompt, model_name, stage=stage, **kwargs)
+    return response.text.strip()
+
+
+def shutdown():
+    """
+    Stops the worker pool. Queued calls are cancelled; running calls finish.
+    """
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,266 @@
+"""
+On-disk HTTP cache for scraped pages.
+
+Responses carrying an ETag, Last-Modified or Cache-Control max-age are stored
+zlib-compressed in a SQLite database, so the cache survives restarts. Fresh
+entries (within max-age) are served without a request; stale ones are
+revalidated with If-None-Match / If-Modified-Since, and a 304 reuses the stored
+body instead of downloading the page again. The database is bounded by the
+compressed body size and evicts least recently used entries.
+
+SQLite and compression run in a worker thread so the event loop never blocks
+on disk.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from app.utils import http_replay, tracing
+from app.utils.http_client import get_session, upstream_url
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(".cache", "http_cache.sqlite3"))
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    fresh_until REAL NOT NULL,
+    body BLOB NOT NULL,
+    body_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+class HTTPCache:
+    """
+    SQLite-backed response store with LRU eviction by stored size.
+
+    Args:
+        path: Database file
+        max_bytes: Upper bound for the total compressed body size
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+
+        self.requests = 0
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def lookup(self, url: str):
+        """
+        Returns (etag, last_modified, fresh_until, text) for url, or None.
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT etag, last_modified, fresh_until, body FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+        etag, last_modified, fresh_until, body = row
+        return etag, last_modified, fresh_until, zlib.decompress(body).decode("utf-8")
+
+    def store(self, url: str, text: str, etag: str = None, last_modified: str = None, max_age: float = 0):
+        """
+        Stores a response body and evicts old entries beyond max_bytes.
+        """
+        raw = text.encode("utf-8")
+        body = zlib.compress(raw, 6)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, now + max_age, body, len(raw), len(body), now)
+            )
+            self._evict(conn)
+
+    def touch(self, url: str, max_age: float = 0):
+        """
+        Marks an entry as revalidated (after a 304).
+        """
+        with self._lock:
+            self._connection().execute(
+                "UPDATE responses SET fresh_until = ?, last_access = ? WHERE url = ?",
+                (time.time() + max_age, time.time(), url)
+            )
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM responses").fetchone()[0]
+        while total > self.max_bytes:
+            row = conn.execute(
+                "SELECT url, stored_size FROM responses ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM responses WHERE url = ?", (row[0],))
+            total -= row[1]
+            self.evictions += 1
+
+    def clear(self) -> int:
+        """
+        Removes every stored response. Returns the number removed.
+        """
+        with self._lock:
+            conn = self._connection()
+            count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            conn.execute("DELETE FROM responses")
+            conn.execute("VACUUM")
+        return count
+
+    def disk_usage(self) -> tuple:
+        """
+        Returns (entries, stored bytes, uncompressed bytes).
+        """
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(stored_size), 0), COALESCE(SUM(body_size), 0) FROM responses"
+            ).fetchone()
+
+    def stats(self) -> dict:
+        """
+        Hit ratio, bytes saved and disk usage.
+        """
+        entries, stored_bytes, body_bytes = self.disk_usage()
+        hits = self.fresh_hits + self.revalidated
+        return {
+            "enabled": HTTP_CACHE_ENABLED,
+            "path": self.path,
+            "requests": self.requests,
+            "fresh_hits": self.fresh_hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_ratio": round(hits / self.requests, 3) if self.requests else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+            "entries": entries,
+            "disk_bytes": stored_bytes,
+            "uncompressed_bytes": body_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+http_cache = HTTPCache()
+
+
+def _max_age(headers) -> float:
+    cache_control = headers.get("Cache-Control", "").lower()
+    # no-cache responses may be stored but must be revalidated every time
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    return float(match.group(1)) if match else 0
+
+
+async def fetch_text(url: str, headers: dict = None, timeout: float = 10) -> tuple:
+    """
+    GET a page through the on-disk cache.
+
+    Args:
+        url: Page URL
+        headers: Request headers
+        timeout: Request timeout in seconds
+
+    Returns:
+        Tuple (status, text). A revalidated or fresh cached page is returned
+        with status 200.
+    """
+    with tracing.span("http.fetch", url=url) as trace_span:
+        status, text = await _fetch_text(url, headers, timeout)
+        trace_span.set(status=status, bytes=len(text))
+        return status, text
+
+
+async def _fetch_text(url: str, headers: dict, timeout: float) -> tuple:
+    session = get_session()
+    # Cache entries stay keyed on the real URL
+    request_url = upstream_url(url)
+    # Recorded fixtures must hold full responses, not 304s
+    if not HTTP_CACHE_ENABLED or http_replay.is_active():
+        async with session.get(request_url, headers=headers, timeout=timeout) as response:
+            return response.status, await response.text()
+
+    http_cache.requests += 1
+    try:
+        cached = await asyncio.to_thread(http_cache.lookup, url)
+    except Exception as e:
+        logger.warning(f"HTTP cache lookup failed for {url}: {e}")
+        cached = None
+
+    request_headers = dict(headers or {})
+    if cached is not None:
+        etag, last_modified, fresh_until, text = cached
+        if fresh_until > time.time():
+            http_cache.fresh_hits += 1
+            http_cache.bytes_saved += len(text)
+            tracing.annotate(cache="fresh")
+            return 200, text
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+    async with session.get(request_url, headers=request_headers, timeout=timeout) as response:
+        if response.status == 304 and cached is not None:
+            http_cache.revalidated += 1
+            http_cache.bytes_saved += len(cached[3])
+            try:
+                await asyncio.to_thread(http_cache.touch, url, _max_age(response.headers))
+            except Exception as e:
+                logger.warning(f"HTTP cache touch failed for {url}: {e}")
+            tracing.annotate(cache="revalidated")
+            return 200, cached[3]
+
+        text = await response.text()
+        http_cache.misses += 1
+        tracing.annotate(cache="miss")
+        if response.status == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            max_age = _max_age(response.headers)
+            no_store = "no-store" in response.headers.get("Cache-Control", "").lower()
+            if not no_store and (etag or last_modified or max_age):
+                try:
+                    await asyncio.to_thread(http_cache.store, url, text, etag, last_modified, max_age)
+                except Exception as e:
+                    logger.warning(f"HTTP cache store failed for {url}: {e}")
+        return response.status, text
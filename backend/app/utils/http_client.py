@@ -0,0 +1,154 @@
+"""
+Process-wide pooled HTTP client shared by every source tool.
+
+One aiohttp.ClientSession is kept per event loop with keep-alive, per-host
+connection limits and DNS caching, so the nine lookups made for a claim reuse
+warm TCP/TLS connections instead of opening nine cold sessions. The FastAPI
+lifespan hook opens it and pre-warms the known fact-checker hosts; other
+processes (the Telegram bot) get it lazily on first use.
+
+Upstream origins can be redirected with UPSTREAM_OVERRIDES, e.g.
+"https://newsapi.org=http://127.0.0.1:8900/newsapi", which the load-test
+harness uses to point every source at local stand-ins. With
+HTTP_REPLAY_MODE set, the session records or replays its requests (see
+http_replay).
+"""
+
+import asyncio
+import os
+
+import aiohttp
+
+from app.utils import http_replay
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Hosts hit on every claim - warmed at startup so the first request is not cold
+KNOWN_HOSTS = [
+    "https://factchecktools.googleapis.com",
+    "https://www.googleapis.com",
+    "https://newsapi.org",
+    "https://html.duckduckgo.com",
+    "https://factcheck.pib.gov.in",
+    "https://www.altnews.in",
+    "https://www.boomlive.in",
+    "https://factly.in",
+    "https://www.vishvasnews.com",
+]
+
+
+def _parse_overrides(value: str) -> dict:
+    overrides = {}
+    for pair in (value or "").split(","):
+        if "=" in pair:
+            origin, replacement = pair.split("=", 1)
+            overrides[origin.strip().rstrip("/")] = replacement.strip().rstrip("/")
+    return overrides
+
+
+UPSTREAM_OVERRIDES = _parse_overrides(os.getenv("UPSTREAM_OVERRIDES", ""))
+
+_session = None
+_session_loop = None
+
+
+def upstream_url(url: str) -> str:
+    """
+    Applies UPSTREAM_OVERRIDES to a URL (unchanged if its origin is not overridden).
+    """
+    for origin, replacement in UPSTREAM_OVERRIDES.items():
+        if url == origin or url.startswith(origin + "/") or url.startswith(origin + "?"):
+            return replacement + url[len(origin):]
+    return url
+
+
+def canonical_url(url: str) -> str:
+    """
+    Undoes UPSTREAM_OVERRIDES: the real upstream URL of a request URL.
+    """
+    for origin, replacement in UPSTREAM_OVERRIDES.items():
+        if url == replacement or url.startswith(replacement + "/") or url.startswith(replacement + "?"):
+            return origin + url[len(replacement):]
+    return url
+
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        use_dns_cache=True,
+        keepalive_timeout=KEEPALIVE_TIMEOUT
+    )
+    return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS)
+
+
+def get_session():
+    """
+    Returns the shared HTTP session, creating it if needed.
+
+    Must be called from inside a running event loop. If the session was created
+    on a loop that has since closed, a fresh one is created.
+
+    Returns:
+        The shared aiohttp.ClientSession, wrapped in a ReplaySession when
+        HTTP_REPLAY_MODE is "record" or "replay"
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = http_replay.wrap_session(_create_session(), canonical_url)
+        _session_loop = loop
+    return _session
+
+
+async def _warm_host(session: aiohttp.ClientSession, base_url: str):
+    try:
+        async with session.head(base_url, timeout=aiohttp.ClientTimeout(total=5), allow_redirects=False):
+            pass
+    except Exception as e:
+        print(f"Warm-up failed for {base_url}: {str(e)}")
+
+
+async def warm_up(hosts: list = None):
+    """
+    Resolves DNS and opens a keep-alive connection to each known host.
+
+    Args:
+        hosts: Base URLs to warm, defaults to KNOWN_HOSTS
+    """
+    session = get_session()
+    await asyncio.gather(*(_warm_host(session, upstream_url(host)) for host in hosts or KNOWN_HOSTS))
+
+
+async def startup():
+    """
+    Opens the shared session and warms known hosts in the background.
+
+    Returns:
+        The warm-up task, so callers can cancel it on shutdown (None when
+        recording or replaying)
+    """
+    get_session()
+    if http_replay.is_active():
+        # Warm-up requests would be recorded, or fail for lack of fixtures
+        return None
+    return asyncio.create_task(warm_up())
+
+
+async def shutdown():
+    """
+    Closes the shared session and its pooled connections.
+    """
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
@@ -0,0 +1,342 @@
+"""
+Record/replay of outbound HTTP for the source tools.
+
+Every request made by app/tools goes through the shared session from
+http_client. With HTTP_REPLAY_MODE set, that session is wrapped:
+
+- record: requests go out as usual and each response (status, a few
+  headers, body) is also written to a fixture file;
+- replay: nothing goes out; responses are served from the fixture files,
+  and a request without a fixture fails like a network error.
+
+Fixtures live under HTTP_FIXTURES_DIR, one JSON file per request at
+<host>/<hash>.json. Keys are the method and the real URL with its query
+parameters sorted and API keys removed, so fixtures hold no secrets, replay
+without keys, and do not depend on UPSTREAM_OVERRIDES. Each file carries
+FIXTURE_FORMAT_VERSION; files of another version are skipped. Keep one
+directory per recorded markup generation (e.g. fixtures/http/2025-06) and
+point HTTP_FIXTURES_DIR at the one to use.
+
+Record a set for some claims, then list it:
+
+    HTTP_FIXTURES_DIR=fixtures/http/2025-06 python -m app.utils.http_replay record "claim one" "claim two"
+    python -m app.utils.http_replay list --dir fixtures/http/2025-06
+
+Replay only covers the shared session: the HTTP cache is bypassed while a
+mode is active, and Gemini calls are not part of it.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+logger = logging.getLogger(__name__)
+
+HTTP_REPLAY_MODE = os.getenv("HTTP_REPLAY_MODE", "off").lower()
+HTTP_FIXTURES_DIR = os.getenv("HTTP_FIXTURES_DIR", os.path.join("fixtures", "http"))
+
+FIXTURE_FORMAT_VERSION = 1
+MODES = ("off", "record", "replay")
+
+# Query parameters never written to fixtures or used in keys
+SECRET_PARAMS = {"key", "apikey", "api_key", "access_token", "token"}
+# Response headers kept in fixtures
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+class FixtureNotFound(aiohttp.ClientError):
+    """
+    Raised in replay mode for a request that has no fixture.
+    """
+
+
+def is_active() -> bool:
+    """
+    True if requests are being recorded or replayed.
+    """
+    return HTTP_REPLAY_MODE in ("record", "replay")
+
+
+def configure(mode: str, directory: str = None):
+    """
+    Sets the mode (and fixture directory) before the shared session is created.
+
+    Args:
+        mode: "off", "record" or "replay"
+        directory: Fixture directory, defaults to HTTP_FIXTURES_DIR
+    """
+    global HTTP_REPLAY_MODE, HTTP_FIXTURES_DIR
+    if mode not in MODES:
+        raise ValueError(f"Unknown HTTP replay mode {mode!r}, expected one of {MODES}")
+    HTTP_REPLAY_MODE = mode
+    if directory:
+        HTTP_FIXTURES_DIR = directory
+
+
+def fixture_key(method: str, url: str, params: dict = None) -> str:
+    """
+    Canonical request key: "GET https://host/path?a=1&b=2", query sorted and
+    secret parameters dropped.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(name, str(value)) for name, value in (params or {}).items()]
+    query = sorted((name, value) for name, value in query if name.lower() not in SECRET_PARAMS)
+    return f"{method.upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))}"
+
+
+def fixture_path(directory: str, key: str) -> str:
+    host = urlsplit(key.split(" ", 1)[1]).netloc or "unknown"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory, host.replace(":", "_"), f"{digest}.json")
+
+
+class FixtureStore:
+    """
+    Fixture files of one directory, indexed by key on first use.
+
+    Args:
+        directory: Fixture directory
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._fixtures = None
+        self.skipped = 0
+
+    def _load(self) -> dict:
+        if self._fixtures is None:
+            self._fixtures = {}
+            for root, _, files in os.walk(self.directory):
+                for filename in sorted(files):
+                    if filename.endswith(".json"):
+                        self._read(os.path.join(root, filename))
+        return self._fixtures
+
+    def _read(self, path: str):
+        try:
+            with open(path, encoding="utf-8") as f:
+                fixture = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable fixture {path}: {e}")
+            self.skipped += 1
+            return
+        if fixture.get("format_version") != FIXTURE_FORMAT_VERSION:
+            logger.warning(f"Skipping fixture {path}: format version {fixture.get('format_version')}, "
+                           f"expected {FIXTURE_FORMAT_VERSION}")
+            self.skipped += 1
+            return
+        self._fixtures[fixture["key"]] = fixture
+
+    def get(self, key: str):
+        """
+        The fixture for a key, or None.
+        """
+        return self._load().get(key)
+
+    def all(self) -> list:
+        """
+        Every loaded fixture, sorted by key.
+        """
+        return [self._load()[key] for key in sorted(self._load())]
+
+    def save(self, key: str, status: int, headers, body: str) -> dict:
+        """
+        Writes (or overwrites) the fixture for a key.
+        """
+        fixture = {
+            "format_version": FIXTURE_FORMAT_VERSION,
+            "key": key,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "response": {
+                "status": status,
+                "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+                "body": body,
+            },
+        }
+        path = fixture_path(self.directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, indent=2, ensure_ascii=False)
+        self._load()[key] = fixture
+        return fixture
+
+
+class ReplayResponse:
+    """
+    Recorded response with the parts of aiohttp.ClientResponse the tools use.
+    """
+
+    def __init__(self, url: str, status: int, headers: dict, body: str):
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self._body = body
+
+    async def text(self, encoding: str = None) -> str:
+        return self._body
+
+    async def read(self) -> bytes:
+        return self._body.encode("utf-8")
+
+    async def json(self, content_type: str = None, **kwargs):
+        return json.loads(self._body)
+
+    def release(self):
+        pass
+
+
+class _RequestContext:
+    # Makes `async with session.get(...) as response` work like aiohttp's
+    def __init__(self, coroutine):
+        self._coroutine = coroutine
+
+    async def __aenter__(self) -> ReplayResponse:
+        return await self._coroutine
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class ReplaySession:
+    """
+    Wraps the shared aiohttp session to record or replay its requests.
+
+    Args:
+        session: The real session (used for requests when recording)
+        mode: "record" or "replay"
+        store: Fixture store
+        canonical_url: Function mapping a request URL back to the real
+            upstream URL (undoes UPSTREAM_OVERRIDES)
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, mode: str, store: FixtureStore, canonical_url=None):
+        self._session = session
+        self.mode = mode
+        self.store = store
+        self._canonical_url = canonical_url or (lambda url: url)
+        self.recorded = 0
+        self.replayed = 0
+        self.missing = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+
+    async def close(self):
+        await self._session.close()
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self._request("GET", url, **kwargs))
+
+    def head(self, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self._request("HEAD", url, **kwargs))
+
+    async def _request(self, method: str, url: str, params: dict = None, **kwargs) -> ReplayResponse:
+        key = fixture_key(method, self._canonical_url(str(url)), params)
+        if self.mode == "replay":
+            fixture = self.store.get(key)
+            if fixture is None:
+                self.missing += 1
+                raise FixtureNotFound(f"No fixture for {key} in {self.store.directory} "
+                                      f"(record it with HTTP_REPLAY_MODE=record)")
+            self.replayed += 1
+            response = fixture["response"]
+            return ReplayResponse(url, response["status"], response["headers"], response["body"])
+
+        async with self._session.request(method, url, params=params, **kwargs) as response:
+            body = await response.text(errors="replace")
+            headers = dict(response.headers)
+            status = response.status
+        await asyncio.to_thread(self.store.save, key, status, headers, body)
+        self.recorded += 1
+        return ReplayResponse(url, status, {name: headers[name] for name in RECORDED_HEADERS if name in headers}, body)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "directory": self.store.directory,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "missing": self.missing,
+        }
+
+
+def wrap_session(session: aiohttp.ClientSession, canonical_url=None):
+    """
+    Returns the session wrapped for the current mode, or unchanged when off.
+    """
+    if not is_active():
+        return session
+    return ReplaySession(session, HTTP_REPLAY_MODE, FixtureStore(HTTP_FIXTURES_DIR), canonical_url)
+
+
+def source_tools() -> dict:
+    """
+    Every source tool that makes outbound requests, by source name.
+    """
+    from app.tools.google_factcheck import search_fact_check_api
+    from app.tools.google_search import search_google
+    from app.tools.web_scraper import scrape_news_search, scrape_news_api
+    from app.tools.indian_factcheckers import SCRAPERS
+
+    return {
+        "fact_check_api": search_fact_check_api,
+        "google_search": search_google,
+        "duckduckgo": scrape_news_search,
+        "news_api": scrape_news_api,
+        **SCRAPERS,
+    }
+
+
+async def _record_claims(claims: list) -> dict:
+    from app.utils import http_client
+
+    tools = source_tools()
+    try:
+        for claim in claims:
+            results = await asyncio.gather(*(tool(claim) for tool in tools.values()))
+            for name, result in zip(tools, results):
+                error = f" ({result['error']})" if result.get("error") else ""
+                count = len(result.get("results") or result.get("claims") or [])
+                print(f"{name:<20} {count} results{error}")
+        return http_client.get_session().stats()
+    finally:
+        await http_client.shutdown()
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Record or inspect HTTP fixtures of the source tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    record = subcommands.add_parser("record", help="Run every source tool for the claims, recording responses")
+    record.add_argument("claims", nargs="+")
+    record.add_argument("--dir", default=None, help="Fixture directory (default HTTP_FIXTURES_DIR)")
+    listing = subcommands.add_parser("list", help="List the fixtures of a directory")
+    listing.add_argument("--dir", default=None, help="Fixture directory (default HTTP_FIXTURES_DIR)")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        # Configure the module http_client uses, not this one when run with -m
+        from app.utils import http_replay
+        http_replay.configure("record", args.dir)
+        stats = asyncio.run(_record_claims(args.claims))
+        print(f"Recorded {stats['recorded']} responses to {stats['directory']}")
+        return
+
+    store = FixtureStore(args.dir or HTTP_FIXTURES_DIR)
+    for fixture in store.all():
+        response = fixture["response"]
+        print(f"{response['status']}  {len(response['body']):>8} B  {fixture['recorded_at']}  {fixture['key']}")
+    print(f"{len(store.all())} fixtures, {store.skipped} skipped")
+
+
+if __name__ == "__main__":
+    main()
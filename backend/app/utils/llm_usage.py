@@ -0,0 +1,163 @@
+"""
+Gemini token usage accounting.
+
+Each call records the prompt/response token counts reported in the response's
+usage_metadata, plus the locally estimated prompt tokens, under its stage
+("extraction", "analysis", "explanation", ...). Totals are kept per stage for
+the process, and per request: the pipeline opens a request scope with
+`track_request`, calls made inside it (in any task) add to that request's
+usage, and finished requests are kept in a bounded list of recent requests.
+
+How each prompt's evidence fit its token budget (app.utils.prompt_budget:
+items included, truncated and dropped) is recorded per stage the same way.
+"""
+
+import contextvars
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from app.utils import metrics
+
+RECENT_REQUESTS = 100
+
+_request_usage = contextvars.ContextVar("llm_request_usage", default=None)
+_stage_totals = {}
+_budget_totals = {}
+_recent = deque(maxlen=RECENT_REQUESTS)
+
+
+def _empty_usage() -> dict:
+    return {"calls": 0, "errors": 0, "prompt_tokens": 0, "response_tokens": 0,
+            "estimated_prompt_tokens": 0, "seconds": 0.0}
+
+
+def _add(usage: dict, prompt_tokens: int, response_tokens: int, estimated: int, seconds: float, error: bool):
+    usage["calls"] += 1
+    usage["errors"] += 1 if error else 0
+    usage["prompt_tokens"] += prompt_tokens
+    usage["response_tokens"] += response_tokens
+    usage["estimated_prompt_tokens"] += estimated
+    usage["seconds"] += seconds
+
+
+def _empty_budget() -> dict:
+    return {"prompts": 0, "estimated_tokens": 0, "items": 0, "included": 0, "truncated": 0, "dropped": 0}
+
+
+def _add_budget(totals: dict, info: dict):
+    totals["prompts"] += 1
+    for key in ("estimated_tokens", "items", "included", "truncated", "dropped"):
+        totals[key] += info.get(key, 0)
+
+
+def record_prompt_budget(info: dict):
+    """
+    Records how one prompt fit its stage's token budget.
+
+    Args:
+        info: PromptBudget.info after `fit` (stage, budget, estimated_tokens,
+            items, included, truncated, dropped)
+    """
+    stage = info["stage"]
+    totals = _budget_totals.setdefault(stage, _empty_budget())
+    totals["budget"] = info.get("budget")
+    _add_budget(totals, info)
+
+    request = _request_usage.get()
+    if request is not None:
+        _add_budget(request["prompt_budgets"].setdefault(stage, _empty_budget()), info)
+
+
+def record(stage: str, response=None, estimated_prompt_tokens: int = 0, seconds: float = 0.0, error: bool = False):
+    """
+    Records one Gemini call.
+
+    Args:
+        stage: Pipeline stage that made the call
+        response: GenerateContentResponse (None if the call failed)
+        estimated_prompt_tokens: Local estimate of the prompt size
+        seconds: Call latency
+        error: The call raised
+    """
+    metadata = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(metadata, "prompt_token_count", 0) or 0
+    response_tokens = getattr(metadata, "candidates_token_count", 0) or 0
+
+    metrics.record_llm_call(stage, seconds, prompt_tokens, response_tokens, error)
+    _add(_stage_totals.setdefault(stage, _empty_usage()),
+         prompt_tokens, response_tokens, estimated_prompt_tokens, seconds, error)
+
+    request = _request_usage.get()
+    if request is not None:
+        _add(request["stages"].setdefault(stage, _empty_usage()),
+             prompt_tokens, response_tokens, estimated_prompt_tokens, seconds, error)
+
+
+@contextmanager
+def track_request(label: str):
+    """
+    Scope collecting the token usage of one verification request.
+
+    Args:
+        label: Request description kept with the usage (e.g. the claim)
+
+    Yields:
+        The request usage dictionary, filled in as calls complete
+    """
+    usage = {"label": label[:200], "started_at": time.time(), "stages": {}, "prompt_budgets": {}}
+    token = _request_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _request_usage.reset(token)
+        usage["total_tokens"] = sum(
+            stage["prompt_tokens"] + stage["response_tokens"] for stage in usage["stages"].values()
+        )
+        _recent.append(usage)
+
+
+def current_request_usage():
+    """
+    Usage dictionary of the enclosing request scope, or None.
+    """
+    return _request_usage.get()
+
+
+def usage_stats() -> dict:
+    """
+    Per-stage totals, prompt budget fit per stage and the most recent requests' usage.
+    """
+    stages = {}
+    for stage, usage in _stage_totals.items():
+        calls = usage["calls"]
+        stages[stage] = {
+            **usage,
+            "seconds": round(usage["seconds"], 3),
+            "avg_prompt_tokens": round(usage["prompt_tokens"] / calls, 1) if calls else 0,
+            "avg_response_tokens": round(usage["response_tokens"] / calls, 1) if calls else 0,
+            "avg_latency_ms": round(usage["seconds"] / calls * 1000, 1) if calls else 0,
+        }
+    prompt_budgets = {}
+    for stage, totals in _budget_totals.items():
+        prompts = totals["prompts"]
+        prompt_budgets[stage] = {
+            **totals,
+            "avg_estimated_tokens": round(totals["estimated_tokens"] / prompts, 1) if prompts else 0,
+            "avg_included": round(totals["included"] / prompts, 2) if prompts else 0,
+            "drop_rate": round(totals["dropped"] / totals["items"], 3) if totals["items"] else 0.0,
+            "truncation_rate": round(totals["truncated"] / totals["items"], 3) if totals["items"] else 0.0,
+        }
+    requests = list(_recent)
+    return {
+        "totals": {
+            "calls": sum(stage["calls"] for stage in _stage_totals.values()),
+            "prompt_tokens": sum(stage["prompt_tokens"] for stage in _stage_totals.values()),
+            "response_tokens": sum(stage["response_tokens"] for stage in _stage_totals.values()),
+        },
+        "stages": stages,
+        "prompt_budgets": prompt_budgets,
+        "requests_tracked": len(requests),
+        "avg_tokens_per_request": round(sum(r["total_tokens"] for r in requests) / len(requests), 1) if requests else 0,
+        "recent_requests": requests[-20:],
+    }
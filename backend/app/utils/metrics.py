@@ -0,0 +1,342 @@
+"""
+Latency and outcome metrics.
+
+Two views of the same timings:
+
+- Per request: every timer records (name, seconds) into the request's timing
+  list, which the HTTP middleware in main.py sends back as a `Server-Timing`
+  header, e.g. `extraction;dur=812.4, src-google_search;dur=403.0`.
+- Aggregated: timings and outcomes go into Prometheus histograms and
+  counters, served in the text exposition format at GET /metrics.
+
+The counter, gauge and histogram types below implement just the parts of the
+Prometheus data model that are needed here, with no client library.
+"""
+
+import asyncio
+import contextvars
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+_registry = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: dict = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in (extra or {}).items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels.
+
+    Args:
+        name: Metric name
+        documentation: HELP text
+        labels: Label names
+    """
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """
+    Value that goes up and down (queue depth, work in flight), with optional labels.
+
+    Args:
+        name: Metric name
+        documentation: HELP text
+        labels: Label names
+    """
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def set(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with optional labels.
+
+    Args:
+        name: Metric name
+        documentation: HELP text
+        labels: Label names
+        buckets: Upper bounds, ascending (+Inf is added)
+    """
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._series = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][index] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    cumulative += count
+                    labels = _format_labels(self.labels, key, {"le": _format_value(bound)})
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+def render_prometheus() -> str:
+    """
+    All metrics in the Prometheus text exposition format (version 0.0.4).
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUESTS = Counter(
+    "factcheck_http_requests_total", "HTTP requests handled", ("method", "path", "status"))
+HTTP_DURATION = Histogram(
+    "factcheck_http_request_duration_seconds", "HTTP request latency", ("method", "path"))
+STAGE_DURATION = Histogram(
+    "factcheck_stage_duration_seconds", "Latency of pipeline stages", ("stage",))
+STAGE_ERRORS = Counter(
+    "factcheck_stage_errors_total", "Pipeline stages that raised", ("stage",))
+SOURCE_DURATION = Histogram(
+    "factcheck_source_duration_seconds", "Latency of source lookups", ("source",))
+SOURCE_OUTCOMES = Counter(
+    "factcheck_source_outcomes_total",
+    "Source lookups by outcome (ok, empty, error, cached, coalesced, skipped, disabled)", ("source", "outcome"))
+LLM_DURATION = Histogram(
+    "factcheck_llm_call_duration_seconds", "Latency of Gemini calls", ("stage",))
+LLM_CALLS = Counter(
+    "factcheck_llm_calls_total", "Gemini calls by outcome", ("stage", "outcome"))
+LLM_TOKENS = Counter(
+    "factcheck_llm_tokens_total", "Gemini tokens reported by the API", ("stage", "kind"))
+VERIFICATIONS = Counter(
+    "factcheck_verifications_total", "Completed verifications by verdict and how they were answered",
+    ("verdict", "outcome"))
+VERIFICATION_DURATION = Histogram(
+    "factcheck_verification_duration_seconds", "End-to-end verification latency", ("verdict", "outcome"))
+TELEGRAM_UPDATES = Counter(
+    "factcheck_telegram_updates_total", "Telegram updates handled by kind (command, message, other)", ("kind",))
+TELEGRAM_UPDATE_DURATION = Histogram(
+    "factcheck_telegram_update_duration_seconds",
+    "Telegram update handling time, including waiting behind the chat's earlier updates", ("kind",))
+TELEGRAM_CHAT_BACKLOG = Gauge(
+    "factcheck_telegram_pending_updates", "Telegram updates received and not yet handled")
+TELEGRAM_VERIFICATIONS_RUNNING = Gauge(
+    "factcheck_telegram_verifications_running", "Telegram verifications holding a slot")
+TELEGRAM_VERIFICATIONS_QUEUED = Gauge(
+    "factcheck_telegram_verifications_queued", "Telegram verifications waiting for a slot")
+TELEGRAM_QUEUE_WAIT = Histogram(
+    "factcheck_telegram_queue_wait_seconds", "Time Telegram verifications waited for a slot")
+TELEGRAM_REJECTED = Counter(
+    "factcheck_telegram_rejected_total", "Telegram messages turned away (queue_full, chat_backlog)", ("reason",))
+
+
+@contextmanager
+def request_timing():
+    """
+    Collects the timings recorded while handling one request.
+
+    Yields:
+        List of (name, seconds) tuples, appended to as timers finish
+    """
+    timings = []
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def record_timing(name: str, seconds: float):
+    """
+    Adds a timing to the current request's Server-Timing list, if any.
+    """
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def server_timing_header(timings: list, total: float = None) -> str:
+    """
+    Formats timings as a Server-Timing header value (durations in ms).
+    """
+    entries = [
+        f"{re.sub(r'[^A-Za-z0-9_.-]', '-', name)};dur={seconds * 1000:.1f}"
+        for name, seconds in timings
+    ]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Times a pipeline stage into the stage histogram and the request timings.
+    Exceptions are counted as stage errors and re-raised.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(elapsed, stage=stage)
+        record_timing(stage, elapsed)
+
+
+def source_outcome(result) -> str:
+    """
+    Classifies a tool result as ok, empty, error, cached, coalesced or disabled.
+    """
+    if isinstance(result, dict) and result.get("disabled"):
+        return "disabled"
+    if not isinstance(result, dict):
+        return "error"
+    # A cached or shared negative result carries the original error but cost no lookup
+    if result.get("cached"):
+        return "cached"
+    if result.get("coalesced"):
+        return "coalesced"
+    if result.get("error"):
+        return "error"
+    return "ok" if result.get("results") or result.get("claims") else "empty"
+
+
+async def timed_source(source: str, coroutine):
+    """
+    Awaits a source lookup, recording its latency and outcome. A lookup
+    cancelled by the latency budget is counted as "skipped".
+
+    Args:
+        source: Source name used as the metric label
+        coroutine: The lookup coroutine
+
+    Returns:
+        The lookup's result
+    """
+    start = time.perf_counter()
+    try:
+        result = await coroutine
+    except asyncio.CancelledError:
+        SOURCE_OUTCOMES.inc(source=source, outcome="skipped")
+        record_timing(f"src-{source}", time.perf_counter() - start)
+        raise
+    except Exception:
+        SOURCE_OUTCOMES.inc(source=source, outcome="error")
+        SOURCE_DURATION.observe(time.perf_counter() - start, source=source)
+        raise
+
+    elapsed = time.perf_counter() - start
+    SOURCE_DURATION.observe(elapsed, source=source)
+    SOURCE_OUTCOMES.inc(source=source, outcome=source_outcome(result))
+    record_timing(f"src-{source}", elapsed)
+    return result
+
+
+def record_llm_call(stage: str, seconds: float, prompt_tokens: int, response_tokens: int, error: bool):
+    """
+    Records one Gemini call's latency, outcome and token counts.
+    """
+    LLM_DURATION.observe(seconds, stage=stage)
+    LLM_CALLS.inc(stage=stage, outcome="error" if error else "ok")
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, stage=stage, kind="prompt")
+    if response_tokens:
+        LLM_TOKENS.inc(response_tokens, stage=stage, kind="response")
+    record_timing(f"llm-{stage}", seconds)
+
+
+def record_verification(verdict: str, outcome: str, seconds: float):
+    """
+    Records a finished verification.
+
+    Args:
+        verdict: TRUE, FALSE, MISLEADING or UNVERIFIED
+        outcome: "pipeline", "cached", "near_duplicate" or "coalesced"
+        seconds: End-to-end latency
+    """
+    VERIFICATIONS.inc(verdict=verdict, outcome=outcome)
+    VERIFICATION_DURATION.observe(seconds, verdict=verdict, outcome=outcome)
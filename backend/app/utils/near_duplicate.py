@@ -0,0 +1,203 @@
+"""
+Near-duplicate claim index using MinHash signatures and LSH banding.
+
+Forwarded misinformation mutates slightly between copies (emoji, word order,
+"forward to all" padding), so exact-key caching misses most repeats. Claims are
+reduced to word shingles, summarised as MinHash signatures and bucketed by band,
+so a lookup only compares against the few claims sharing a bucket instead of
+scanning every claim with SequenceMatcher. Candidates are then confirmed with
+the similarity functions in app.utils.similarity, and rejected outright if they
+differ in numbers or negation ("50 killed" vs "5 killed", "is" vs "is not").
+"""
+
+import random
+import re
+import zlib
+from collections import OrderedDict, defaultdict
+
+from app.utils.similarity import normalize_for_similarity, hybrid_similarity, jaccard_similarity
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Padding commonly added to forwarded messages, removed before shingling
+BOILERPLATE_PATTERNS = [
+    r"\bforward(ed)? (this )?(to all|as received|to everyone)\b",
+    r"\bplease (share|forward)( this)?( with everyone| to all)?\b",
+    r"\bshare (this )?(with|to) (all|everyone|your friends)( and family)?\b",
+    r"\bmust (read|watch|share)\b",
+    r"\bviral (message|news|post)\b",
+    r"\bbreaking( news)?\b",
+    r"\burgent\b",
+]
+_BOILERPLATE_RE = re.compile("|".join(BOILERPLATE_PATTERNS))
+
+NEGATION_WORDS = {"not", "no", "never", "none", "nobody", "nothing", "neither", "nor",
+                  "isnt", "wasnt", "arent", "werent", "dont", "doesnt", "didnt",
+                  "cant", "cannot", "wont", "hasnt", "havent", "fake", "false", "hoax"}
+
+
+def canonicalize_claim(text: str) -> str:
+    """
+    Lowercases, strips punctuation/emoji and forwarding boilerplate.
+
+    Args:
+        text: Claim text
+
+    Returns:
+        Canonical text used for shingling and confirmation
+    """
+    text = normalize_for_similarity(text or "")
+    text = _BOILERPLATE_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def claim_similarity(text1: str, text2: str) -> float:
+    """
+    Confirmation score for two canonical claims.
+
+    Takes the better of hybrid_similarity (order-sensitive) and
+    jaccard_similarity (order-insensitive), and returns 0.0 when the claims
+    disagree on numbers or negation.
+    """
+    words1 = set(text1.split())
+    words2 = set(text2.split())
+    if {w for w in words1 if w.isdigit()} != {w for w in words2 if w.isdigit()}:
+        return 0.0
+    if (words1 & NEGATION_WORDS) != (words2 & NEGATION_WORDS):
+        return 0.0
+    return max(hybrid_similarity(text1, text2), jaccard_similarity(text1, text2))
+
+
+def shingles(text: str) -> set:
+    """
+    Word unigrams and bigrams of the canonical text.
+
+    Unigrams keep reordered claims similar; bigrams keep short claims with
+    different meanings apart.
+    """
+    words = canonicalize_claim(text).split()
+    result = set(words)
+    result.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return result
+
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash/LSH index mapping keys to claim texts.
+
+    Args:
+        num_perm: Number of MinHash permutations (signature length)
+        bands: Number of LSH bands; num_perm must be divisible by it
+        threshold: Minimum claim_similarity for a confirmed match
+        max_items: Oldest entries are dropped beyond this size
+        seed: Seed for the permutation coefficients
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.8,
+                 max_items: int = 100_000, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_items = max_items
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+        self._items = OrderedDict()  # key -> (canonical text, band hashes)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key) -> bool:
+        return key in self._items
+
+    def signature(self, text: str) -> list:
+        """
+        Computes the MinHash signature of a text.
+        """
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(text)]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def _band_hashes(self, signature: list) -> list:
+        rows = self.rows
+        return [hash(tuple(signature[i * rows:(i + 1) * rows])) for i in range(self.bands)]
+
+    def add(self, key, text: str):
+        """
+        Indexes a claim text under key, replacing any previous text for it.
+        """
+        if key in self._items:
+            self.remove(key)
+
+        band_hashes = self._band_hashes(self.signature(text))
+        for band, band_hash in enumerate(band_hashes):
+            self._buckets[band][band_hash].add(key)
+        self._items[key] = (canonicalize_claim(text), band_hashes)
+
+        while len(self._items) > self.max_items:
+            self.remove(next(iter(self._items)))
+
+    def remove(self, key) -> bool:
+        """
+        Drops key from the index. Returns True if it was present.
+        """
+        item = self._items.pop(key, None)
+        if item is None:
+            return False
+
+        for band, band_hash in enumerate(item[1]):
+            bucket = self._buckets[band].get(band_hash)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_hash]
+        return True
+
+    def candidates(self, text: str) -> set:
+        """
+        Keys sharing at least one LSH band with text (unconfirmed).
+        """
+        found = set()
+        for band, band_hash in enumerate(self._band_hashes(self.signature(text))):
+            found.update(self._buckets[band].get(band_hash, ()))
+        return found
+
+    def query(self, text: str, threshold: float = None, limit: int = 5) -> list:
+        """
+        Finds indexed claims similar to text.
+
+        Args:
+            text: Claim to look up
+            threshold: Minimum claim_similarity, defaults to the index threshold
+            limit: Maximum number of matches to return
+
+        Returns:
+            List of (key, similarity) tuples, best match first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        canonical = canonicalize_claim(text)
+        if not canonical:
+            return []
+
+        matches = []
+        for key in self.candidates(text):
+            score = claim_similarity(canonical, self._items[key][0])
+            if score >= threshold:
+                matches.append((key, score))
+
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
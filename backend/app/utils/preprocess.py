@@ -41,3 +41,42 @@ def normalize_text(text: str) -> str:
     text = re.sub(r'[^\w\s]', '', text)
     
     return text
+
+
+QUESTION_WORDS = {
+    "what", "why", "how", "who", "whom", "whose", "when", "where", "which",
+    "is", "are", "was", "were", "do", "does", "did", "can", "could", "will",
+    "would", "should", "has", "have", "had", "shall", "may", "might"
+}
+
+def is_declarative_claim(text: str, min_words: int = 4, max_words: int = 30) -> bool:
+    """
+    Checks whether input is already a short, single declarative sentence that
+    can be verified as-is without LLM claim extraction.
+    
+    Args:
+        text: Raw user input
+        min_words: Minimum number of words
+        max_words: Maximum number of words
+    
+    Returns:
+        True if the text needs no extraction
+    """
+    # Links, mentions and multi-line forwards need extraction
+    if not text or re.search(r'https?://|www\.|@|\n', text):
+        return False
+    
+    text = clean_text(text)
+    words = text.split()
+    if not (min_words <= len(words) <= max_words):
+        return False
+    
+    # Questions need rewriting into statements
+    if text.endswith("?") or words[0].lower().strip("'\"(") in QUESTION_WORDS:
+        return False
+    
+    # Multiple sentences and exclamations (emotional language) need extraction
+    if "!" in text or re.search(r'[.?;]\s+\S', text):
+        return False
+    
+    return True
@@ -0,0 +1,137 @@
+"""
+Token-budgeted prompt building.
+
+Every Gemini stage has a prompt token budget. Prompts are rendered from a
+template function around a list of evidence items (already in priority order):
+the fixed part is measured first, then items are added in order, each capped
+at a per-item size, until the remaining budget is used; lower-priority items
+that do not fit are dropped. Claims and other free text are cut with
+`truncate_to_tokens`.
+
+Token counts are estimated locally (no tokenizer call): roughly four
+characters per token for ASCII text and two for other scripts such as
+Devanagari. Actual counts are recorded from Gemini responses by
+app.utils.llm_usage, next to these estimates and to how the evidence fit.
+"""
+
+import math
+import os
+
+from app.utils import llm_usage
+
+STAGE_BUDGETS = {
+    "extraction": 600,
+    "analysis": 1500,
+    "fallback_analysis": 700,
+    "explanation": 1400,
+    "fused": 2000,
+}
+DEFAULT_BUDGET = 1500
+# Longest claim put in any prompt
+CLAIM_MAX_TOKENS = int(os.getenv("PROMPT_CLAIM_MAX_TOKENS", "150"))
+# Longest search-result snippet
+SNIPPET_MAX_TOKENS = int(os.getenv("PROMPT_SNIPPET_MAX_TOKENS", "80"))
+# Longest single evidence item (title + snippet + URL)
+ITEM_MAX_TOKENS = int(os.getenv("PROMPT_ITEM_MAX_TOKENS", "120"))
+
+
+def stage_budget(stage: str) -> int:
+    """
+    Prompt token budget of a stage, overridable with PROMPT_BUDGET_<STAGE>.
+    """
+    return int(os.getenv(f"PROMPT_BUDGET_{stage.upper()}", STAGE_BUDGETS.get(stage, DEFAULT_BUDGET)))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the token count of text without calling a tokenizer.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 2)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cuts text to about max_tokens, at a word boundary, marking the cut with "…".
+    """
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Binary search on the character length, then back off to a word boundary
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) < max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    cut = text[:low]
+    if " " in cut[len(cut) // 2:]:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip() + "…"
+
+
+class PromptBudget:
+    """
+    Builds one stage's prompt within its token budget.
+
+    Args:
+        stage: Stage name (see STAGE_BUDGETS)
+        budget: Token budget, defaults to the stage budget
+
+    After `fit`, `info` holds the budget, estimated tokens and how many items
+    were included, truncated or dropped; it is also recorded in
+    app.utils.llm_usage under the stage.
+    """
+
+    def __init__(self, stage: str, budget: int = None):
+        self.stage = stage
+        self.budget = budget if budget is not None else stage_budget(stage)
+        self.info = {"stage": stage, "budget": self.budget}
+
+    def fit(self, render, items: list = None, separator: str = "\n", max_item_tokens: int = ITEM_MAX_TOKENS) -> str:
+        """
+        Renders the prompt with as many evidence items as the budget allows.
+
+        Args:
+            render: Function `render(evidence_text) -> prompt`
+            items: Evidence strings, highest priority first
+            separator: Joins the included items
+            max_item_tokens: Cap for a single item
+
+        Returns:
+            The prompt
+        """
+        items = items or []
+        remaining = self.budget - estimate_tokens(render(""))
+
+        included = []
+        truncated = 0
+        for item in items:
+            cost = estimate_tokens(item)
+            was_truncated = cost > max_item_tokens
+            if was_truncated:
+                item = truncate_to_tokens(item, max_item_tokens)
+                cost = estimate_tokens(item)
+            if cost > remaining:
+                if remaining >= max_item_tokens // 2:
+                    # Keep a shortened version of the item rather than nothing
+                    included.append(truncate_to_tokens(item, remaining))
+                    truncated += 1
+                break
+            included.append(item)
+            truncated += was_truncated
+            remaining -= cost + estimate_tokens(separator)
+
+        prompt = render(separator.join(included))
+        self.info.update({
+            "estimated_tokens": estimate_tokens(prompt),
+            "items": len(items),
+            "included": len(included),
+            "truncated": truncated,
+            "dropped": len(items) - len(included),
+        })
+        llm_usage.record_prompt_budget(self.info)
+        return prompt
@@ -0,0 +1,320 @@
+"""
+Process-wide rate limiting of Gemini calls.
+
+Every Gemini call takes a slot from two token buckets before it is sent: one
+on requests per minute (GEMINI_RPM) and one on tokens per minute (GEMINI_TPM,
+charged with the estimated prompt size plus an expected response size, and
+corrected with the actual usage once the response arrives). Calls that do
+not fit wait in a priority queue:
+
+- "interactive": web requests (/api/verify, /api/verify/stream)
+- "telegram": Telegram bot messages
+- "batch": /api/verify/batch items and other background work
+
+Higher priorities are always served first. Each priority has a maximum
+queueing time after which the call fails with RateLimitTimeout instead of
+waiting forever. The priority of a call comes from the `llm_priority`
+context, so it follows the request into every task it starts.
+
+Quota (429) and server (5xx) errors are retried with exponential backoff
+and full jitter. A 429 also empties the request bucket so concurrent callers
+back off together.
+
+The Telegram bot runs in its own process and has its own limiter, so set
+GEMINI_RPM/GEMINI_TPM per process to a share of the project quota.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from google.api_core import exceptions as google_exceptions
+
+logger = logging.getLogger(__name__)
+
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))
+GEMINI_TPM = float(os.getenv("GEMINI_TPM", "250000"))
+# Response tokens charged up front, corrected once the actual usage is known
+EXPECTED_RESPONSE_TOKENS = int(os.getenv("GEMINI_EXPECTED_RESPONSE_TOKENS", "400"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "1.0"))
+RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "20.0"))
+
+PRIORITIES = {"interactive": 0, "telegram": 1, "batch": 2}
+DEFAULT_PRIORITY = "interactive"
+# Longest time a call may wait for a slot, per priority
+QUEUE_DEADLINES = {
+    "interactive": float(os.getenv("GEMINI_QUEUE_DEADLINE_INTERACTIVE", "20")),
+    "telegram": float(os.getenv("GEMINI_QUEUE_DEADLINE_TELEGRAM", "45")),
+    "batch": float(os.getenv("GEMINI_QUEUE_DEADLINE_BATCH", "180")),
+}
+WAIT_SAMPLES = 500
+
+RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.GatewayTimeout,
+)
+QUOTA_ERRORS = (google_exceptions.TooManyRequests, google_exceptions.ResourceExhausted)
+
+_priority = contextvars.ContextVar("llm_priority", default=DEFAULT_PRIORITY)
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a call waits longer than its priority's queue deadline."""
+    pass
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """
+    Runs the enclosed code (and tasks it creates) with the given LLM priority.
+
+    Args:
+        priority: One of "interactive", "telegram" or "batch"
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """
+    LLM priority of the current context.
+    """
+    return _priority.get()
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute / 60` tokens per second,
+    holding at most one minute's worth. The level may go negative when a call
+    turns out to use more than was charged.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """
+        Seconds until `amount` tokens are available (0 if they are now).
+        """
+        self._refill()
+        # A single call larger than the bucket only waits for a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+    def drain(self):
+        self._refill()
+        self.level = min(self.level, 0.0)
+
+
+class _Waiter:
+    __slots__ = ("priority", "tokens", "future", "enqueued_at")
+
+    def __init__(self, priority: str, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class GeminiRateLimiter:
+    """
+    Priority-queued request/token rate limiter shared by all Gemini calls.
+
+    Args:
+        rpm: Requests per minute
+        tpm: Tokens per minute (prompt + response)
+    """
+
+    def __init__(self, rpm: float = GEMINI_RPM, tpm: float = GEMINI_TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._queue = []
+        self._sequence = itertools.count()
+        self._dispatcher = None
+        self._wakeup = None
+        self._loop = None
+
+        self._granted = {priority: 0 for priority in PRIORITIES}
+        self._timeouts = {priority: 0 for priority in PRIORITIES}
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITIES}
+        self._retries = 0
+        self._quota_errors = 0
+        self._server_errors = 0
+
+    def _bind_loop(self):
+        # Queue state belongs to one event loop; start over on a new one
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._queue = []
+            self._dispatcher = None
+            self._wakeup = asyncio.Event()
+
+    async def acquire(self, tokens: int, priority: str = None):
+        """
+        Waits until a call of `tokens` tokens may be sent.
+
+        Args:
+            tokens: Tokens charged for the call
+            priority: Priority class, defaults to the current `llm_priority`
+
+        Raises:
+            RateLimitTimeout: The call waited longer than its queue deadline
+        """
+        priority = priority or current_priority()
+        self._bind_loop()
+
+        # Fast path: nobody is waiting and both buckets have room
+        if not self._queue and self.requests.time_until(1) == 0 and self.tokens.time_until(tokens) == 0:
+            self._grant(priority, tokens, 0.0)
+            return
+
+        waiter = _Waiter(priority, tokens, self._loop.create_future())
+        heapq.heappush(self._queue, (PRIORITIES[priority], next(self._sequence), waiter))
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), QUEUE_DEADLINES[priority])
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._timeouts[priority] += 1
+                raise RateLimitTimeout(
+                    f"Gemini call ({priority}) waited more than {QUEUE_DEADLINES[priority]:.0f}s for quota"
+                )
+        except asyncio.CancelledError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+            elif not waiter.future.cancelled():
+                # The slot was already granted but nobody will use it: give it back
+                self.requests.take(-1)
+                self.tokens.take(-waiter.tokens)
+            raise
+
+    def _grant(self, priority: str, tokens: int, waited: float):
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self._granted[priority] += 1
+        self._waits[priority].append(waited)
+
+    async def _dispatch(self):
+        # Grants queued calls in priority order as the buckets refill
+        while self._queue:
+            _, _, waiter = self._queue[0]
+            if waiter.future.done():
+                heapq.heappop(self._queue)
+                continue
+
+            wait = max(self.requests.time_until(1), self.tokens.time_until(waiter.tokens))
+            if wait > 0:
+                # Sleep until the head fits, or until a higher-priority call arrives
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._queue)
+            self._grant(waiter.priority, waiter.tokens, time.monotonic() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def settle(self, charged: int, used: int):
+        """
+        Corrects the token bucket once a call's actual usage is known.
+
+        Args:
+            charged: Tokens charged by `acquire`
+            used: Tokens actually used (prompt + response)
+        """
+        if used:
+            self.tokens.take(used - charged)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff for retry number `attempt` (from 0).
+        """
+        return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+    def record_retryable(self, error: Exception):
+        """
+        Counts a retryable error; quota errors also drain the request bucket.
+        """
+        self._retries += 1
+        if isinstance(error, QUOTA_ERRORS):
+            self._quota_errors += 1
+            self.requests.drain()
+        else:
+            self._server_errors += 1
+
+    def stats(self) -> dict:
+        """
+        Bucket levels, queue depth and wait times per priority.
+        """
+        depth = {priority: 0 for priority in PRIORITIES}
+        for _, _, waiter in self._queue:
+            if not waiter.future.done():
+                depth[waiter.priority] += 1
+
+        priorities = {}
+        for priority, waits in self._waits.items():
+            ordered = sorted(waits)
+            priorities[priority] = {
+                "queued": depth[priority],
+                "granted": self._granted[priority],
+                "timeouts": self._timeouts[priority],
+                "queue_deadline_s": QUEUE_DEADLINES[priority],
+                "avg_wait_ms": round(sum(ordered) / len(ordered) * 1000, 1) if ordered else 0,
+                "p95_wait_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 1) if ordered else 0,
+                "max_wait_ms": round(ordered[-1] * 1000, 1) if ordered else 0,
+            }
+
+        self.requests._refill()
+        self.tokens._refill()
+        return {
+            "rpm": self.requests.capacity,
+            "tpm": self.tokens.capacity,
+            "requests_available": round(self.requests.level, 2),
+            "tokens_available": round(self.tokens.level),
+            "queue_depth": sum(depth.values()),
+            "retries": self._retries,
+            "quota_errors": self._quota_errors,
+            "server_errors": self._server_errors,
+            "priorities": priorities,
+        }
+
+
+gemini_limiter = GeminiRateLimiter()
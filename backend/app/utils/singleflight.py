@@ -0,0 +1,134 @@
+"""
+Single-flight coalescing of identical concurrent work.
+
+When the same claim arrives many times within a second (a viral forward),
+none of the callers finds a cached answer yet and each would run the whole
+pipeline. A SingleFlight group runs the work once per key: the first caller
+(the leader) starts it in a task of its own, and callers arriving while it
+is still running await the same task.
+
+- The shared task is shielded: a caller that is cancelled (client
+  disconnect, source timeout) only stops waiting. The work is cancelled
+  once every caller has left.
+- Exceptions reach every caller. Nothing is remembered once the task ends,
+  so the next caller after a failure starts over.
+- Callers can subscribe to progress events published by the work. Events
+  published before a caller joined are replayed to it.
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters", "listeners", "events")
+
+    def __init__(self):
+        self.task = None
+        self.waiters = 0
+        self.listeners = []
+        self.events = []
+
+
+class SingleFlight:
+    """
+    Group of keyed in-flight calls.
+
+    Args:
+        name: Name shown in stats
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights = {}
+        self._leaders = 0
+        self._followers = 0
+        self._abandoned = 0
+
+    async def do(self, key, factory, listener=None) -> tuple:
+        """
+        Runs `factory(publish)` once for all concurrent callers with the same key.
+
+        Args:
+            key: Coalescing key
+            factory: Function `factory(publish) -> coroutine`, called by the
+                leader only. `publish(*event)` is an async function sending an
+                event to every subscribed caller.
+            listener: Optional async callback `listener(*event)` for this
+                caller. Exceptions it raises are logged and ignored.
+
+        Returns:
+            Tuple (result, shared): shared is False for the caller that ran
+            the work and True for callers that joined it
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self._followers += 1
+        else:
+            self._leaders += 1
+            flight = _Flight()
+            self._flights[key] = flight
+
+            async def publish(*event):
+                flight.events.append(event)
+                for subscriber in list(flight.listeners):
+                    await self._notify(subscriber, event)
+
+            flight.task = asyncio.create_task(factory(publish))
+            flight.task.add_done_callback(lambda task: self._finish(key, flight, task))
+
+        flight.waiters += 1
+        subscribed = False
+        try:
+            if listener is not None:
+                # Catch up on progress already reported, then subscribe
+                replayed = 0
+                while replayed < len(flight.events):
+                    await self._notify(listener, flight.events[replayed])
+                    replayed += 1
+                flight.listeners.append(listener)
+                subscribed = True
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # Last caller gone: nobody needs the result any more
+                self._abandoned += 1
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+            if subscribed:
+                flight.listeners.remove(listener)
+
+    async def _notify(self, listener, event: tuple):
+        if listener is None:
+            return
+        try:
+            await listener(*event)
+        except Exception as e:
+            logger.warning(f"{self.name} single-flight listener failed: {e}")
+
+    def _finish(self, key, flight: _Flight, task: asyncio.Task):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the exception as retrieved when every caller already left
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """
+        In-flight keys and how many calls ran or joined a running one.
+        """
+        total = self._leaders + self._followers
+        return {
+            "name": self.name,
+            "in_flight": len(self._flights),
+            "waiting": sum(flight.waiters for flight in self._flights.values()),
+            "executions": self._leaders,
+            "coalesced": self._followers,
+            "coalesced_ratio": round(self._followers / total, 3) if total else 0.0,
+            "abandoned": self._abandoned,
+        }
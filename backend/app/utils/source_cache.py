@@ -0,0 +1,116 @@
+"""
+Per-source result cache for the tools in app/tools.
+
+Each source gets its own TTLCache. Successful results are kept for the
+source's TTL; empty or failed results are cached for a short negative TTL so a
+broken or empty upstream is not re-queried on every claim, but recovers
+quickly. Keys are the normalized query, so near-identical cleaned claims share
+an entry. On a miss, identical queries already in flight to the same source
+are awaited instead of being sent again.
+"""
+
+import json
+import os
+from functools import wraps
+
+from app.utils.cache import TTLCache
+from app.utils.verdict_cache import claim_cache_key
+from app.utils.singleflight import SingleFlight
+from app.utils import tracing
+
+CACHE_ENABLED = os.getenv("SOURCE_CACHE_ENABLED", "true").lower() == "true"
+DEFAULT_NEGATIVE_TTL = float(os.getenv("SOURCE_CACHE_NEGATIVE_TTL", "60"))
+MAX_ENTRIES_PER_SOURCE = int(os.getenv("SOURCE_CACHE_MAX_ENTRIES", "2000"))
+
+_caches = {}
+_flights = {}
+
+
+def get_source_cache(source: str) -> TTLCache:
+    """
+    Returns the cache for a source, or raises KeyError if it is unknown.
+    """
+    return _caches[source]
+
+
+def all_source_caches() -> dict:
+    """
+    Returns all registered source caches keyed by source name.
+    """
+    return dict(_caches)
+
+
+def all_source_flights() -> dict:
+    """
+    Returns the in-flight query groups of all sources keyed by source name.
+    """
+    return dict(_flights)
+
+
+def is_negative(result: dict) -> bool:
+    """
+    True if a tool result is an error or carries no results.
+    """
+    if not isinstance(result, dict) or result.get("error"):
+        return True
+    return not (result.get("results") or result.get("claims"))
+
+
+def cached_source(source: str, ttl: float, negative_ttl: float = DEFAULT_NEGATIVE_TTL, key_func=None):
+    """
+    Decorator caching an async tool `tool(claim) -> dict` per normalized claim.
+
+    Args:
+        source: Source name, used for the cache name and inspection API
+        ttl: Seconds to keep non-empty results
+        negative_ttl: Seconds to keep empty or failed results
+        key_func: Optional function mapping the claim to a cache key, for
+            sources whose response does not depend on the claim
+
+    Returns:
+        The decorated coroutine function
+    """
+    cache = TTLCache(name=source, max_entries=MAX_ENTRIES_PER_SOURCE, default_ttl=ttl)
+    _caches[source] = cache
+    flights = SingleFlight(source)
+    _flights[source] = flights
+
+    def decorator(tool):
+        @wraps(tool)
+        async def wrapper(claim: str, *args, **kwargs):
+            with tracing.span(f"tool.{source}") as trace_span:
+                result = await cached_call(claim, *args, **kwargs)
+                trace_span.set(cached=bool(result.get("cached")), coalesced=bool(result.get("coalesced")),
+                               **tracing.result_count(result))
+                return result
+
+        async def cached_call(claim: str, *args, **kwargs):
+            if not CACHE_ENABLED:
+                return await tool(claim, *args, **kwargs)
+
+            key = key_func(claim) if key_func else claim_cache_key(claim)
+            cached = cache.get(key)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+            async def fetch(publish):
+                result = await tool(claim, *args, **kwargs)
+                if isinstance(result, dict) and result.get("circuit_open"):
+                    # Not an upstream answer; don't hide the source once it recovers
+                    return result
+                cache.set(
+                    key,
+                    result,
+                    ttl=negative_ttl if is_negative(result) else ttl,
+                    size=len(json.dumps(result, default=str))
+                )
+                return result
+
+            result, shared = await flights.do(key, fetch)
+            return {**result, "coalesced": True} if shared else result
+
+        wrapper.cache = cache
+        wrapper.flights = flights
+        return wrapper
+
+    return decorator
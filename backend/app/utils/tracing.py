@@ -0,0 +1,402 @@
+"""
+Lightweight local span tracing.
+
+A trace is opened per request (HTTP middleware, Telegram handler) with
+`start_trace`. Inside it, `span` / `traced` record nested spans for the
+pipeline, every agent, every tool and HTTP fetch, and every Gemini call. The
+parent of a span is whichever span was current when it started, carried in
+a context variable, so spans opened in tasks started with asyncio.gather or
+create_task nest correctly.
+
+All spans of a trace are collected in memory while the request runs. When
+the trace ends, one of these rules decides whether it is kept:
+
+- head sampling: TRACE_SAMPLE_RATE of traces, decided when the trace starts;
+- slow requests: the root span took at least TRACE_SLOW_MS;
+- failed requests: any span ended with an error.
+
+Kept traces go into an in-memory ring buffer (TRACE_BUFFER_SIZE, served by
+/api/traces) and, if TRACE_EXPORT_PATH is set, are appended to that JSONL
+file one trace per line, by a background thread so the write does not
+block the event loop. Outside a trace, spans cost nothing and record
+nothing.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import random
+import secrets
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "5000"))
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+# Spans beyond this per trace are counted but not recorded
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "500"))
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+_buffer = deque(maxlen=TRACE_BUFFER_SIZE)
+_export_lock = threading.Lock()
+# One worker keeps the exported lines in the order the traces finished
+_export_executor = None
+_counters = {"started": 0, "kept_sampled": 0, "kept_slow": 0, "kept_error": 0, "dropped": 0}
+
+
+class Span:
+    """
+    One timed operation in a trace.
+    """
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start", "_start_perf",
+                 "duration_ms", "attributes", "status", "error")
+
+    def __init__(self, trace, name: str, parent_id: str, attributes: dict):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self._start_perf = time.perf_counter()
+        self.duration_ms = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set(self, **attributes):
+        """
+        Adds attributes (result count, status code, bytes, tokens, ...).
+        """
+        self.attributes.update(attributes)
+
+    def fail(self, message: str):
+        """
+        Marks the span, and so its trace, as failed.
+        """
+        self.status = "error"
+        self.error = message[:500]
+        self.trace.failed = True
+
+    def finish(self, error: BaseException = None):
+        self.duration_ms = round((time.perf_counter() - self._start_perf) * 1000, 2)
+        if isinstance(error, asyncio.CancelledError):
+            # Sources dropped by the latency budget are expected, not failures
+            self.status = "cancelled"
+        elif error is not None:
+            self.fail(f"{type(error).__name__}: {error}")
+
+    def to_dict(self) -> dict:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            # Copied: a span still open in a leftover task may add attributes
+            # while the export thread serializes the record
+            "attributes": dict(self.attributes),
+        }
+
+
+class _NoopSpan:
+    # Stand-in outside a trace, so callers can always call set()
+    trace_id = None
+
+    def set(self, **attributes):
+        pass
+
+    def fail(self, message: str):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """
+    Spans of one request.
+    """
+
+    def __init__(self, name: str, sampled: bool):
+        self.trace_id = secrets.token_hex(16)
+        self.name = name
+        self.sampled = sampled
+        self.failed = False
+        self.spans = []
+        self.dropped_spans = 0
+
+    def to_dict(self) -> dict:
+        root = self.spans[0]
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start": root.start,
+            "duration_ms": root.duration_ms,
+            "status": "error" if self.failed else "ok",
+            "sampled": self.sampled,
+            "span_count": len(self.spans),
+            "dropped_spans": self.dropped_spans,
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+
+def _open_span(trace: Trace, name: str, attributes: dict):
+    if len(trace.spans) >= TRACE_MAX_SPANS:
+        trace.dropped_spans += 1
+        return None
+    parent = _current_span.get()
+    span = Span(trace, name, parent.span_id if parent is not None else None, attributes)
+    trace.spans.append(span)
+    return span
+
+
+@contextmanager
+def start_trace(name: str, enabled: bool = True, **attributes):
+    """
+    Opens a trace with its root span, and decides at the end whether to keep it.
+
+    Args:
+        name: Trace name, e.g. "POST /api/verify"
+        enabled: False to skip tracing this request
+        **attributes: Root span attributes
+
+    Yields:
+        The root span (a no-op span when tracing is disabled)
+    """
+    if not (TRACING_ENABLED and enabled):
+        yield _NOOP_SPAN
+        return
+
+    _counters["started"] += 1
+    trace = Trace(name, sampled=random.random() < TRACE_SAMPLE_RATE)
+    root = _open_span(trace, name, attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    error = None
+    try:
+        yield root
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        root.finish(error)
+        _finish_trace(trace)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Records a child span of the current span, if a trace is active.
+
+    Args:
+        name: Span name, e.g. "tool.google_search"
+        **attributes: Initial attributes
+
+    Yields:
+        The span, for adding attributes with `set`
+    """
+    trace = _current_trace.get()
+    current = _open_span(trace, name, attributes) if trace is not None else None
+    if current is None:
+        yield _NOOP_SPAN
+        return
+
+    token = _current_span.set(current)
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish(error)
+
+
+def annotate(**attributes):
+    """
+    Adds attributes to the current span, if any.
+    """
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def traced(name: str, attributes=None):
+    """
+    Decorator recording each call of a function (sync or async) as a span.
+
+    Args:
+        name: Span name
+        attributes: Optional function `attributes(result) -> dict` adding
+            attributes from the return value (e.g. result counts)
+    """
+    def annotate_result(current, result):
+        if attributes is not None:
+            try:
+                current.set(**attributes(result))
+            except Exception:
+                pass
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                with span(name) as current:
+                    result = await func(*args, **kwargs)
+                    annotate_result(current, result)
+                    return result
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with span(name) as current:
+                    result = func(*args, **kwargs)
+                    annotate_result(current, result)
+                    return result
+        return wrapper
+    return decorator
+
+
+def result_count(result) -> dict:
+    """
+    Span attributes of a tool result: result count and error, if any.
+    """
+    if not isinstance(result, dict):
+        return {}
+    attributes = {"results": len(result.get("results") or result.get("claims") or [])}
+    if result.get("error"):
+        attributes["error"] = str(result["error"])[:200]
+    return attributes
+
+
+def _finish_trace(trace: Trace):
+    duration = trace.spans[0].duration_ms
+    if trace.failed:
+        reason = "error"
+    elif duration >= TRACE_SLOW_MS:
+        reason = "slow"
+    elif trace.sampled:
+        reason = "sampled"
+    else:
+        _counters["dropped"] += 1
+        return
+
+    _counters[f"kept_{reason}"] += 1
+    record = trace.to_dict()
+    record["kept_because"] = reason
+    _buffer.append(record)
+    if TRACE_EXPORT_PATH:
+        _get_export_executor().submit(_export, record)
+
+
+def _get_export_executor() -> ThreadPoolExecutor:
+    global _export_executor
+    if _export_executor is None:
+        _export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-export")
+    return _export_executor
+
+
+def _export(record: dict):
+    try:
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with _export_lock:
+            with open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except OSError as e:
+        logger.warning(f"Trace export to {TRACE_EXPORT_PATH} failed: {e}")
+
+
+def shutdown():
+    """
+    Writes the traces still queued for export and stops the export thread.
+    """
+    global _export_executor
+    if _export_executor is not None:
+        _export_executor.shutdown(wait=True)
+        _export_executor = None
+
+
+def critical_path(trace: dict) -> list:
+    """
+    Follows, from the root, the child span that finished last at each level:
+    the chain of operations that determined the request's latency.
+
+    Args:
+        trace: Trace dictionary as kept in the buffer
+
+    Returns:
+        List of {"name", "duration_ms", "span_id"} from the root down
+    """
+    children = {}
+    for item in trace["spans"]:
+        children.setdefault(item["parent_id"], []).append(item)
+
+    path = []
+    current = trace["spans"][0]
+    while current is not None:
+        path.append({"name": current["name"], "duration_ms": current["duration_ms"], "span_id": current["span_id"]})
+        finished = [child for child in children.get(current["span_id"], []) if child["duration_ms"] is not None]
+        current = max(finished, key=lambda child: child["start"] + child["duration_ms"] / 1000, default=None)
+    return path
+
+
+def recent_traces(limit: int = 50, status: str = None, min_duration_ms: float = None) -> list:
+    """
+    Summaries of the most recent kept traces, newest first.
+    """
+    summaries = []
+    for record in reversed(_buffer):
+        if status and record["status"] != status:
+            continue
+        if min_duration_ms is not None and record["duration_ms"] < min_duration_ms:
+            continue
+        summaries.append({key: value for key, value in record.items() if key != "spans"})
+        if len(summaries) >= limit:
+            break
+    return summaries
+
+
+def get_trace(trace_id: str):
+    """
+    A kept trace with its spans and critical path, or None.
+    """
+    for record in _buffer:
+        if record["trace_id"] == trace_id:
+            return {**record, "critical_path": critical_path(record)}
+    return None
+
+
+def tracing_stats() -> dict:
+    """
+    Tracing configuration and how many traces were kept or dropped.
+    """
+    return {
+        "enabled": TRACING_ENABLED,
+        "sample_rate": TRACE_SAMPLE_RATE,
+        "slow_ms": TRACE_SLOW_MS,
+        "buffered": len(_buffer),
+        "buffer_size": TRACE_BUFFER_SIZE,
+        "export_path": TRACE_EXPORT_PATH or None,
+        **_counters,
+    }
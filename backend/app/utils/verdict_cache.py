@@ -0,0 +1,137 @@
+"""
+Claim-level verdict cache.
+
+Viral claims arrive many times during a crisis. Finished VerifyResponses are
+cached under the normalized claim text so repeats skip the Gemini calls and
+upstream fetches entirely. UNVERIFIED verdicts get a shorter TTL because new
+fact-checks for them are likely to appear soon.
+
+Extracted claims of cached verdicts are also kept in a near-duplicate index, so
+a slightly mutated copy of a known claim can reuse its verdict after extraction.
+A reused verdict is cached for its own submission only until the original
+expires, and is not indexed itself, so a chain of mutated copies cannot keep a
+stale verdict alive.
+"""
+
+import os
+
+from app.models.response_model import VerifyResponse, VerdictType
+from app.utils.cache import TTLCache
+from app.utils.near_duplicate import NearDuplicateIndex
+from app.utils.preprocess import normalize_text
+
+VERDICT_TTLS = {
+    VerdictType.TRUE: float(os.getenv("VERDICT_CACHE_TTL", "21600")),
+    VerdictType.FALSE: float(os.getenv("VERDICT_CACHE_TTL", "21600")),
+    VerdictType.MISLEADING: float(os.getenv("VERDICT_CACHE_TTL", "21600")),
+    VerdictType.UNVERIFIED: float(os.getenv("VERDICT_CACHE_UNVERIFIED_TTL", "600")),
+}
+
+verdict_cache = TTLCache(
+    name="verdicts",
+    max_entries=int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", "5000")),
+    max_bytes=int(os.getenv("VERDICT_CACHE_MAX_BYTES", "50000000")),
+)
+
+near_duplicate_index = NearDuplicateIndex(
+    threshold=float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8")),
+    max_items=int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", "5000")),
+)
+NEAR_DUPLICATE_ENABLED = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true"
+
+
+def claim_cache_key(claim: str) -> str:
+    """
+    Builds the cache key for a claim: lowercase, no punctuation, single spaces.
+
+    Args:
+        claim: Raw claim text
+
+    Returns:
+        Normalized claim text
+    """
+    return " ".join(normalize_text(claim).split())
+
+
+def get_cached_verdict(claim: str):
+    """
+    Looks up a previously verified claim.
+
+    Args:
+        claim: Raw claim text as submitted by the user
+
+    Returns:
+        The cached VerifyResponse with original_claim set to this submission,
+        or None on a miss
+    """
+    key = claim_cache_key(claim)
+    if not key:
+        return None
+
+    response = verdict_cache.get(key)
+    if response is None:
+        return None
+
+    return response.model_copy(update={"original_claim": claim})
+
+
+def cache_verdict(claim: str, response: VerifyResponse, ttl: float = None, index: bool = True):
+    """
+    Stores a finished verification, with a TTL chosen by its verdict.
+
+    Args:
+        claim: Raw claim text as submitted by the user
+        response: The completed VerifyResponse
+        ttl: Seconds to keep it, overriding the verdict's TTL
+        index: Also add it to the near-duplicate index
+    """
+    key = claim_cache_key(claim)
+    if not key:
+        return
+
+    if ttl is None:
+        # Verdicts reached with sources skipped for latency are refreshed sooner
+        if response.skipped_sources:
+            ttl = VERDICT_TTLS[VerdictType.UNVERIFIED]
+        else:
+            ttl = VERDICT_TTLS.get(response.verdict, verdict_cache.default_ttl)
+
+    verdict_cache.set(
+        key,
+        response,
+        ttl=ttl,
+        size=len(response.model_dump_json())
+    )
+    if index and NEAR_DUPLICATE_ENABLED and key in verdict_cache:
+        near_duplicate_index.add(key, response.extracted_claim)
+
+
+def find_near_duplicate_verdict(claim: str, extracted_claim: str):
+    """
+    Looks for a cached verdict whose extracted claim is a near-duplicate.
+
+    Args:
+        claim: Raw claim text as submitted by the user
+        extracted_claim: Claim extracted from this submission
+
+    Returns:
+        Tuple (VerifyResponse adapted to this submission, seconds until the
+        matched verdict expires), or None
+    """
+    if not NEAR_DUPLICATE_ENABLED:
+        return None
+
+    for key, score in near_duplicate_index.query(extracted_claim):
+        response = verdict_cache.get(key)
+        remaining_ttl = verdict_cache.ttl_remaining(key)
+        if response is None or remaining_ttl is None:
+            # Verdict expired or was evicted; drop the stale index entry
+            near_duplicate_index.remove(key)
+            continue
+
+        return response.model_copy(update={
+            "original_claim": claim,
+            "extracted_claim": extracted_claim
+        }), remaining_ttl
+
+    return None
@@ -0,0 +1,113 @@
+"""
+Size and query latency of the local fact-check index (app/tools/factcheck_index.py).
+
+Builds a FactCheckIndex of synthetic fact-check articles in a temporary
+file, reports the build rate and the on-disk size, then times searches for
+forwarded copies of indexed claims (should hit), for unseen claims and for
+short queries made of very common words. The synthetic vocabulary is small,
+so unseen claims usually share enough keywords with some indexed article to
+match: they time the path with many candidates rather than a clean miss.
+
+    cd backend
+    python -m loadtest.factcheck_index_bench
+    python -m loadtest.factcheck_index_bench --articles 20000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from app.tools.factcheck_index import FactCheckIndex
+from loadtest.near_duplicate_bench import make_claims, mutate
+
+TITLE_TEMPLATES = ["Fake message claims {claim}", "Fact Check: No, {claim}", "Viral post falsely says {claim}",
+                   "{claim}? The claim is misleading", "Did {claim}? Here is the truth"]
+SOURCES = ["pib_factcheck", "altnews", "boom", "factly", "vishvas"]
+FILLER = ("The message has been shared widely on WhatsApp and Facebook. Our team contacted the officials concerned, "
+          "who denied issuing any such order. Similar claims have circulated before and were debunked.")
+COMMON_QUERIES = ["government Mumbai", "RBI notes", "free from next month", "Delhi police", "India nationwide"]
+
+
+def make_articles(claims: list, rng: random.Random) -> list:
+    """
+    One fact-check article per claim, in the shape the scrapers index.
+    """
+    return [
+        {
+            "url": f"https://factcheck.example/{number}",
+            "title": rng.choice(TITLE_TEMPLATES).format(claim=claim),
+            "snippet": f"{claim}. {FILLER}",
+            "source": rng.choice(SOURCES),
+            "verdict": "FALSE",
+        }
+        for number, claim in enumerate(claims)
+    ]
+
+
+def time_searches(index: FactCheckIndex, queries: list) -> tuple:
+    latencies = []
+    hits = 0
+    for query in queries:
+        start = time.perf_counter()
+        results = index.search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += bool(results)
+    return latencies, hits
+
+
+def summarize(latencies: list) -> str:
+    ordered = sorted(latencies)
+    p = lambda fraction: ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return (f"mean {statistics.mean(ordered):.2f} ms  p50 {p(0.5):.2f} ms  "
+            f"p95 {p(0.95):.2f} ms  p99 {p(0.99):.2f} ms")
+
+
+def database_bytes(path: str) -> int:
+    # WAL mode keeps recent pages in the -wal file until a checkpoint
+    return sum(os.path.getsize(path + suffix) for suffix in ("", "-wal") if os.path.exists(path + suffix))
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Benchmark the fact-check index")
+    parser.add_argument("--articles", type=int, default=100_000, help="Articles to index")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries of each kind (copies, unseen)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Articles written per transaction")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    claims = make_claims(args.articles + args.queries, args.seed)
+    rng.shuffle(claims)
+    indexed, unseen = claims[:args.articles], claims[args.articles:]
+    articles = make_articles(indexed, rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "factcheck_index.sqlite3")
+        index = FactCheckIndex(path)
+
+        start = time.perf_counter()
+        for i in range(0, len(articles), args.batch_size):
+            index.upsert_many(articles[i:i + args.batch_size])
+        build = time.perf_counter() - start
+        size = database_bytes(path)
+        print(f"Indexed {len(articles)} articles in {build:.1f}s ({build / len(articles) * 1e6:.0f} us per article)")
+        print(f"Database: {size / 1e6:.1f} MB ({size / len(articles):.0f} bytes per article)")
+
+        copies = [mutate(claim, rng) for claim in rng.sample(indexed, args.queries)]
+        latencies, hits = time_searches(index, copies)
+        print(f"Forwarded copies: {summarize(latencies)}  hits {hits}/{len(copies)}")
+
+        latencies, hits = time_searches(index, unseen)
+        print(f"Unseen claims:    {summarize(latencies)}  matched {hits}/{len(unseen)}")
+
+        latencies, hits = time_searches(index, COMMON_QUERIES * max(1, args.queries // 50))
+        print(f"Common words:     {summarize(latencies)}  hits {hits}/{len(latencies)}")
+
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
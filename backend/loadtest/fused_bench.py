@@ -0,0 +1,153 @@
+"""
+Latency and token cost of the fused analysis+explanation mode against the
+two-call path (analyze_with_gemini, then generate_explanation).
+
+Both paths run on the same claims and the same evidence, and
+determine_verdict is applied in between, as in the pipeline. Token counts
+come from the usage metadata Gemini returns (app.utils.llm_usage).
+
+By default Gemini is the local stand-in (loadtest/standins.py): its latency
+is synthetic and it counts about four characters per token, so the
+comparison shows what one call instead of two saves under those
+assumptions. With --live the real API is called (needs GEMINI_API_KEY and
+uses quota).
+
+    cd backend
+    python -m loadtest.fused_bench
+    python -m loadtest.fused_bench --live --claims 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from loadtest.run import BASE_CLAIMS
+from loadtest.standins import StandinServer, fake_items, add_profile_arguments, apply_profile_options, default_profiles
+
+
+def build_verification_results(claim: str) -> dict:
+    """
+    Source results as verify_claim collects them, from the stand-in's deterministic items.
+    """
+    indian = [{**item, "url": f"https://www.altnews.in/{item['slug']}/", "source": "Alt News",
+               "verdict": "FALSE", "credibility": "high"} for item in fake_items(claim + " altnews")]
+    indian += [{**item, "url": f"https://www.boomlive.in/{item['slug']}", "source": "BOOM Live",
+                "verdict": "FALSE", "credibility": "high"} for item in fake_items(claim + " boom")]
+    google = [{**item, "url": f"https://news.example/{item['slug']}", "displayLink": "news.example"}
+              for item in fake_items(claim + " google")]
+    fact_checks = [{"text": claim, "claimant": "Social media", "claimReview": item["title"], "rating": "False",
+                    "publisher": "Factly", "url": f"https://factly.in/{item['slug']}/", "reviewDate": "2025-01-01"}
+                   for item in fake_items(claim + " factcheck", 3)]
+    return {
+        "claim": claim,
+        "cleaned_claim": claim,
+        "fact_check_api": {"claims": fact_checks},
+        "indian_factcheckers": {"results": indian},
+        "google_search": {"results": google},
+        "web_scraper": {"results": []},
+        "news_api": {"results": []},
+        "skipped_sources": [],
+    }
+
+
+async def run_claim(claim: str, fused: bool) -> dict:
+    """
+    Analysis, verdict and explanation for one claim; returns latency and token usage.
+    """
+    from app.agents.research_agent import analyze_with_gemini
+    from app.agents.fused_agent import analyze_and_explain
+    from app.agents.verdict_agent import determine_verdict
+    from app.agents.explanation_agent import generate_explanation, explanation_from_fused
+    from app.utils import llm_usage
+    from app.utils.evidence import rank_evidence
+
+    verification_results = build_verification_results(claim)
+    evidence = (verification_results["indian_factcheckers"]["results"]
+                + verification_results["google_search"]["results"])
+    ranked, _ = rank_evidence(claim, evidence)
+
+    with llm_usage.track_request(claim) as usage:
+        start = time.perf_counter()
+        if fused:
+            verification_results["ai_analysis"] = await analyze_and_explain(claim, ranked)
+        else:
+            verification_results["ai_analysis"] = await analyze_with_gemini(claim, ranked)
+        verdict_data = determine_verdict(verification_results)
+        explain = explanation_from_fused if fused else generate_explanation
+        await explain(claim, claim, verification_results, verdict_data)
+        elapsed = time.perf_counter() - start
+
+    stages = usage["stages"].values()
+    return {
+        "seconds": elapsed,
+        "calls": sum(stage["calls"] for stage in stages),
+        "prompt_tokens": sum(stage["prompt_tokens"] for stage in stages),
+        "response_tokens": sum(stage["response_tokens"] for stage in stages),
+        "verdict": verdict_data["verdict"].value,
+    }
+
+
+def summarize(runs: list) -> dict:
+    latencies = sorted(run["seconds"] * 1000 for run in runs)
+    return {
+        "calls": statistics.mean(run["calls"] for run in runs),
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "prompt_tokens": statistics.mean(run["prompt_tokens"] for run in runs),
+        "response_tokens": statistics.mean(run["response_tokens"] for run in runs),
+    }
+
+
+async def benchmark(args) -> dict:
+    claims = (BASE_CLAIMS * (args.claims // len(BASE_CLAIMS) + 1))[:args.claims]
+    results = {}
+    for mode, fused in (("two-call", False), ("fused", True)):
+        runs = []
+        for claim in claims:
+            runs.append(await run_claim(claim, fused))
+        results[mode] = summarize(runs)
+    return results
+
+
+async def main_async(args) -> dict:
+    server = None
+    if not args.live:
+        server = StandinServer(apply_profile_options(default_profiles(), args.latency, args.error_rate))
+        await server.start("127.0.0.1", args.standin_port)
+    try:
+        return await benchmark(args)
+    finally:
+        if server is not None:
+            await server.stop()
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Compare fused and two-call Gemini analysis")
+    parser.add_argument("--claims", type=int, default=20, help="Claims per mode")
+    parser.add_argument("--live", action="store_true", help="Call the real Gemini API")
+    parser.add_argument("--standin-port", type=int, default=8902)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not args.live:
+        # gemini_client reads these when first imported
+        os.environ["GEMINI_API_ENDPOINT"] = f"http://127.0.0.1:{args.standin_port}"
+        os.environ.setdefault("GEMINI_API_KEY", "loadtest")
+
+    results = asyncio.run(main_async(args))
+
+    print(f"\n{'mode':<10}{'calls':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'prompt tok':>12}{'resp tok':>10}")
+    for mode, stats in results.items():
+        print(f"{mode:<10}{stats['calls']:>7.1f}{stats['mean_ms']:>10.0f}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}"
+              f"{stats['prompt_tokens']:>12.0f}{stats['response_tokens']:>10.0f}")
+    two_call, fused = results["two-call"], results["fused"]
+    for key, label in (("mean_ms", "latency"), ("prompt_tokens", "prompt tokens"), ("response_tokens", "response tokens")):
+        if two_call[key]:
+            print(f"Fused saves {1 - fused[key] / two_call[key]:.0%} {label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Lookup latency of the near-duplicate claim index at 100k indexed claims.
+
+Builds a NearDuplicateIndex over synthetic claims, then times queries for
+mutated copies of indexed claims (emoji, reordered words, forwarding
+boilerplate: should match) and for unseen claims (should not). A linear scan
+with claim_similarity over every indexed claim, the alternative the index
+replaces, is timed on a few queries for comparison.
+
+    cd backend
+    python -m loadtest.near_duplicate_bench
+    python -m loadtest.near_duplicate_bench --claims 20000 --queries 500 --scan-queries 0
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app.utils.near_duplicate import NearDuplicateIndex, canonicalize_claim, claim_similarity
+
+SUBJECTS = ["The RBI", "The Election Commission", "Indian Railways", "The health ministry", "The Mumbai police",
+            "The state government", "The Supreme Court", "ISRO", "The income tax department", "BMC",
+            "The central government", "UIDAI", "The finance ministry", "SEBI", "The education board",
+            "WHO", "The army", "Air India", "The Delhi government", "NITI Aayog"]
+ACTIONS = ["is withdrawing", "has banned", "will make free", "is shutting down", "has announced a fine on",
+           "is tracking", "has approved", "will close", "is giving away", "has cancelled",
+           "is launching", "has doubled the price of", "will privatise", "is recalling", "has suspended"]
+OBJECTS = ["500 rupee notes", "WhatsApp group calls", "local train passes", "paracetamol tablets", "Aadhaar updates",
+           "petrol subsidies", "college entrance exams", "mobile recharges", "gold imports", "bank lockers",
+           "school holidays", "cooking gas cylinders", "metro tickets", "ration cards", "senior citizen pensions",
+           "airport lounges", "UPI payments", "driving licences", "toll plazas", "solar panels"]
+PLACES = ["in Mumbai", "in Pune", "across Maharashtra", "in Delhi", "nationwide", "in Chennai", "in Kolkata",
+          "in Bengaluru", "in Hyderabad", "in Gujarat", "in Kerala", "in rural areas", "in all metros",
+          "in Uttar Pradesh", "in Assam"]
+WHEN = ["from next month", "starting Monday", "this week", "after the elections", "from April 1",
+        "by the end of the year", "with immediate effect", "during the monsoon", "from tomorrow", "for 30 days"]
+PADDING = ["Forward to all!", "Please share with everyone", "BREAKING:", "🚨🚨", "Must read.", "viral message:",
+           "Urgent!!", "😱"]
+
+
+def make_claims(count: int, seed: int) -> list:
+    """
+    `count` distinct synthetic claims.
+    """
+    rng = random.Random(seed)
+    claims = set()
+    while len(claims) < count:
+        claims.add(f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} {rng.choice(OBJECTS)} "
+                   f"{rng.choice(PLACES)} {rng.choice(WHEN)} {rng.randint(2, 9999)}")
+    return sorted(claims)
+
+
+def mutate(claim: str, rng: random.Random) -> str:
+    """
+    A forwarded copy: padding, emoji and changed case, sometimes a swapped phrase order.
+    """
+    words = claim.split()
+    if rng.random() < 0.5 and len(words) > 6:
+        words = words[-3:] + words[:-3]
+    text = " ".join(words)
+    if rng.random() < 0.5:
+        text = text.upper()
+    return f"{rng.choice(PADDING)} {text} {rng.choice(PADDING)}"
+
+
+def time_queries(index: NearDuplicateIndex, queries: list) -> tuple:
+    latencies = []
+    found = 0
+    candidates = 0
+    for query in queries:
+        start = time.perf_counter()
+        matches = index.query(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found += bool(matches)
+        candidates += len(index.candidates(query))
+    return latencies, found, candidates / len(queries)
+
+
+def summarize(latencies: list) -> str:
+    ordered = sorted(latencies)
+    p = lambda fraction: ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return (f"mean {statistics.mean(ordered):.3f} ms  p50 {p(0.5):.3f} ms  "
+            f"p95 {p(0.95):.3f} ms  p99 {p(0.99):.3f} ms")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate claim lookups")
+    parser.add_argument("--claims", type=int, default=100_000, help="Claims to index")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries of each kind (copies, unseen)")
+    parser.add_argument("--scan-queries", type=int, default=3, help="Queries timed with a linear scan (0 = skip)")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    claims = make_claims(args.claims + args.queries, args.seed)
+    rng.shuffle(claims)
+    indexed, unseen = claims[:args.claims], claims[args.claims:]
+
+    index = NearDuplicateIndex(threshold=args.threshold, max_items=args.claims)
+    start = time.perf_counter()
+    for number, claim in enumerate(indexed):
+        index.add(number, claim)
+    build = time.perf_counter() - start
+    print(f"Indexed {len(index)} claims in {build:.1f}s ({build / len(index) * 1e6:.0f} us per claim)")
+
+    copies = [mutate(claim, rng) for claim in rng.sample(indexed, args.queries)]
+    latencies, found, candidates = time_queries(index, copies)
+    print(f"Mutated copies: {summarize(latencies)}  matched {found}/{len(copies)}  "
+          f"avg candidates {candidates:.1f}")
+
+    latencies, found, candidates = time_queries(index, unseen)
+    print(f"Unseen claims:  {summarize(latencies)}  false matches {found}/{len(unseen)}  "
+          f"avg candidates {candidates:.1f}")
+
+    if args.scan_queries:
+        canonical = [canonicalize_claim(claim) for claim in indexed]
+        scans = []
+        for query in copies[:args.scan_queries]:
+            text = canonicalize_claim(query)
+            start = time.perf_counter()
+            max(claim_similarity(text, other) for other in canonical)
+            scans.append((time.perf_counter() - start) * 1000)
+        print(f"Linear scan over {len(canonical)} claims: mean {statistics.mean(scans):.0f} ms per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Microbenchmarks of the parse-and-structure paths on recorded fixtures.
+
+For every fixture in a set recorded with app.utils.http_replay, the parser
+of the source it belongs to is timed on the recorded body: the spec-driven
+parse of each fact-checker site, the DuckDuckGo page parser, and the JSON
+structuring of the Fact Check, Custom Search and NewsAPI responses. The
+similarity functions in app/utils/similarity are timed on the parsed titles
+and snippets against a set of claims.
+
+Each benchmark reports the median time per call and, for parsers, how many
+items came out. Against a saved baseline, the run fails (exit code 1) when a
+median is slower than the baseline by more than --tolerance, or when a
+parser that used to find items finds none, which usually means the site's
+markup changed.
+
+By default it runs on fixtures/http/sample, a small set committed with the
+repo (one page or response per source for the claim "500 rupee notes"),
+against loadtest/parser_baseline.json. tests/test_parser_bench.py runs it
+on that set, checking the item counts but not the timings.
+
+    cd backend
+    python -m loadtest.parser_bench --check
+    python -m loadtest.parser_bench --fixtures fixtures/http/2025-06 --save-baseline
+    python -m loadtest.parser_bench --fixtures fixtures/http/2025-06 --check
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+from app.utils.http_replay import FixtureStore
+from app.utils.similarity import calculate_similarity, hybrid_similarity, jaccard_similarity, normalize_for_similarity
+from app.tools.google_factcheck import parse_fact_check_claims
+from app.tools.google_search import parse_search_items
+from app.tools.web_scraper import parse_duckduckgo, parse_news_articles
+from app.tools.scraping_engine import parse_factchecks
+from app.tools.indian_factcheckers import FACTCHECKER_SPECS
+from loadtest.run import BASE_CLAIMS
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, "fixtures", "http", "sample")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "parser_baseline.json")
+
+JSON_PARSERS = {
+    "factchecktools.googleapis.com": ("fact_check_api", parse_fact_check_claims),
+    "www.googleapis.com": ("google_search", parse_search_items),
+    "newsapi.org": ("news_api", parse_news_articles),
+}
+
+
+def parser_for(key: str):
+    """
+    (benchmark name, parse(body) -> list) for a fixture key, or None.
+    """
+    url = key.split(" ", 1)[1]
+    host = urlsplit(url).netloc
+    if host in JSON_PARSERS:
+        name, parse = JSON_PARSERS[host]
+        return name, lambda body: parse(json.loads(body))
+    if host == "html.duckduckgo.com":
+        return "duckduckgo", parse_duckduckgo
+    for spec in FACTCHECKER_SPECS:
+        if urlsplit(spec.url_template).netloc == host:
+            return spec.key, lambda body, spec=spec: parse_factchecks(body, spec)
+    return None
+
+
+def time_call(func, rounds: int, min_seconds: float) -> float:
+    """
+    Median seconds per call of func() over `rounds` rounds, each repeating
+    the call until it ran for at least `min_seconds`.
+    """
+    func()  # warm-up
+    samples = []
+    for _ in range(rounds):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+        samples.append(elapsed / calls)
+    return statistics.median(samples)
+
+
+def run_benchmarks(store: FixtureStore, rounds: int, min_seconds: float) -> dict:
+    """
+    Times every parser on its fixtures and the similarity functions on the
+    parsed texts.
+
+    Returns:
+        {benchmark name: {"median_us", "items", "fixtures"}}
+    """
+    bodies = {}
+    for fixture in store.all():
+        found = parser_for(fixture["key"])
+        if found is None or fixture["response"]["status"] != 200:
+            continue
+        name, parse = found
+        bodies.setdefault(name, (parse, []))[1].append(fixture["response"]["body"])
+
+    results = {}
+    texts = []
+    for name, (parse, pages) in sorted(bodies.items()):
+        items = []
+        for body in pages:
+            items.extend(parse(body))
+        median = time_call(lambda: [parse(body) for body in pages], rounds, min_seconds) / len(pages)
+        results[f"parse.{name}"] = {"median_us": round(median * 1e6, 1), "items": len(items), "fixtures": len(pages)}
+        texts.extend(" ".join(filter(None, (item.get("title") or item.get("text"), item.get("snippet"))))
+                     for item in items)
+
+    texts = [text for text in texts if text]
+    if texts:
+        pairs = [(claim, text) for claim in BASE_CLAIMS for text in texts]
+        for name, func in (("calculate_similarity", calculate_similarity),
+                           ("jaccard_similarity", jaccard_similarity),
+                           ("hybrid_similarity", hybrid_similarity)):
+            median = time_call(lambda: [func(a, b) for a, b in pairs], rounds, min_seconds) / len(pairs)
+            results[f"similarity.{name}"] = {"median_us": round(median * 1e6, 2), "pairs": len(pairs)}
+        median = time_call(lambda: [normalize_for_similarity(text) for text in texts], rounds, min_seconds) / len(texts)
+        results["similarity.normalize_for_similarity"] = {"median_us": round(median * 1e6, 2), "pairs": len(texts)}
+    return results
+
+
+def check_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Benchmarks slower than baseline * (1 + tolerance), or parsers that found
+    items in the baseline and none now.
+    """
+    failures = []
+    for name, expected in baseline.items():
+        current = results.get(name)
+        if current is None:
+            failures.append(f"{name}: missing (no fixtures for it?)")
+            continue
+        limit = expected["median_us"] * (1 + tolerance)
+        if current["median_us"] > limit:
+            failures.append(f"{name}: {current['median_us']} us > {limit:.1f} us "
+                            f"(baseline {expected['median_us']} us + {tolerance:.0%})")
+        if expected.get("items") and not current.get("items"):
+            failures.append(f"{name}: no items parsed, baseline had {expected['items']} (markup changed?)")
+    return failures
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Time the parsers and similarity functions on recorded fixtures")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="Fixture directory")
+    parser.add_argument("--rounds", type=int, default=7, help="Timing rounds per benchmark (median is kept)")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Minimum duration of one round")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Fail on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown before failing (0.3 = 30%%)")
+    args = parser.parse_args(argv)
+
+    store = FixtureStore(args.fixtures)
+    if not store.all():
+        raise SystemExit(f"No fixtures in {args.fixtures}; record some with `python -m app.utils.http_replay record`")
+
+    results = run_benchmarks(store, args.rounds, args.min_seconds)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"{'benchmark':<42}{'median us':>12}{'baseline':>12}{'items':>8}")
+    for name, result in results.items():
+        previous = baseline.get(name, {}).get("median_us", "-")
+        print(f"{name:<42}{result['median_us']:>12}{previous:>12}{result.get('items', ''):>8}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+
+    if args.check:
+        failures = check_regressions(results, baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+End-to-end load test of /api/verify against local upstream stand-ins.
+
+Starts the stand-ins (loadtest/standins.py), launches the API with uvicorn
+pointed at them through UPSTREAM_OVERRIDES and GEMINI_API_ENDPOINT, and
+sends claims to /api/verify at a fixed arrival rate (open loop: requests
+are sent on schedule whether or not earlier ones finished). It reports
+throughput, latency percentiles, error rate and a per-stage breakdown taken
+from the Server-Timing headers. Results are saved as JSON and can be
+compared with an earlier run.
+
+    cd backend
+    python -m loadtest.run --rate 10 --duration 60
+    python -m loadtest.run --rate 20 --latency gemini=2000 --error-rate gemini=0.05 \\
+        --compare loadtest/results/20250101-120000.json
+    python -m loadtest.run --env GEMINI_FUSED_MODE=true --label fused
+
+The app runs with a fresh HTTP cache and fact-check index in a temporary
+directory, tracing sampling off and a Gemini rate limit high enough not to
+interfere; pass --env to override any of these.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import aiohttp
+
+from loadtest.standins import StandinServer, add_profile_arguments, apply_profile_options, default_profiles, upstream_overrides
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+BASE_CLAIMS = [
+    "The RBI is withdrawing all 500 rupee notes from circulation next month",
+    "A video shows a bridge collapsing in Mumbai during the monsoon",
+    "The government is giving free laptops to all college students",
+    "Drinking hot water with lemon cures the flu",
+    "A new rule fines people for sending political messages on WhatsApp",
+    "The Election Commission has postponed the state elections",
+    "A photo shows floods at the Chennai airport this week",
+    "Free mobile recharge is being offered by the central government",
+    "Indian Railways is cancelling all trains for two weeks",
+    "The Taj Mahal will be closed to tourists permanently",
+]
+
+
+def make_claims(unique: int) -> list:
+    """
+    `unique` distinct claims, built from BASE_CLAIMS with district/year variations.
+    """
+    districts = ["Pune", "Nagpur", "Thane", "Nashik", "Kolhapur", "Solapur", "Aurangabad", "Satara"]
+    claims = []
+    for index in range(unique):
+        base = BASE_CLAIMS[index % len(BASE_CLAIMS)]
+        variant = index // len(BASE_CLAIMS)
+        if variant:
+            base = f"{base} in {districts[variant % len(districts)]} {2000 + variant}"
+        claims.append(base)
+    return claims
+
+
+def percentile(values: list, fraction: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return round(ordered[index], 1)
+
+
+def summarize(values: list) -> dict:
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 1) if values else None,
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": round(max(values), 1) if values else None,
+    }
+
+
+def parse_server_timing(header: str) -> list:
+    """
+    Server-Timing header -> [(name, ms)]
+    """
+    timings = []
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                try:
+                    timings.append((name, float(value)))
+                except ValueError:
+                    pass
+    return timings
+
+
+def start_app(port: int, env_overrides: dict, log_path: str) -> subprocess.Popen:
+    env = {**os.environ, **env_overrides}
+    log = open(log_path, "w")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+async def wait_for_app(session: aiohttp.ClientSession, base_url: str, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"API process exited with code {process.returncode}")
+        try:
+            async with session.get(f"{base_url}/health", timeout=aiohttp.ClientTimeout(total=2)) as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.3)
+    raise SystemExit("API did not become healthy in time")
+
+
+async def drive_load(session: aiohttp.ClientSession, base_url: str, claims: list, rate: float,
+                     duration: float, max_in_flight: int, timeout: float) -> list:
+    """
+    Sends claims at `rate` per second for `duration` seconds.
+
+    Returns:
+        One record per request: latency, status, verdict, Server-Timing entries
+    """
+    records = []
+    in_flight = set()
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def one(claim: str, scheduled: float):
+        start = time.perf_counter()
+        record = {"scheduled": scheduled, "claim": claim}
+        try:
+            async with session.post(f"{base_url}/api/verify", json={"claim": claim}, timeout=client_timeout) as response:
+                body = await response.json(content_type=None)
+                record["status"] = response.status
+                record["verdict"] = body.get("verdict") if isinstance(body, dict) else None
+                record["server_timing"] = parse_server_timing(response.headers.get("Server-Timing"))
+        except asyncio.TimeoutError:
+            record["status"] = "timeout"
+        except aiohttp.ClientError as e:
+            record["status"] = f"client_error: {type(e).__name__}"
+        record["latency_ms"] = (time.perf_counter() - start) * 1000
+        records.append(record)
+
+    start = time.monotonic()
+    sent = 0
+    dropped = 0
+    while True:
+        scheduled = sent / rate
+        if scheduled >= duration:
+            break
+        delay = start + scheduled - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            # The app is not keeping up; count instead of queueing client-side
+            dropped += 1
+        else:
+            task = asyncio.create_task(one(random.choice(claims), scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        sent += 1
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    records.append({"dropped_client_side": dropped})
+    return records
+
+
+def build_report(records: list, args, elapsed: float, upstreams: dict, app_metrics: dict) -> dict:
+    dropped = records.pop()["dropped_client_side"]
+    latencies = [r["latency_ms"] for r in records if r.get("status") == 200]
+    statuses = Counter(str(r.get("status")) for r in records)
+    errors = sum(count for status, count in statuses.items() if status != "200")
+
+    stages = defaultdict(list)
+    for record in records:
+        for name, ms in record.get("server_timing", []):
+            if name != "total":
+                stages[name].append(ms)
+
+    return {
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "rate": args.rate,
+            "duration": args.duration,
+            "unique_claims": args.unique_claims,
+            "max_in_flight": args.max_in_flight,
+            "latency": args.latency or [],
+            "error_rate": args.error_rate or [],
+            "env": args.env or [],
+        },
+        "requests": len(records),
+        "dropped_client_side": dropped,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "error_rate": round(errors / len(records), 4) if records else 0,
+        "statuses": dict(statuses),
+        "latency_ms": summarize(latencies),
+        "verdicts": dict(Counter(r.get("verdict") for r in records if r.get("verdict"))),
+        "stages_ms": {name: summarize(values) for name, values in sorted(stages.items())},
+        "upstream_requests": upstreams,
+        "app_metrics": app_metrics,
+    }
+
+
+def print_report(report: dict, previous: dict = None):
+    def delta(path: list):
+        if previous is None:
+            return ""
+        old, new = previous, report
+        for key in path:
+            old = (old or {}).get(key)
+            new = (new or {}).get(key)
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or not old:
+            return ""
+        return f"  ({(new - old) / old:+.0%} vs previous)"
+
+    latency = report["latency_ms"]
+    print(f"\n=== Load test {report['label'] or ''} {report['timestamp']} ===")
+    print(f"Requests: {report['requests']}  (dropped client-side: {report['dropped_client_side']})")
+    print(f"Throughput: {report['throughput_rps']} req/s{delta(['throughput_rps'])}")
+    print(f"Error rate: {report['error_rate']:.2%}  {report['statuses']}")
+    for key in ("p50", "p95", "p99", "max"):
+        print(f"Latency {key}: {latency[key]} ms{delta(['latency_ms', key])}")
+    print("\nStage breakdown (ms):")
+    print(f"  {'stage':<32}{'count':>7}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, stats in report["stages_ms"].items():
+        print(f"  {name:<32}{stats['count']:>7}{stats['mean']:>9}{stats['p50']:>9}{stats['p95']:>9}{stats['p99']:>9}")
+    print(f"\nUpstream requests: {report['upstream_requests']}")
+
+
+async def fetch_json(session: aiohttp.ClientSession, url: str):
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            return await response.json()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def run(args) -> dict:
+    profiles = apply_profile_options(default_profiles(), args.latency, args.error_rate)
+    server = StandinServer(profiles)
+    await server.start("127.0.0.1", args.standin_port)
+    standin_url = f"http://127.0.0.1:{args.standin_port}"
+    app_url = f"http://127.0.0.1:{args.app_port}"
+
+    workdir = tempfile.mkdtemp(prefix="factcheck-loadtest-")
+    env = {
+        "UPSTREAM_OVERRIDES": upstream_overrides(standin_url),
+        "GEMINI_API_ENDPOINT": standin_url,
+        "GEMINI_API_KEY": "loadtest",
+        "GOOGLE_SEARCH_ENGINE_ID": "loadtest",
+        "NEWS_API_KEY": "loadtest",
+        "HTTP_CACHE_PATH": os.path.join(workdir, "http_cache.sqlite3"),
+        "FACTCHECK_INDEX_PATH": os.path.join(workdir, "factcheck_index.sqlite3"),
+        "INGESTION_IN_PROCESS": "false",
+        "TRACE_SAMPLE_RATE": "0",
+        "GEMINI_RPM": "100000",
+        "GEMINI_TPM": "1000000000",
+    }
+    for pair in args.env or []:
+        key, _, value = pair.partition("=")
+        env[key] = value
+
+    log_path = os.path.join(workdir, "app.log")
+    process = start_app(args.app_port, env, log_path)
+    connector = aiohttp.TCPConnector(limit=0)
+    try:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await wait_for_app(session, app_url, process)
+            print(f"Driving {args.rate} req/s for {args.duration}s ({args.unique_claims} distinct claims); app log: {log_path}")
+            start = time.monotonic()
+            records = await drive_load(session, app_url, make_claims(args.unique_claims), args.rate,
+                                       args.duration, args.max_in_flight, args.timeout)
+            elapsed = time.monotonic() - start
+            app_metrics = {
+                "llm_limiter": await fetch_json(session, f"{app_url}/api/metrics/llm/limiter"),
+                "singleflight": await fetch_json(session, f"{app_url}/api/metrics/singleflight"),
+            }
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        await server.stop()
+
+    return build_report(records, args, elapsed, server.snapshot(), app_metrics)
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Load-test /api/verify against local upstream stand-ins")
+    parser.add_argument("--rate", type=float, default=5, help="Requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load")
+    parser.add_argument("--unique-claims", type=int, default=50, help="Distinct claims to draw from")
+    parser.add_argument("--max-in-flight", type=int, default=500, help="Client-side cap on open requests")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    parser.add_argument("--app-port", type=int, default=8001)
+    parser.add_argument("--standin-port", type=int, default=8900)
+    parser.add_argument("--env", action="append", metavar="KEY=VALUE", help="Extra environment for the app (repeatable)")
+    parser.add_argument("--label", default="", help="Name stored with the results")
+    parser.add_argument("--output", default=None, help="Results file (default loadtest/results/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(report, previous)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Local stand-ins for every upstream the verification pipeline calls.
+
+One aiohttp server emulates, each under its own path prefix:
+
+- Google Fact Check Tools API   /factcheck/v1alpha1/claims:search
+- Google Custom Search          /customsearch/customsearch/v1
+- NewsAPI                       /newsapi/v2/everything
+- DuckDuckGo HTML               /duckduckgo/html/
+- the Indian fact-checkers      /<site key>/ (markup generated from the
+                                site's FactCheckerSpec selectors)
+- Gemini (REST)                 /v1beta/models/<model>:generateContent
+
+Each upstream has a latency distribution (log-normal around a median) and an
+error rate. `upstream_overrides()` gives the UPSTREAM_OVERRIDES value that
+points the app at the server.
+
+Run standalone with:
+
+    python -m loadtest.standins --port 8900 --latency gemini=1500 --error-rate boom=0.2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from urllib.parse import quote
+
+from aiohttp import web
+
+from app.tools.indian_factcheckers import FACTCHECKER_SPECS
+
+SPECS = {spec.key: spec for spec in FACTCHECKER_SPECS}
+
+
+@dataclass
+class UpstreamProfile:
+    """
+    Behaviour of one stand-in.
+
+    Args:
+        latency_ms: Median response time
+        sigma: Log-normal spread of the response time (0 = constant)
+        error_rate: Fraction of requests answered with error_status
+        error_status: HTTP status of injected errors
+    """
+    latency_ms: float
+    sigma: float = 0.35
+    error_rate: float = 0.0
+    error_status: int = 500
+
+    def delay(self) -> float:
+        return self.latency_ms / 1000 * math.exp(random.gauss(0, self.sigma)) if self.sigma else self.latency_ms / 1000
+
+
+def default_profiles() -> dict:
+    """
+    Latency/error profile of every upstream, keyed by stand-in name.
+    """
+    profiles = {
+        "factcheck": UpstreamProfile(250),
+        "customsearch": UpstreamProfile(300),
+        "newsapi": UpstreamProfile(350),
+        "duckduckgo": UpstreamProfile(450),
+        "gemini": UpstreamProfile(900, sigma=0.4, error_status=429),
+    }
+    for key in SPECS:
+        profiles[key] = UpstreamProfile(600, error_rate=0.01)
+    return profiles
+
+
+# Real origin -> stand-in path prefix
+ORIGINS = {
+    "https://factchecktools.googleapis.com": "/factcheck",
+    "https://www.googleapis.com": "/customsearch",
+    "https://newsapi.org": "/newsapi",
+    "https://html.duckduckgo.com": "/duckduckgo",
+    **{re.match(r"https://[^/]+", spec.url_template).group(0): f"/{spec.key}" for spec in FACTCHECKER_SPECS},
+}
+
+
+def upstream_overrides(base_url: str) -> str:
+    """
+    UPSTREAM_OVERRIDES value pointing every origin at the stand-in server.
+    """
+    return ",".join(f"{origin}={base_url}{prefix}" for origin, prefix in ORIGINS.items())
+
+
+TOPICS = [
+    "viral video", "WhatsApp forward", "government scheme", "RBI notice", "vaccine claim",
+    "election result", "flood photo", "currency note", "free recharge offer", "train accident",
+]
+
+
+def _words(query: str) -> str:
+    return " ".join(query.split()[:8]) or "claim"
+
+
+def fake_items(query: str, count: int = 5) -> list:
+    """
+    `count` search results (title, snippet, slug) for a query, the same ones
+    every time for the same query, so repeated claims see repeated evidence.
+    """
+    rng = random.Random(query)
+    items = []
+    for index in range(count):
+        topic = rng.choice(TOPICS)
+        items.append({
+            "title": f"Fact Check: {_words(query)} - {topic} is fake",
+            "snippet": f"A {topic} claiming that {_words(query)} is misleading. Officials denied it; the image is old.",
+            "slug": f"{re.sub(r'[^a-z0-9]+', '-', query.lower())[:60]}-{index}",
+        })
+    return items
+
+
+def _element(selector: str, inner: str, attributes: str = "") -> str:
+    tag, _, css_class = selector.partition(".")
+    class_attribute = f' class="{css_class}"' if css_class else ""
+    return f"<{tag}{class_attribute}{attributes}>{inner}</{tag}>"
+
+
+def render_factchecker_page(spec, query: str) -> str:
+    """
+    Search results page for a site, built from its spec's selectors.
+    """
+    articles = []
+    for item in fake_items(query or "latest fact checks"):
+        link = f"https://{spec.key}.example/{item['slug']}/"
+        if spec.link_selector:
+            title = _element(spec.title_selector, item["title"])
+            link_element = _element(spec.link_selector, "Read more", f' href="{link}"')
+        else:
+            title = _element(spec.title_selector, f'<a href="{link}">{item["title"]}</a>')
+            link_element = ""
+        snippet = _element(spec.snippet_selector, item["snippet"])
+        articles.append(_element(spec.item_selector, title + link_element + snippet))
+    return f"<html><body><main>{''.join(articles)}</main></body></html>"
+
+
+def render_duckduckgo_page(query: str) -> str:
+    results = []
+    for item in fake_items(query):
+        target = quote(f"https://news.example/{item['slug']}", safe="")
+        results.append(
+            '<div class="result results_links web-result">'
+            f'<a class="result__a" href="//duckduckgo.com/l/?uddg={target}">{item["title"]}</a>'
+            '<a class="result__url" href="#">news.example</a>'
+            f'<a class="result__snippet" href="#">{item["snippet"]}</a>'
+            "</div>"
+        )
+    return f"<html><body>{''.join(results)}</body></html>"
+
+
+def fake_gemini_text(prompt: str) -> str:
+    """
+    Plausible Gemini output for the app's prompts.
+    """
+    if "claim extraction expert" in prompt:
+        match = re.search(r'User Input: "(.*?)"\n', prompt, re.DOTALL)
+        return match.group(1).strip() if match else "The claim is unclear"
+    # One JSON object satisfies the analysis, explanation and fused prompts
+    return json.dumps({
+        "verdict": "FALSE",
+        "confidence": 0.85,
+        "reasoning": ["Several fact-checkers rated the claim false"],
+        "key_findings": ["The image is old", "Officials denied the claim"],
+        "evidence_summary": "Fact-checkers found the claim to be false.",
+        "real_news_summary": "The claim is false; the viral content is old and unrelated.",
+        "detailed_explanation": "Multiple fact-checkers traced the content to an unrelated older event.",
+        "evidence_points": [{"point": "Officials denied the claim", "source": "Alt News"}],
+    })
+
+
+class StandinServer:
+    """
+    The stand-in HTTP server.
+
+    Args:
+        profiles: Upstream profiles, defaults to default_profiles()
+    """
+
+    def __init__(self, profiles: dict = None):
+        self.profiles = profiles or default_profiles()
+        self.requests = Counter()
+        self.errors = Counter()
+        self._runner = None
+
+    async def _behave(self, name: str):
+        # Applies the upstream's latency; returns an error response or None
+        profile = self.profiles[name]
+        self.requests[name] += 1
+        await asyncio.sleep(profile.delay())
+        if random.random() < profile.error_rate:
+            self.errors[name] += 1
+            if name == "gemini":
+                return web.json_response(
+                    {"error": {"code": profile.error_status, "message": "Injected error", "status": "RESOURCE_EXHAUSTED"}},
+                    status=profile.error_status
+                )
+            return web.Response(status=profile.error_status, text="Injected error")
+        return None
+
+    async def factcheck(self, request):
+        error = await self._behave("factcheck")
+        if error:
+            return error
+        query = request.query.get("query", "")
+        claims = [
+            {
+                "text": item["title"],
+                "claimant": "Social media users",
+                "claimReview": [{
+                    "publisher": {"name": "Alt News", "site": "altnews.in"},
+                    "url": f"https://factcheck.example/{item['slug']}",
+                    "title": item["title"],
+                    "textualRating": "False",
+                    "reviewDate": "2025-01-01T00:00:00Z",
+                }],
+            }
+            for item in fake_items(query, 3)
+        ]
+        return web.json_response({"claims": claims})
+
+    async def customsearch(self, request):
+        error = await self._behave("customsearch")
+        if error:
+            return error
+        items = [
+            {"title": item["title"], "link": f"https://search.example/{item['slug']}",
+             "snippet": item["snippet"], "displayLink": "search.example"}
+            for item in fake_items(request.query.get("q", ""))
+        ]
+        return web.json_response({"items": items})
+
+    async def newsapi(self, request):
+        error = await self._behave("newsapi")
+        if error:
+            return error
+        articles = [
+            {"title": item["title"], "description": item["snippet"], "url": f"https://news.example/{item['slug']}",
+             "source": {"name": "News Example"}, "publishedAt": "2025-01-01T00:00:00Z"}
+            for item in fake_items(request.query.get("q", ""))
+        ]
+        return web.json_response({"status": "ok", "totalResults": len(articles), "articles": articles})
+
+    async def duckduckgo(self, request):
+        error = await self._behave("duckduckgo")
+        if error:
+            return error
+        return web.Response(text=render_duckduckgo_page(request.query.get("q", "")), content_type="text/html")
+
+    async def factchecker(self, request):
+        key = request.match_info["site"]
+        if key not in SPECS:
+            raise web.HTTPNotFound()
+        error = await self._behave(key)
+        if error:
+            return error
+        return web.Response(text=render_factchecker_page(SPECS[key], request.query.get("s", "")), content_type="text/html")
+
+    async def gemini(self, request):
+        error = await self._behave("gemini")
+        if error:
+            return error
+        body = await request.json()
+        prompt = "".join(part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", []))
+        text = fake_gemini_text(prompt)
+        prompt_tokens = len(prompt) // 4
+        response_tokens = len(text) // 4
+        return web.json_response({
+            "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": response_tokens,
+                "totalTokenCount": prompt_tokens + response_tokens,
+            },
+        })
+
+    async def stats(self, request):
+        return web.json_response(self.snapshot())
+
+    def snapshot(self) -> dict:
+        return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+    def make_app(self) -> web.Application:
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_get("/factcheck/v1alpha1/claims:search", self.factcheck)
+        app.router.add_get("/customsearch/customsearch/v1", self.customsearch)
+        app.router.add_get("/newsapi/v2/everything", self.newsapi)
+        app.router.add_get("/duckduckgo/html/", self.duckduckgo)
+        app.router.add_post("/v1beta/models/{model}", self.gemini)
+        app.router.add_get("/_stats", self.stats)
+        app.router.add_get("/{site}/{tail:.*}", self.factchecker)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8900):
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def apply_profile_options(profiles: dict, latencies: list, error_rates: list) -> dict:
+    """
+    Applies "name=ms" latency and "name=rate" error options ("*" = all upstreams).
+    """
+    for option, field, cast in ((latencies, "latency_ms", float), (error_rates, "error_rate", float)):
+        for pair in option or []:
+            name, _, value = pair.partition("=")
+            names = list(profiles) if name == "*" else [name]
+            for target in names:
+                if target not in profiles:
+                    raise SystemExit(f"Unknown upstream {target!r}; known: {', '.join(profiles)}")
+                setattr(profiles[target], field, cast(value))
+    return profiles
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", action="append", metavar="NAME=MS",
+                        help="Median latency of an upstream (repeatable, NAME may be *)")
+    parser.add_argument("--error-rate", action="append", metavar="NAME=RATE",
+                        help="Error rate of an upstream (repeatable, NAME may be *)")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Run the upstream stand-ins")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    profiles = apply_profile_options(default_profiles(), args.latency, args.error_rate)
+    server = StandinServer(profiles)
+    base_url = f"http://{args.host}:{args.port}"
+    print(f"UPSTREAM_OVERRIDES={upstream_overrides(base_url)}")
+    print(f"GEMINI_API_ENDPOINT={base_url}")
+
+    async def run():
+        await server.start(args.host, args.port)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import pytest
+
+from app.utils import cache as cache_module
+
+
+class FakeClock:
+    """
+    Stands in for the time module in app.utils.cache; moved with `advance`.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.agents import pipeline
+from app.models.response_model import VerdictType, VerifyResponse
+
+CLAIMS = [
+    "RBI is withdrawing 500 rupee notes",
+    "Free laptops for all students from next month",
+    "rbi is withdrawing 500 rupee notes!!",
+    "short",
+    "Mumbai local trains suspended on Monday",
+    "Trigger a failure in the pipeline",
+]
+
+
+class StubPipeline:
+    """
+    Stands in for run_verification, tracking how many claims run at once.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, claim: str, on_stage=None) -> VerifyResponse:
+        self.calls.append(claim)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if "failure" in claim:
+                raise RuntimeError("Gemini unavailable")
+            return VerifyResponse(
+                original_claim=claim, extracted_claim=claim, verdict=VerdictType.FALSE, confidence_score=0.9,
+                real_news_summary="summary", detailed_explanation="explanation", evidence_points=[], sources=[],
+            )
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = StubPipeline()
+    monkeypatch.setattr(pipeline, "run_verification", stub)
+    return stub
+
+
+async def test_duplicates_are_verified_once_with_bounded_concurrency(stub):
+    items = [item async for item in pipeline.run_batch_verification(CLAIMS, concurrency=2)]
+    items = {item.index: item for item in items}
+
+    assert sorted(items) == list(range(len(CLAIMS)))
+    assert sorted(stub.calls) == sorted([CLAIMS[0], CLAIMS[1], CLAIMS[4], CLAIMS[5]])
+    assert stub.peak == 2
+
+    assert items[2].duplicate_of == 0
+    assert items[2].result.original_claim == CLAIMS[2]
+    assert items[3].status == "error" and "at least" in items[3].error
+    assert items[5].status == "error" and items[5].error == "Gemini unavailable"
+    assert [items[index].status for index in (0, 1, 4)] == ["ok"] * 3
+
+
+async def test_concurrency_is_capped(stub, monkeypatch):
+    monkeypatch.setattr(pipeline, "BATCH_MAX_CONCURRENCY", 3)
+    claims = [f"Viral claim number {number} about the election" for number in range(10)]
+
+    items = [item async for item in pipeline.run_batch_verification(claims, concurrency=50)]
+
+    assert len(items) == 10
+    assert stub.peak == 3
+
+
+async def test_closing_the_stream_cancels_remaining_claims(stub):
+    claims = [f"Viral claim number {number} about the election" for number in range(6)]
+    items = pipeline.run_batch_verification(claims, concurrency=1)
+
+    first = await items.__anext__()
+    await items.aclose()
+    await asyncio.sleep(0.05)
+
+    assert first.status == "ok"
+    assert len(stub.calls) <= 2
+
+
+async def post_batch(query: str = "") -> httpx.Response:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(f"/api/verify/batch{query}", json={"claims": CLAIMS, "concurrency": 3})
+
+
+async def test_batch_endpoint_summarizes_results(stub):
+    response = await post_batch()
+
+    body = response.json()
+    assert response.status_code == 200
+    assert (body["total"], body["unique_claims"], body["succeeded"], body["failed"]) == (6, 5, 4, 2)
+    assert [item["index"] for item in body["results"]] == list(range(6))
+
+
+async def test_batch_endpoint_streams_ndjson(stub):
+    response = await post_batch("?stream=true")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert sorted(line["index"] for line in lines) == list(range(6))
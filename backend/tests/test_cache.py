@@ -0,0 +1,100 @@
+import pytest
+
+from app.models.response_model import VerdictType, VerifyResponse
+from app.utils import verdict_cache as verdict_cache_module
+from app.utils.cache import TTLCache
+from app.utils.verdict_cache import VERDICT_TTLS, cache_verdict, get_cached_verdict
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache("test", default_ttl=60)
+    cache.set("default", "a")
+    cache.set("short", "b", ttl=5)
+
+    clock.advance(10)
+    assert cache.get("short") is None
+    assert cache.get("default") == "a"
+    assert cache.ttl_remaining("default") == pytest.approx(50)
+
+    clock.advance(50)
+    assert "default" not in cache
+    assert cache.get("default") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 2)
+
+
+def test_non_positive_ttl_and_oversized_values_are_not_stored(clock):
+    cache = TTLCache("test", max_bytes=100)
+    cache.set("zero", "a", ttl=0)
+    cache.set("huge", "b", size=101)
+
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted_by_count(clock):
+    cache = TTLCache("test", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert ("a" in cache, "c" in cache) == (True, True)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_are_evicted_by_size(clock):
+    cache = TTLCache("test", max_bytes=100)
+    cache.set("a", 1, size=40)
+    cache.set("b", 2, size=40)
+    cache.set("a", 1, size=50)  # replacing an entry frees its old size
+    assert cache.stats()["bytes"] == 90
+
+    cache.set("c", 3, size=30)
+
+    assert "b" not in cache
+    assert cache.stats()["bytes"] == 80
+
+
+def make_response(verdict: VerdictType, skipped_sources: list = None) -> VerifyResponse:
+    return VerifyResponse(
+        original_claim="RBI is withdrawing 500 rupee notes",
+        extracted_claim="RBI is withdrawing 500 rupee notes",
+        verdict=verdict,
+        confidence_score=0.9,
+        real_news_summary="summary",
+        detailed_explanation="explanation",
+        evidence_points=[],
+        sources=[],
+        skipped_sources=skipped_sources or [],
+    )
+
+
+@pytest.fixture
+def verdicts(clock, monkeypatch):
+    cache = TTLCache("verdicts")
+    monkeypatch.setattr(verdict_cache_module, "verdict_cache", cache)
+    monkeypatch.setattr(verdict_cache_module, "NEAR_DUPLICATE_ENABLED", False)
+    return cache
+
+
+@pytest.mark.parametrize("verdict, skipped, ttl", [
+    (VerdictType.FALSE, [], VERDICT_TTLS[VerdictType.FALSE]),
+    (VerdictType.UNVERIFIED, [], VERDICT_TTLS[VerdictType.UNVERIFIED]),
+    (VerdictType.TRUE, ["google_search"], VERDICT_TTLS[VerdictType.UNVERIFIED]),
+])
+def test_verdict_ttl_depends_on_the_verdict(verdicts, verdict, skipped, ttl):
+    cache_verdict("RBI is withdrawing 500 rupee notes", make_response(verdict, skipped))
+
+    assert verdicts.ttl_remaining("rbi is withdrawing 500 rupee notes") == pytest.approx(ttl)
+
+
+def test_cached_verdict_is_shared_by_normalized_claims(verdicts, clock):
+    cache_verdict("RBI is withdrawing 500 rupee notes", make_response(VerdictType.FALSE))
+
+    cached = get_cached_verdict("  rbi is WITHDRAWING 500 rupee notes!! ")
+    assert cached.verdict == VerdictType.FALSE
+    assert cached.original_claim == "  rbi is WITHDRAWING 500 rupee notes!! "
+
+    clock.advance(VERDICT_TTLS[VerdictType.FALSE])
+    assert get_cached_verdict("RBI is withdrawing 500 rupee notes") is None
@@ -0,0 +1,41 @@
+from app.tools import web_scraper
+from app.utils import circuit_breaker
+from app.utils.circuit_breaker import CLOSED, circuit_breaker as guard
+from app.utils.metrics import source_outcome
+
+
+async def test_disabled_results_are_not_failures():
+    @guard("test_disabled", min_calls=2)
+    async def tool(claim):
+        return {"results": [], "disabled": True}
+
+    for _ in range(10):
+        assert (await tool("claim"))["disabled"]
+
+    snapshot = tool.breaker.snapshot()
+    assert snapshot["state"] == CLOSED
+    assert snapshot["calls_in_window"] == 0
+
+
+async def test_errors_still_open_the_circuit():
+    @guard("test_errors", min_calls=2)
+    async def tool(claim):
+        return {"results": [], "error": "HTTP 500"}
+
+    for _ in range(3):
+        await tool("claim")
+
+    assert tool.breaker.state != CLOSED
+
+
+async def test_news_api_without_key_is_disabled(monkeypatch):
+    monkeypatch.setenv("NEWS_API_KEY", "")
+    monkeypatch.setattr(circuit_breaker, "BREAKERS_ENABLED", True)
+    breaker = circuit_breaker.get_breaker("news_api")
+    breaker.reset()
+
+    result = await web_scraper.scrape_news_api.__wrapped__("a claim that has no cached result")
+
+    assert result.get("disabled") and not result.get("error")
+    assert source_outcome(result) == "disabled"
+    assert breaker.snapshot()["calls_in_window"] == 0
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.deadline import gather_with_budget, remaining_budget
+
+
+class Sources:
+    """
+    Stub source coroutines that sleep and record whether they were cancelled.
+    """
+
+    def __init__(self):
+        self.cancelled = []
+
+    async def source(self, name: str, delay: float, error: Exception = None):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        if error is not None:
+            raise error
+        return {"results": [name]}
+
+
+@pytest.fixture
+def sources():
+    return Sources()
+
+
+async def test_all_sources_within_budget_complete(sources):
+    completed = []
+
+    async def on_result(name, result):
+        completed.append(name)
+
+    results, skipped = await gather_with_budget(
+        {"slow": sources.source("slow", 0.05), "fast": sources.source("fast", 0),
+         "broken": sources.source("broken", 0, ValueError("HTTP 500"))},
+        budget=1, soft_timeout=0.5, hard_timeout=1, on_result=on_result,
+    )
+
+    assert skipped == []
+    assert results["fast"] == {"results": ["fast"]}
+    assert isinstance(results["broken"], ValueError)
+    assert completed[-1] == "slow"
+
+
+async def test_hard_timeout_cancels_stragglers(sources):
+    start = time.monotonic()
+    results, skipped = await gather_with_budget(
+        {"fast": sources.source("fast", 0), "stuck": sources.source("stuck", 10)},
+        budget=5, soft_timeout=0.02, hard_timeout=0.1,
+    )
+
+    assert time.monotonic() - start < 0.5
+    assert skipped == ["stuck"] and list(results) == ["fast"]
+    await asyncio.sleep(0)
+    assert sources.cancelled == ["stuck"]
+
+
+async def test_soft_timeout_applies_only_with_enough_evidence(sources):
+    coroutines = lambda: {"fast": sources.source("fast", 0), "slow": sources.source("slow", 0.1)}
+
+    results, skipped = await gather_with_budget(
+        coroutines(), budget=1, soft_timeout=0.02, hard_timeout=1, enough=lambda results: "fast" in results,
+    )
+    assert skipped == ["slow"]
+
+    results, skipped = await gather_with_budget(
+        coroutines(), budget=1, soft_timeout=0.02, hard_timeout=1, enough=lambda results: len(results) == 2,
+    )
+    assert skipped == [] and set(results) == {"fast", "slow"}
+
+
+async def test_budget_and_per_source_timeouts(sources):
+    start = time.monotonic()
+    results, skipped = await gather_with_budget(
+        {"patient": sources.source("patient", 0.1), "slow": sources.source("slow", 10)},
+        budget=0.2, soft_timeout=0.01, hard_timeout=5, timeouts={"patient": (1, 1)},
+    )
+
+    assert time.monotonic() - start < 0.5
+    assert list(results) == ["patient"] and skipped == ["slow"]
+
+
+async def test_nested_work_sees_the_source_deadline():
+    seen = {}
+
+    async def nested(name):
+        seen[name] = remaining_budget(default=30)
+
+    await gather_with_budget(
+        {"a": nested("a"), "b": nested("b")},
+        budget=10, soft_timeout=1, hard_timeout=2, timeouts={"b": (0.5, 0.5)},
+    )
+
+    assert 1.5 < seen["a"] <= 2
+    assert 0 < seen["b"] <= 0.5
+    assert remaining_budget() is None
+    assert remaining_budget(default=3) == 3
+
+
+async def test_cancelling_the_gather_cancels_every_source(sources):
+    task = asyncio.create_task(gather_with_budget(
+        {"a": sources.source("a", 10), "b": sources.source("b", 10)},
+        budget=20, soft_timeout=10, hard_timeout=20,
+    ))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+
+    assert sorted(sources.cancelled) == ["a", "b"]
@@ -0,0 +1,45 @@
+import random
+
+from app.utils import evidence
+from app.utils.evidence import rank_evidence
+from app.utils.near_duplicate import canonicalize_claim, claim_similarity
+
+WORDS = "rbi notes 500 withdraw fake not viral mumbai train free claim video government ban upi 2000 police".split()
+
+
+def test_title_bounds_agree_with_claim_similarity():
+    rng = random.Random(3)
+    for _ in range(5000):
+        words = rng.choices(WORDS, k=rng.randint(3, 9))
+        title = " ".join(words)
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+        other = " ".join(words)
+        title, other = canonicalize_claim(title), canonicalize_claim(other)
+
+        expected = claim_similarity(title, other) >= evidence.TITLE_DUPLICATE_THRESHOLD
+        assert evidence._duplicate_title(evidence._title_key(title), evidence._title_key(other)) == expected
+
+
+def test_near_duplicate_titles_are_collapsed():
+    results = [
+        {"title": "RBI is not withdrawing 500 rupee notes", "url": "https://a.example/1", "credibility": "high"},
+        {"title": "RBI is not withdrawing ₹500 rupee notes!", "url": "https://b.example/2", "credibility": "low"},
+        {"title": "Mumbai local train timetable changes", "url": "https://c.example/3"},
+    ]
+
+    selected, stats = rank_evidence("RBI withdrawing 500 rupee notes", results)
+
+    assert [result["url"] for result in selected] == ["https://a.example/1"]
+    assert stats["title_duplicates"] == 1
+
+
+def test_long_documents_are_cut():
+    claim = "RBI withdrawing 500 rupee notes"
+    words = ["rbi", "withdrawing", "500", "rupee", "notes"] + [f"filler{i % 7}" for i in range(1000)]
+    cut = " ".join(words[:evidence.EVIDENCE_MAX_DOCUMENT_TOKENS])
+
+    scores = evidence.relevance_scores(claim, [" ".join(words), claim])
+    expected = evidence.relevance_scores(claim, [cut, claim])
+
+    assert scores == expected
+    assert abs(scores[1] - 1.0) < 1e-9
@@ -0,0 +1,50 @@
+import pytest
+
+from app.agents import explanation_agent
+from app.agents.verdict_agent import determine_verdict
+
+FUSED_EXPLANATION = {
+    "real_news_summary": "RBI has not announced any withdrawal of 500 rupee notes.",
+    "detailed_explanation": "The message is fake: the notes remain legal tender.",
+    "evidence_points": [{"point": "PIB Fact Check flagged the message", "source": "PIB"}],
+}
+
+
+def fused_results(suggestion: str, confidence: float) -> dict:
+    return {"ai_analysis": {"verdict_suggestion": suggestion, "confidence": confidence,
+                            "explanation": FUSED_EXPLANATION}}
+
+
+@pytest.fixture
+def separate_calls(monkeypatch):
+    calls = []
+
+    async def generate_explanation(original_claim, extracted_claim, verification_results, verdict_data):
+        calls.append(verdict_data["verdict"])
+        return {"detailed_explanation": f"explained as {verdict_data['verdict'].value}"}
+
+    monkeypatch.setattr(explanation_agent, "generate_explanation", generate_explanation)
+    return calls
+
+
+async def test_fused_explanation_is_used_when_the_verdict_matches(separate_calls):
+    results = fused_results("FALSE", 0.9)
+
+    explanation = await explanation_agent.explanation_from_fused(
+        "claim", "claim", results, determine_verdict(results)
+    )
+
+    assert separate_calls == []
+    assert explanation["detailed_explanation"] == FUSED_EXPLANATION["detailed_explanation"]
+
+
+@pytest.mark.parametrize("suggestion, confidence", [("FALSE", 0.0), ("PARTLY FALSE", 0.8)])
+async def test_overridden_verdict_gets_its_own_explanation(separate_calls, suggestion, confidence):
+    results = fused_results(suggestion, confidence)
+
+    explanation = await explanation_agent.explanation_from_fused(
+        "claim", "claim", results, determine_verdict(results)
+    )
+
+    assert separate_calls == ["UNVERIFIED"]
+    assert explanation["detailed_explanation"] == "explained as UNVERIFIED"
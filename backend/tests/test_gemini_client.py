@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from app.utils import gemini_client
+from app.utils.rate_limiter import GeminiRateLimiter
+
+CALL_SECONDS = 0.3
+
+
+class BlockingModel:
+    """
+    Stand-in for GenerativeModel whose generate_content blocks like the SDK does.
+    """
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(CALL_SECONDS)
+        with self._lock:
+            self.active -= 1
+        return SimpleNamespace(text=f"  answer to {prompt}  ", usage_metadata=None)
+
+
+async def test_concurrent_calls_overlap(monkeypatch):
+    model = BlockingModel()
+    monkeypatch.setattr(gemini_client, "get_model", lambda model_name=None: model)
+    monkeypatch.setattr(gemini_client, "gemini_limiter", GeminiRateLimiter(rpm=10000, tpm=10**9))
+    calls = 8
+
+    start = time.perf_counter()
+    texts = await asyncio.gather(*(gemini_client.generate_text(f"prompt {i}") for i in range(calls)))
+    elapsed = time.perf_counter() - start
+
+    assert texts == [f"answer to prompt {i}" for i in range(calls)]
+    assert model.peak == calls
+    # About one call's duration, not calls * CALL_SECONDS
+    assert elapsed < CALL_SECONDS * 2
+
+
+async def test_event_loop_stays_responsive(monkeypatch):
+    model = BlockingModel()
+    monkeypatch.setattr(gemini_client, "get_model", lambda model_name=None: model)
+    monkeypatch.setattr(gemini_client, "gemini_limiter", GeminiRateLimiter(rpm=10000, tpm=10**9))
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*(gemini_client.generate_text("prompt") for _ in range(4)))
+    task.cancel()
+
+    # A blocked loop would not tick at all while the calls run
+    assert ticks >= CALL_SECONDS / 0.01 / 2
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.tools import html_parsing, scraping_engine, web_scraper
+from app.tools.indian_factcheckers import FACTCHECKER_SPECS
+
+PAGES = Path(__file__).parent / "fixtures" / "pages"
+
+# Saved page for each parser
+PAGE_FILES = {
+    "duckduckgo": "duckduckgo.html",
+    "pib_factcheck": "pib_factcheck.html",
+    "altnews": "altnews.html",
+    "boom": "boom_live.html",
+    "factly": "factly.html",
+    "vishvas": "vishvas_news.html",
+}
+
+PARSERS = {"duckduckgo": web_scraper.parse_duckduckgo}
+PARSERS.update({
+    spec.key: (lambda html, spec=spec: scraping_engine.parse_factchecks(html, spec))
+    for spec in FACTCHECKER_SPECS
+})
+
+
+def load_page(key: str) -> str:
+    return (PAGES / PAGE_FILES[key]).read_text(encoding="utf-8")
+
+
+def full_soup(html: str, name: str = None, class_: str = None) -> BeautifulSoup:
+    return BeautifulSoup(html, html_parsing.PARSER)
+
+
+@pytest.mark.parametrize("key", sorted(PARSERS))
+def test_strained_parse_matches_full_parse(key, monkeypatch):
+    html = load_page(key)
+    strained = PARSERS[key](html)
+
+    monkeypatch.setattr(scraping_engine, "make_soup", full_soup)
+    monkeypatch.setattr(web_scraper, "make_soup", full_soup)
+    full = PARSERS[key](html)
+
+    assert full, f"saved {key} page yields no results"
+    assert strained == full
+
+
+def test_class_matches_any_token():
+    html = '<div class="result results_links web-result"><a>one</a></div><div class="results"><a>two</a></div>'
+
+    soup = html_parsing.make_soup(html, "div", class_="result")
+
+    assert [div.get_text() for div in soup.find_all("div")] == ["one"]
+
+
+def test_plain_strainer_misses_multi_class_elements():
+    # The regression the token match guards against
+    html = load_page("duckduckgo")
+
+    soup = BeautifulSoup(html, html_parsing.PARSER, parse_only=SoupStrainer("div", class_="result"))
+
+    assert not soup.find_all("div", class_="web-result")
+    assert html_parsing.make_soup(html, "div", class_="result").find_all("div", class_="web-result")
@@ -0,0 +1,152 @@
+import os
+import sqlite3
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.utils import http_cache as http_cache_module
+from app.utils import http_client
+from app.utils.http_cache import HTTPCache, _max_age, fetch_text
+
+LAST_MODIFIED = "Mon, 13 Jan 2025 10:00:00 GMT"
+
+
+class PageStandin:
+    """
+    Serves pages by path with the given response headers, answering
+    matching If-None-Match / If-Modified-Since with 304.
+    """
+
+    def __init__(self, pages: dict):
+        self.pages = pages
+        self.requests = []
+        self.server = None
+
+    async def handle(self, request):
+        self.requests.append((request.path, dict(request.headers)))
+        body, headers = self.pages[request.path]
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if (etag and request.headers.get("If-None-Match") == etag) or \
+                (last_modified and request.headers.get("If-Modified-Since") == last_modified):
+            return web.Response(status=304, headers=headers)
+        return web.Response(text=body, content_type="text/html", headers=headers)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    def url(self, path: str) -> str:
+        return str(self.server.make_url(path))
+
+    def conditional(self, path: str) -> list:
+        return [
+            "If-None-Match" in headers or "If-Modified-Since" in headers
+            for request_path, headers in self.requests if request_path == path
+        ]
+
+
+@pytest.fixture
+async def standin():
+    server = PageStandin({
+        "/fresh": ("fresh page", {"Cache-Control": "public, max-age=300"}),
+        "/etag": ("etag page", {"ETag": '"v1"'}),
+        "/modified": ("modified page", {"Last-Modified": LAST_MODIFIED}),
+        "/no-store": ("private page", {"ETag": '"v1"', "Cache-Control": "no-store"}),
+        "/plain": ("plain page", {}),
+    })
+    await server.start()
+    yield server
+    await http_client.shutdown()
+    await server.server.close()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = HTTPCache(str(tmp_path / "http_cache.sqlite3"))
+    monkeypatch.setattr(http_cache_module, "http_cache", cache)
+    yield cache
+    cache.close()
+
+
+async def fetch_twice(standin, path: str) -> list:
+    return [await fetch_text(standin.url(path)) for _ in range(2)]
+
+
+async def test_fresh_entry_is_served_without_a_request(standin, cache):
+    responses = await fetch_twice(standin, "/fresh")
+
+    assert responses == [(200, "fresh page")] * 2
+    assert len(standin.requests) == 1
+    assert (cache.fresh_hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("path, body", [("/etag", "etag page"), ("/modified", "modified page")])
+async def test_stale_entry_is_revalidated(standin, cache, path, body):
+    responses = await fetch_twice(standin, path)
+
+    assert responses == [(200, body)] * 2
+    assert standin.conditional(path) == [False, True]
+    assert (cache.revalidated, cache.misses) == (1, 1)
+    assert cache.bytes_saved == len(body)
+
+
+async def test_changed_page_replaces_the_entry(standin, cache):
+    await fetch_text(standin.url("/etag"))
+    standin.pages["/etag"] = ("etag page, updated", {"ETag": '"v2"'})
+
+    assert await fetch_text(standin.url("/etag")) == (200, "etag page, updated")
+    assert cache.lookup(standin.url("/etag"))[0] == '"v2"'
+
+
+@pytest.mark.parametrize("path", ["/no-store", "/plain"])
+async def test_uncacheable_responses_are_not_stored(standin, cache, path):
+    await fetch_twice(standin, path)
+
+    assert standin.conditional(path) == [False, False]
+    assert cache.lookup(standin.url(path)) is None
+
+
+async def test_failed_touch_still_returns_the_cached_page(standin, cache, monkeypatch):
+    await fetch_text(standin.url("/etag"))
+
+    def locked(url, max_age=0):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "touch", locked)
+
+    assert await fetch_text(standin.url("/etag")) == (200, "etag page")
+    assert cache.revalidated == 1
+
+
+@pytest.mark.parametrize("cache_control, max_age", [
+    ("public, max-age=300", 300),
+    ("MAX-AGE=60, must-revalidate", 60),
+    ("s-maxage=100", 0),
+    ("no-cache, max-age=300", 0),
+    ("no-store", 0),
+    ("", 0),
+])
+def test_max_age(cache_control, max_age):
+    assert _max_age({"Cache-Control": cache_control}) == max_age
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    # Hex of random bytes compresses to about half, so each entry stores about 1 KB
+    bodies = {url: os.urandom(1024).hex() for url in ("a", "b", "c")}
+    cache = HTTPCache(str(tmp_path / "http_cache.sqlite3"), max_bytes=2500)
+
+    cache.store("a", bodies["a"], etag='"a"')
+    cache.store("b", bodies["b"], etag='"b"')
+    assert cache.lookup("a")[3] == bodies["a"]
+    cache.store("c", bodies["c"], etag='"c"')
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None and cache.lookup("c") is not None
+    assert cache.evictions == 1
+    entries, stored_bytes, _ = cache.disk_usage()
+    assert entries == 2 and stored_bytes <= 2500
+    cache.close()
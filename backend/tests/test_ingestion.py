@@ -0,0 +1,187 @@
+import dataclasses
+import hashlib
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.tools import ingestion
+from app.tools.factcheck_index import FactCheckIndex
+from app.tools.indian_factcheckers import ALTNEWS, BOOM_LIVE, FACTLY
+from app.utils import http_cache as http_cache_module
+from app.utils import http_client
+from app.utils.http_cache import HTTPCache
+
+BOOM_PAGE = Path(__file__).parent / "fixtures" / "pages" / "boom_live.html"
+
+RSS_ITEM = """
+    <item>
+      <title>{title}</title>
+      <link>{url}</link>
+      <pubDate>Mon, 13 Jan 2025 10:00:00 +0530</pubDate>
+      <description>&lt;p&gt;{title} &amp;#8211; full story&lt;/p&gt;</description>
+    </item>"""
+
+ATOM_ENTRY = """
+  <entry>
+    <title>{title}</title>
+    <link href="{url}"/>
+    <updated>2025-01-13T10:00:00+05:30</updated>
+    <summary type="html">&lt;p&gt;{title}&lt;/p&gt;</summary>
+  </entry>"""
+
+
+def rss(items: list) -> str:
+    body = "".join(RSS_ITEM.format(title=title, url=url) for title, url in items)
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Alt News</title>{body}\n</channel></rss>'
+
+
+def atom(items: list) -> str:
+    body = "".join(ATOM_ENTRY.format(title=title, url=url) for title, url in items)
+    return f'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Factly</title>{body}\n</feed>'
+
+
+ALTNEWS_ITEMS = [
+    ("Fake message claims RBI will withdraw 500 notes", "https://www.altnews.in/rbi-500-notes/"),
+    ("Fact Check: Old video shared as recent", "https://www.altnews.in/old-video/"),
+    # Listed twice in the same feed
+    ("Fact Check: Old video shared as recent", "https://www.altnews.in/old-video/"),
+]
+FACTLY_ITEMS = [
+    ("The claim about free laptops is false", "https://factly.in/free-laptops/"),
+    ("Explainer: coin shortage", "https://factly.in/coin-shortage/"),
+]
+
+
+class FeedStandin:
+    """
+    Serves feed bodies by path with ETags, answering If-None-Match with 304.
+    """
+
+    def __init__(self, bodies: dict):
+        self.bodies = bodies
+        self.requests = []
+        self.server = None
+
+    async def handle(self, request):
+        self.requests.append(request.path)
+        body = self.bodies.get(request.path)
+        if body is None:
+            return web.Response(status=404)
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="text/html", headers={"ETag": etag})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    def url(self, path: str) -> str:
+        return str(self.server.make_url(path))
+
+
+@pytest.fixture
+async def standin():
+    server = FeedStandin({
+        "/altnews/feed/": rss(ALTNEWS_ITEMS),
+        "/factly/feed/": atom(FACTLY_ITEMS),
+        "/boom/fact-check": BOOM_PAGE.read_text(encoding="utf-8"),
+    })
+    await server.start()
+    yield server
+    await http_client.shutdown()
+    await server.server.close()
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    index = FactCheckIndex(str(tmp_path / "factcheck_index.sqlite3"))
+    monkeypatch.setattr(ingestion, "factcheck_index", index)
+    monkeypatch.setattr(http_cache_module, "http_cache", HTTPCache(str(tmp_path / "http_cache.sqlite3")))
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    parse_off_loop = ingestion.parse_off_loop
+
+    async def counting_parse(parse_func, body, spec):
+        calls.append(spec.key)
+        return await parse_off_loop(parse_func, body, spec)
+
+    monkeypatch.setattr(ingestion, "parse_off_loop", counting_parse)
+    return calls
+
+
+def specs_for(standin: FeedStandin) -> list:
+    return [
+        dataclasses.replace(ALTNEWS, feed_url=standin.url("/altnews/feed/")),
+        dataclasses.replace(FACTLY, feed_url=standin.url("/factly/feed/")),
+        dataclasses.replace(BOOM_LIVE, feed_url=standin.url("/boom/fact-check")),
+    ]
+
+
+async def test_first_poll_indexes_rss_atom_and_listing(standin, index):
+    report = await ingestion.run_ingestion(specs_for(standin), overrides={})
+
+    # Duplicate feed entries are written once; the listing's item without a link is skipped
+    assert report == {"altnews": 2, "factly": 2, "boom": 3}
+    assert index.stats()["per_source"] == {"altnews": 2, "factly": 2, "boom": 3}
+
+    results = index.search("RBI withdraw 500 notes")
+    assert results[0]["url"] == "https://www.altnews.in/rbi-500-notes/"
+    assert results[0]["verdict"] == "FALSE"
+    assert index.known_urls(["https://www.boomlive.in/fact-check/rbi-500-notes-withdrawal-viral-claim-27001"])
+
+
+async def test_unchanged_feeds_are_not_parsed_again(standin, index, parses):
+    specs = specs_for(standin)
+    await ingestion.run_ingestion(specs, overrides={})
+    assert sorted(parses) == ["altnews", "boom", "factly"]
+
+    report = await ingestion.run_ingestion(specs, overrides={})
+
+    assert report == {"altnews": 0, "factly": 0, "boom": 0}
+    assert sorted(parses) == ["altnews", "boom", "factly"]
+    assert len(standin.requests) == 6
+
+
+async def test_known_urls_are_not_written_again(standin, index):
+    index.upsert_many([{"url": "https://factly.in/free-laptops/", "title": "Indexed by a live scrape",
+                        "source": "factly"}])
+
+    report = await ingestion.run_ingestion(specs_for(standin), overrides={})
+
+    assert report["factly"] == 1
+    assert index.stats()["per_source"]["factly"] == 2
+
+
+async def test_new_items_are_picked_up_on_the_next_poll(standin, index, parses):
+    specs = specs_for(standin)
+    await ingestion.run_ingestion(specs, overrides={})
+
+    standin.bodies["/altnews/feed/"] = rss(
+        [("Morphed photo of minister shared as real", "https://www.altnews.in/morphed-photo/")] + ALTNEWS_ITEMS
+    )
+    report = await ingestion.run_ingestion(specs, overrides={})
+
+    assert report == {"altnews": 1, "factly": 0, "boom": 0}
+    assert parses.count("altnews") == 2 and parses.count("factly") == 1
+    assert index.search("morphed photo minister")[0]["url"] == "https://www.altnews.in/morphed-photo/"
+    assert index.feed_state(specs[0].feed_url)["articles"] == 3
+
+
+async def test_failed_feed_is_reported_without_blocking_others(standin, index):
+    specs = specs_for(standin)
+    specs[1] = dataclasses.replace(FACTLY, feed_url=standin.url("/missing/feed/"))
+
+    report = await ingestion.run_ingestion(specs, overrides={})
+
+    assert report["factly"] == "error: Status 404"
+    assert report["altnews"] == 2 and report["boom"] == 3
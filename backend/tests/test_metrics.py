@@ -0,0 +1,17 @@
+import pytest
+
+from app.utils.metrics import source_outcome
+
+
+@pytest.mark.parametrize("result, outcome", [
+    ({"results": [{"title": "a"}]}, "ok"),
+    ({"claims": []}, "empty"),
+    ({"results": [], "error": "HTTP 500"}, "error"),
+    ("not a dict", "error"),
+    ({"results": [], "error": "HTTP 500", "cached": True}, "cached"),
+    ({"results": [], "error": "HTTP 500", "coalesced": True}, "coalesced"),
+    ({"results": [{"title": "a"}], "cached": True}, "cached"),
+    ({"results": [], "disabled": True}, "disabled"),
+])
+def test_source_outcome(result, outcome):
+    assert source_outcome(result) == outcome
@@ -0,0 +1,17 @@
+import json
+
+from app.utils.http_replay import FixtureStore
+from loadtest import parser_bench
+
+
+def test_parsers_find_items_in_the_committed_fixtures():
+    with open(parser_bench.DEFAULT_BASELINE, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    results = parser_bench.run_benchmarks(FixtureStore(parser_bench.DEFAULT_FIXTURES), rounds=1, min_seconds=0)
+
+    # Timings depend on the machine; only missing benchmarks and empty parses fail here
+    assert parser_bench.check_regressions(results, baseline, tolerance=float("inf")) == []
+    assert {name: result.get("items") for name, result in results.items()} == {
+        name: expected.get("items") for name, expected in baseline.items()
+    }
@@ -0,0 +1,34 @@
+from app.utils import llm_usage
+from app.utils.prompt_budget import PromptBudget
+
+
+def test_fit_drops_low_priority_items_and_records_counts():
+    items = ["first " * 300, "second " * 40, "third " * 40, "fourth"]
+
+    with llm_usage.track_request("budget test") as usage:
+        budget = PromptBudget("test_stage", budget=100)
+        prompt = budget.fit(lambda evidence: f"HEADER\n{evidence}", items)
+
+    assert prompt.startswith("HEADER\nfirst")
+    assert budget.info["estimated_tokens"] <= 100
+    assert budget.info["included"] == 1
+    assert budget.info["dropped"] == 3
+    # Cut to the item cap, then to the remaining budget: one truncated item
+    assert budget.info["truncated"] == 1
+    assert usage["prompt_budgets"]["test_stage"] == {
+        "prompts": 1, "estimated_tokens": budget.info["estimated_tokens"], "items": 4,
+        "included": 1, "truncated": budget.info["truncated"], "dropped": 3,
+    }
+
+    stats = llm_usage.usage_stats()["prompt_budgets"]["test_stage"]
+    assert stats["budget"] == 100
+    assert stats["drop_rate"] == 0.75
+
+
+def test_dropped_items_are_not_counted_as_truncated():
+    items = ["short " * 20, "long " * 300]
+
+    budget = PromptBudget("test_stage", budget=60)
+    budget.fit(lambda evidence: f"HEADER\n{evidence}", items, max_item_tokens=120)
+
+    assert (budget.info["included"], budget.info["truncated"], budget.info["dropped"]) == (1, 0, 1)
@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from app.utils import rate_limiter
+from app.utils.rate_limiter import GeminiRateLimiter, RateLimitTimeout, llm_priority
+
+
+async def wait_until_queued(limiter: GeminiRateLimiter, count: int):
+    while len(limiter._queue) < count:
+        await asyncio.sleep(0)
+
+
+async def stop_dispatcher(limiter: GeminiRateLimiter):
+    if limiter._dispatcher is not None:
+        limiter._dispatcher.cancel()
+        await asyncio.gather(limiter._dispatcher, return_exceptions=True)
+
+
+async def test_higher_priorities_are_served_first():
+    # 10 requests per second, so queued calls are granted 0.1s apart
+    limiter = GeminiRateLimiter(rpm=600, tpm=10**9)
+    limiter.requests.drain()
+    granted = []
+
+    async def call(priority):
+        await limiter.acquire(100, priority)
+        granted.append(priority)
+
+    tasks = []
+    for count, priority in enumerate(["batch", "telegram", "interactive"], start=1):
+        tasks.append(asyncio.create_task(call(priority)))
+        await wait_until_queued(limiter, count)
+    await asyncio.gather(*tasks)
+
+    assert granted == ["interactive", "telegram", "batch"]
+    assert limiter.stats()["priorities"]["batch"]["granted"] == 1
+
+
+async def test_priority_follows_the_llm_priority_context():
+    limiter = GeminiRateLimiter(rpm=600, tpm=10**9)
+
+    with llm_priority("telegram"):
+        await limiter.acquire(100)
+
+    assert limiter.stats()["priorities"]["telegram"]["granted"] == 1
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+async def test_queue_deadline_raises_rate_limit_timeout(monkeypatch):
+    monkeypatch.setitem(rate_limiter.QUEUE_DEADLINES, "batch", 0.05)
+    # One request per 10 seconds
+    limiter = GeminiRateLimiter(rpm=6, tpm=10**9)
+    limiter.requests.drain()
+
+    with pytest.raises(RateLimitTimeout):
+        await limiter.acquire(100, "batch")
+
+    stats = limiter.stats()
+    assert stats["priorities"]["batch"]["timeouts"] == 1
+    assert stats["queue_depth"] == 0
+    await stop_dispatcher(limiter)
+
+
+async def test_queued_callers_are_not_overtaken_by_the_fast_path():
+    # 100 tokens per second
+    limiter = GeminiRateLimiter(rpm=10**6, tpm=6000)
+    await limiter.acquire(6000, "interactive")
+    granted = []
+
+    async def call(name, tokens):
+        await limiter.acquire(tokens, "interactive")
+        granted.append(name)
+
+    first = asyncio.create_task(call("first", 50))
+    await wait_until_queued(limiter, 1)
+    await asyncio.sleep(0.05)
+    # The bucket now has room for this call, but "first" is waiting
+    await call("second", 1)
+    await first
+
+    assert granted == ["first", "second"]
+
+
+async def test_quota_error_drains_the_request_bucket():
+    limiter = GeminiRateLimiter(rpm=600, tpm=10**9)
+
+    limiter.record_retryable(google_exceptions.InternalServerError("boom"))
+    assert limiter.requests.time_until(1) == 0
+
+    limiter.record_retryable(google_exceptions.TooManyRequests("quota"))
+    assert limiter.requests.time_until(1) > 0.05
+
+    start = time.monotonic()
+    await limiter.acquire(100, "interactive")
+    assert time.monotonic() - start >= 0.05
+
+    stats = limiter.stats()
+    assert (stats["retries"], stats["quota_errors"], stats["server_errors"]) == (2, 1, 1)
+
+
+async def test_settle_corrects_the_token_charge():
+    limiter = GeminiRateLimiter(rpm=600, tpm=6000)
+    await limiter.acquire(1000, "interactive")
+    level = limiter.tokens.level
+
+    limiter.settle(charged=1000, used=3000)
+    assert limiter.tokens.level == pytest.approx(level - 2000, abs=5)
+
+    # Unknown usage keeps the estimate
+    limiter.settle(charged=1000, used=0)
+    assert limiter.tokens.level == pytest.approx(level - 2000, abs=5)
+
+
+async def test_cancelled_caller_gives_back_a_granted_slot():
+    # Slow enough that the dispatcher does not grant during the test
+    limiter = GeminiRateLimiter(rpm=6, tpm=6000)
+    limiter.requests.drain()
+    tokens_before = limiter.tokens.level
+
+    task = asyncio.create_task(limiter.acquire(500, "interactive"))
+    await wait_until_queued(limiter, 1)
+    _, _, waiter = limiter._queue[0]
+
+    # Cancelled, then granted by the dispatcher before the caller gets to run
+    task.cancel()
+    limiter._grant(waiter.priority, waiter.tokens, 0.0)
+    waiter.future.set_result(None)
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert limiter.requests.level == pytest.approx(0, abs=0.05)
+    assert limiter.tokens.level == pytest.approx(tokens_before, abs=5)
+    await stop_dispatcher(limiter)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = GeminiRateLimiter(rpm=6, tpm=10**9)
+    limiter.requests.drain()
+
+    task = asyncio.create_task(limiter.acquire(100, "batch"))
+    await wait_until_queued(limiter, 1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert limiter.stats()["queue_depth"] == 0
+    assert limiter.requests.level == pytest.approx(0, abs=0.05)
+    await stop_dispatcher(limiter)
@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.tools.indian_factcheckers import FACTCHECKER_SPECS
+from app.tools.scraping_engine import parse_factchecks
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Saved search/listing page for each fact-checker
+PAGE_FILES = {
+    "pib_factcheck": "pib_factcheck.html",
+    "altnews": "altnews.html",
+    "boom": "boom_live.html",
+    "factly": "factly.html",
+    "vishvas": "vishvas_news.html",
+}
+
+# URLs the hand-written scrapers requested for the claim "500 rupee notes"
+LEGACY_URLS = {
+    "pib_factcheck": "https://factcheck.pib.gov.in/",
+    "altnews": "https://www.altnews.in/?s=500+rupee+notes",
+    "boom": "https://www.boomlive.in/?s=500%20rupee%20notes",
+    "factly": "https://factly.in/?s=500+rupee+notes",
+    "vishvas": "https://www.vishvasnews.com/?s=500+rupee+notes",
+}
+
+SPECS = {spec.key: spec for spec in FACTCHECKER_SPECS}
+
+
+def test_every_factchecker_has_a_saved_page():
+    assert set(SPECS) == set(PAGE_FILES)
+
+
+@pytest.mark.parametrize("key", sorted(PAGE_FILES))
+def test_spec_matches_handwritten_scraper(key):
+    # Expected results were produced by the per-site parsers the specs replaced
+    html = (FIXTURES / "pages" / PAGE_FILES[key]).read_text(encoding="utf-8")
+    expected = json.loads((FIXTURES / "factcheckers" / f"{key}.json").read_text(encoding="utf-8"))
+
+    assert parse_factchecks(html, SPECS[key]) == expected
+
+
+@pytest.mark.parametrize("key", sorted(LEGACY_URLS))
+def test_spec_builds_handwritten_url(key):
+    assert SPECS[key].build_url("500 rupee notes") == LEGACY_URLS[key]
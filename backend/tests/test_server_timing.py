@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.main import ServerTiming
+from app.utils import metrics as app_metrics
+from app.utils import tracing
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTiming)
+
+    @app.get("/plain")
+    async def plain():
+        with app_metrics.stage_timer("extract"):
+            with tracing.span("agent.extract"):
+                pass
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for number in range(3):
+                # Spans opened in a task started while streaming, as the SSE endpoint does
+                await asyncio.create_task(traced_source(number))
+                yield f"{number}\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+async def traced_source(number: int):
+    with tracing.span(f"tool.source_{number}"):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def keep_every_trace(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 1.0)
+    tracing._buffer.clear()
+
+
+async def request(path: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=make_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
+
+
+async def test_streamed_response_keeps_its_spans(keep_every_trace):
+    response = await request("/stream")
+
+    assert response.text == "0\n1\n2\n"
+    trace = tracing.get_trace(response.headers["X-Trace-Id"])
+    assert [span["name"] for span in trace["spans"]] == [
+        "GET /stream", "tool.source_0", "tool.source_1", "tool.source_2",
+    ]
+    assert trace["spans"][0]["attributes"]["http_status"] == 200
+
+
+async def test_plain_response_gets_server_timing(keep_every_trace):
+    response = await request("/plain")
+
+    assert response.headers["Server-Timing"].startswith("extract;dur=")
+    assert "total;dur=" in response.headers["Server-Timing"]
+    trace = tracing.get_trace(response.headers["X-Trace-Id"])
+    assert [span["name"] for span in trace["spans"]] == ["GET /plain", "agent.extract"]
+
+
+async def test_traces_are_exported_off_the_event_loop(keep_every_trace, monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing, "TRACE_EXPORT_PATH", str(path))
+
+    first = await request("/plain")
+    second = await request("/stream")
+    tracing.shutdown()
+
+    exported = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["trace_id"] for record in exported] == [
+        first.headers["X-Trace-Id"], second.headers["X-Trace-Id"],
+    ]
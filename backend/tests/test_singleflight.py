@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+class Work:
+    """
+    Factory whose runs wait on `release` and publish one event before it.
+    """
+
+    def __init__(self, result="verdict", error: Exception = None):
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+        self.result = result
+        self.error = error
+
+    async def __call__(self, publish):
+        self.calls += 1
+        await publish("extracted", {"claim": "rbi notes"})
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_callers_share_one_run():
+    flights = SingleFlight("test")
+    work = Work()
+
+    callers = [asyncio.create_task(flights.do("claim", work)) for _ in range(10)]
+    await settle()
+    work.release.set()
+    results = await asyncio.gather(*callers)
+
+    assert work.calls == 1
+    assert [result for result, _ in results] == ["verdict"] * 10
+    assert [shared for _, shared in results] == [False] + [True] * 9
+    stats = flights.stats()
+    assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 9, 0)
+
+
+async def test_different_keys_run_separately():
+    flights = SingleFlight("test")
+    work = Work()
+    work.release.set()
+
+    results = await asyncio.gather(flights.do("a", work), flights.do("b", work))
+
+    assert work.calls == 2
+    assert [shared for _, shared in results] == [False, False]
+
+
+async def test_work_continues_when_one_caller_is_cancelled():
+    flights = SingleFlight("test")
+    work = Work()
+
+    leader = asyncio.create_task(flights.do("claim", work))
+    follower = asyncio.create_task(flights.do("claim", work))
+    await settle()
+    leader.cancel()
+    await settle()
+
+    assert not work.cancelled
+    work.release.set()
+    assert await follower == ("verdict", True)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert flights.stats()["abandoned"] == 0
+
+
+async def test_work_is_cancelled_when_every_caller_leaves():
+    flights = SingleFlight("test")
+    work = Work()
+
+    callers = [asyncio.create_task(flights.do("claim", work)) for _ in range(3)]
+    await settle()
+    for caller in callers:
+        caller.cancel()
+    await settle()
+
+    assert work.cancelled
+    stats = flights.stats()
+    assert (stats["abandoned"], stats["in_flight"], stats["waiting"]) == (1, 0, 0)
+
+    # The next caller starts over
+    work.release.set()
+    assert await flights.do("claim", work) == ("verdict", False)
+    assert work.calls == 2
+
+
+async def test_late_joiner_gets_earlier_events_replayed():
+    flights = SingleFlight("test")
+    work = Work()
+    first_events, late_events = [], []
+
+    async def first_listener(*event):
+        first_events.append(event)
+
+    async def late_listener(*event):
+        late_events.append(event)
+
+    async def run(publish):
+        await publish("extracted", 1)
+        await joined.wait()
+        await publish("verified", 2)
+        return "verdict"
+
+    joined = asyncio.Event()
+    leader = asyncio.create_task(flights.do("claim", run, listener=first_listener))
+    await settle()
+    late = asyncio.create_task(flights.do("claim", run, listener=late_listener))
+    await settle()
+    joined.set()
+    await asyncio.gather(leader, late)
+
+    assert first_events == [("extracted", 1), ("verified", 2)]
+    assert late_events == [("extracted", 1), ("verified", 2)]
+
+
+async def test_failing_listener_does_not_fail_the_call():
+    flights = SingleFlight("test")
+    work = Work()
+    work.release.set()
+
+    async def broken(*event):
+        raise RuntimeError("client went away")
+
+    assert await flights.do("claim", work, listener=broken) == ("verdict", False)
+
+
+async def test_exception_reaches_every_caller():
+    flights = SingleFlight("test")
+    work = Work(error=ValueError("extraction failed"))
+
+    callers = [asyncio.create_task(flights.do("claim", work)) for _ in range(3)]
+    await settle()
+    work.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert work.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    # Failures are not remembered
+    work.error = None
+    assert await flights.do("claim", work) == ("verdict", False)
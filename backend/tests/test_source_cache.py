@@ -0,0 +1,90 @@
+import asyncio
+import itertools
+
+from app.utils.source_cache import cached_source, is_negative
+
+_sources = itertools.count()
+
+
+def make_tool(results: list, ttl: float = 600, negative_ttl: float = 60, key_func=None):
+    """
+    Cached tool returning `results` one per call, recording its calls.
+    """
+    calls = []
+    answers = iter(results)
+
+    # Every tool registers its own source cache
+    @cached_source(f"test_source_{next(_sources)}", ttl=ttl, negative_ttl=negative_ttl, key_func=key_func)
+    async def tool(claim):
+        calls.append(claim)
+        await asyncio.sleep(0)
+        return next(answers)
+
+    return tool, calls
+
+
+FOUND = {"results": [{"title": "RBI denies withdrawal of 500 notes"}]}
+EMPTY = {"results": []}
+
+
+def test_is_negative():
+    assert not is_negative(FOUND)
+    assert not is_negative({"claims": [{"text": "claim"}]})
+    assert is_negative(EMPTY)
+    assert is_negative({"results": [{"title": "a"}], "error": "HTTP 500"})
+    assert is_negative("not a dict")
+
+
+async def test_results_are_cached_per_normalized_claim(clock):
+    tool, calls = make_tool([FOUND, FOUND])
+
+    assert await tool("RBI withdrawing 500 notes") == FOUND
+    assert await tool("rbi withdrawing 500 notes!") == {**FOUND, "cached": True}
+    assert len(calls) == 1
+
+    clock.advance(601)
+    assert await tool("RBI withdrawing 500 notes") == FOUND
+    assert len(calls) == 2
+
+
+async def test_empty_and_failed_results_use_the_negative_ttl(clock):
+    failed = {"results": [], "error": "HTTP 503"}
+    tool, calls = make_tool([EMPTY, failed, FOUND])
+
+    await tool("claim")
+    assert (await tool("claim"))["cached"]
+    clock.advance(61)
+    assert await tool("claim") == failed
+    clock.advance(61)
+    assert await tool("claim") == FOUND
+    clock.advance(120)
+    assert (await tool("claim"))["cached"]
+    assert len(calls) == 3
+
+
+async def test_circuit_open_results_are_not_cached(clock):
+    skipped = {"results": [], "error": "circuit open", "circuit_open": True}
+    tool, calls = make_tool([skipped, FOUND])
+
+    assert await tool("claim") == skipped
+    assert await tool("claim") == FOUND
+    assert len(calls) == 2
+
+
+async def test_concurrent_identical_queries_are_sent_once(clock):
+    tool, calls = make_tool([FOUND])
+
+    first, second = await asyncio.gather(tool("claim"), tool("Claim"))
+
+    assert first == FOUND
+    assert second == {**FOUND, "coalesced": True}
+    assert len(calls) == 1
+    assert tool.flights.stats()["coalesced"] == 1
+
+
+async def test_key_func_shares_one_entry_across_claims(clock):
+    tool, calls = make_tool([FOUND], key_func=lambda claim: "latest")
+
+    await tool("first claim")
+    assert (await tool("another claim"))["cached"]
+    assert calls == ["first claim"]
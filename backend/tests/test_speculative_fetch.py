@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from app.agents import pipeline, verification_agent
+from app.agents.verification_agent import gather_sources
+
+
+def fake_tools(delays: dict, calls: list) -> dict:
+    """
+    Source tools that sleep for their delay and return one result.
+    """
+    def make_tool(source, delay):
+        async def tool(claim):
+            calls.append(source)
+            await asyncio.sleep(delay)
+            return {"results": [{"title": f"{source}: {claim}"}]}
+        return tool
+    return {source: make_tool(source, delay) for source, delay in delays.items()}
+
+
+async def test_excluded_sources_are_not_queried(monkeypatch):
+    calls = []
+    tools = fake_tools({source: 0 for source in verification_agent.SOURCE_TOOLS}, calls)
+    monkeypatch.setattr(verification_agent, "SOURCE_TOOLS", tools)
+
+    results = await gather_sources("claim", exclude=("news_api",))
+
+    assert "news_api" not in calls
+    assert "news_api" not in results
+    assert set(results) == set(tools) - {"news_api"}
+
+
+async def test_requery_uses_remaining_deadline(monkeypatch):
+    calls = []
+    tools = fake_tools({source: 5 for source in verification_agent.SOURCE_TOOLS}, calls)
+    monkeypatch.setattr(verification_agent, "SOURCE_TOOLS", tools)
+    prefetched = {"fact_check_api": {"claims": [{"text": "reused"}]}}
+
+    start = time.monotonic()
+    results = await gather_sources("claim", prefetched=prefetched, deadline=start + 0.2)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1
+    assert results["fact_check_api"] == prefetched["fact_check_api"]
+    assert "fact_check_api" not in calls
+    assert all(results[source].get("skipped") for source in tools if source != "fact_check_api")
+
+
+async def test_prefetched_results_survive_an_expired_deadline(monkeypatch):
+    calls = []
+    tools = fake_tools({source: 5 for source in verification_agent.SOURCE_TOOLS}, calls)
+    monkeypatch.setattr(verification_agent, "SOURCE_TOOLS", tools)
+    prefetched = {"google_search": {"results": [{"title": "reused"}]}}
+
+    results = await gather_sources("claim", prefetched=prefetched, deadline=time.monotonic() - 1)
+
+    assert results["google_search"] == prefetched["google_search"]
+    assert not results["google_search"].get("skipped")
+
+
+@pytest.mark.parametrize("failing_step", ["on_stage", "near_duplicate"])
+async def test_speculative_task_is_cancelled_when_a_later_step_fails(monkeypatch, failing_step):
+    started = []
+
+    async def slow_gather(claim, **kwargs):
+        started.append(asyncio.current_task())
+        await asyncio.sleep(60)
+
+    async def extract(claim):
+        await asyncio.sleep(0)
+        return "RBI is withdrawing 500 rupee notes"
+
+    async def on_stage(stage, data):
+        if failing_step == "on_stage":
+            raise ConnectionResetError("client went away")
+
+    def near_duplicate(claim, extracted_claim):
+        raise RuntimeError("near-duplicate index failed")
+
+    monkeypatch.setattr(pipeline, "SPECULATIVE_FETCH", True)
+    monkeypatch.setattr(pipeline, "SKIP_EXTRACTION_FAST_PATH", False)
+    monkeypatch.setattr(pipeline, "get_cached_verdict", lambda claim: None)
+    monkeypatch.setattr(pipeline, "gather_sources", slow_gather)
+    monkeypatch.setattr(pipeline, "extract_claim", extract)
+    monkeypatch.setattr(pipeline, "find_near_duplicate_verdict", near_duplicate)
+
+    with pytest.raises((ConnectionResetError, RuntimeError)):
+        await pipeline._run_verification("forwarded: RBI withdrawing 500 rupee notes!!", on_stage)
+    await asyncio.sleep(0)
+
+    assert len(started) == 1
+    assert started[0].cancelled()
@@ -0,0 +1,141 @@
+import asyncio
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+from app.bots.concurrency import CHAT_BACKLOG_MESSAGE, ChatUpdateProcessor, QueueFull, VerificationSlots
+from app.utils.metrics import TELEGRAM_CHAT_BACKLOG, TELEGRAM_VERIFICATIONS_QUEUED, TELEGRAM_VERIFICATIONS_RUNNING
+
+
+class StubMessage:
+    def __init__(self, text: str):
+        self.text = text
+        self.replies = []
+
+    async def reply_text(self, text: str):
+        self.replies.append(text)
+
+
+def stub_update(chat_id: int, text: str = "RBI is withdrawing 500 rupee notes"):
+    return SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id), effective_message=StubMessage(text))
+
+
+def gauge(metric) -> float:
+    return metric._values.get((), 0)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_updates_of_one_chat_run_in_arrival_order():
+    processor = ChatUpdateProcessor(max_pending_per_chat=10)
+    log = []
+
+    async def handle(number):
+        log.append(("start", number))
+        # Later updates finish faster, so any overlap would reorder the log
+        await asyncio.sleep(0.03 - number * 0.01)
+        log.append(("end", number))
+
+    tasks = [asyncio.create_task(processor.do_process_update(stub_update(1), handle(number)))
+             for number in range(3)]
+    await asyncio.gather(*tasks)
+
+    assert log == [("start", 0), ("end", 0), ("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+
+
+async def test_different_chats_run_concurrently():
+    processor = ChatUpdateProcessor()
+    release = asyncio.Event()
+    started = []
+
+    async def handle(chat_id):
+        started.append(chat_id)
+        await release.wait()
+
+    tasks = [asyncio.create_task(processor.do_process_update(stub_update(chat_id), handle(chat_id)))
+             for chat_id in (1, 2)]
+    await settle()
+
+    assert sorted(started) == [1, 2]
+    assert processor.stats()["active_chats"] == 2
+    release.set()
+    await asyncio.gather(*tasks)
+    assert processor.stats()["active_chats"] == 0
+
+
+async def test_chat_backlog_is_answered_and_the_update_dropped():
+    processor = ChatUpdateProcessor(max_pending_per_chat=2)
+    release = asyncio.Event()
+
+    async def handle():
+        await release.wait()
+
+    tasks = [asyncio.create_task(processor.do_process_update(stub_update(1), handle())) for _ in range(2)]
+    await settle()
+
+    extra = stub_update(1)
+    dropped = handle()
+    await processor.do_process_update(extra, dropped)
+    assert inspect.getcoroutinestate(dropped) == inspect.CORO_CLOSED
+    assert extra.effective_message.replies == [CHAT_BACKLOG_MESSAGE]
+
+    # Commands are still queued behind the chat's messages
+    command = asyncio.create_task(processor.do_process_update(stub_update(1, "/help"), handle()))
+    await settle()
+    assert processor.stats()["pending"] == 3
+
+    release.set()
+    await asyncio.gather(*tasks, command)
+    assert processor.stats()["pending"] == 0
+
+
+async def test_slots_reject_when_the_queue_is_full():
+    slots = VerificationSlots(max_running=1, max_queued=1)
+    release = asyncio.Event()
+
+    async def verify():
+        async with slots.slot():
+            await release.wait()
+
+    running = asyncio.create_task(verify())
+    queued = asyncio.create_task(verify())
+    await settle()
+    assert (slots.running, slots.queued) == (1, 1)
+
+    with pytest.raises(QueueFull):
+        async with slots.slot():
+            pass
+    assert slots.stats()["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert (slots.running, slots.queued, slots.completed) == (0, 0, 2)
+
+
+async def test_counts_return_to_zero_after_cancellation():
+    processor = ChatUpdateProcessor(max_pending_per_chat=5)
+    slots = VerificationSlots(max_running=1, max_queued=5)
+
+    async def verify():
+        async with slots.slot():
+            await asyncio.sleep(60)
+
+    tasks = [asyncio.create_task(processor.do_process_update(stub_update(chat_id), verify()))
+             for chat_id in (1, 1, 2, 3)]
+    await settle()
+    assert (slots.running, slots.queued, processor.pending) == (1, 2, 4)
+    assert gauge(TELEGRAM_VERIFICATIONS_QUEUED) == 2
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert (slots.running, slots.queued, processor.pending) == (0, 0, 0)
+    assert processor.stats()["active_chats"] == 0
+    assert gauge(TELEGRAM_CHAT_BACKLOG) == 0
+    assert gauge(TELEGRAM_VERIFICATIONS_RUNNING) == 0
+    assert gauge(TELEGRAM_VERIFICATIONS_QUEUED) == 0